@@ -17,6 +17,8 @@
 # limitations under the License.
 """EODAG-cube: Data access for EODAG."""
 
+from typing import Any
+
 __title__ = "eodag_cube"
 __description__ = "Data access for EODAG"
 __version__ = "0.7.0"
@@ -25,3 +27,12 @@ __author_email__ = "eodag@csgroup.space"
 __url__ = "https://github.com/CS-SI/eodag-cube"
 __license__ = "Apache 2.0"
 __copyright__ = "Copyright 2021, CS GROUP - France, http://www.c-s.fr"
+
+
+def __getattr__(name: str) -> Any:
+    # lazy import, so that importing the package does not load the api
+    if name in ("iter_many", "open_many", "to_timeseries_cube"):
+        from eodag_cube.api import batch
+
+        return getattr(batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
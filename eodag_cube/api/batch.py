@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Batch opening of several products"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import xarray as xr
+from eodag.utils import DEFAULT_DOWNLOAD_TIMEOUT, DEFAULT_DOWNLOAD_WAIT
+from eodag.utils.exceptions import UnsupportedDatasetAddressScheme
+from rasterio.enums import Resampling
+from rasterio.errors import RasterioIOError
+from rasterio.warp import transform_bounds
+from rasterio.windows import Window
+from rasterio.windows import bounds as window_bounds
+from shapely.geometry import box
+from shapely.ops import unary_union
+
+from eodag_cube.types import XarrayDict
+from eodag_cube.utils.download import DEFAULT_DOWNLOAD_FALLBACK, DownloadFallback
+from eodag_cube.utils.exceptions import DatasetCreationError
+from eodag_cube.utils.raster import DEFAULT_RESAMPLING, RasterGrid
+from eodag_cube.utils.scheduler import get_host, get_io_scheduler
+from eodag_cube.utils.xarray import import_dask_array
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike
+    from shapely.geometry.base import BaseGeometry
+
+    from eodag_cube.api.product._product import EOProduct
+    from eodag_cube.utils.raster import Resolution
+
+logger = logging.getLogger("eodag-cube.api.batch")
+
+# (product index, asset key) opened by a single task
+_Task = tuple[int, Optional[str]]
+
+
+def _iter_products_xarray(
+    products: list[EOProduct],
+    wait: float,
+    timeout: float,
+    roles: Iterable[str],
+    geom: Optional[Union[str, dict[str, float], BaseGeometry]],
+    max_concurrency: Optional[int],
+    **open_kwargs: Any,
+) -> Iterator[tuple[int, Optional[XarrayDict]]]:
+    """Open the assets of several products through the shared I/O scheduler
+
+    :returns: iterator of product indexes and opened datasets, ``None`` meaning that
+              all the datasets of the product have been yielded
+    """
+    scheduler = get_io_scheduler()
+    max_concurrency = max_concurrency or scheduler.max_workers
+
+    geometries: list[Optional[BaseGeometry]] = []
+    tasks: deque[_Task] = deque()
+    remaining: list[int] = []
+    for i, product in enumerate(products):
+        geometries.append(product._get_clip_geometry(geom))
+        # products without matching assets are opened as a single file
+        asset_keys: list[Optional[str]] = [*product._get_asset_keys(roles)] or [None]
+        tasks.extend((i, key) for key in asset_keys)
+        remaining.append(len(asset_keys))
+    opened = [False] * len(products)
+
+    def submit(task: _Task) -> concurrent.futures.Future[XarrayDict]:
+        i, asset_key = task
+        product = products[i]
+        href = product.assets[asset_key].get("href") if asset_key else product.location
+        return scheduler.submit(
+            product._to_xarray_single,
+            asset_key,
+            wait,
+            timeout,
+            geometries[i],
+            host=get_host(href),
+            **open_kwargs,
+        )
+
+    running: dict[concurrent.futures.Future[XarrayDict], _Task] = {}
+    try:
+        while tasks or running:
+            while tasks and len(running) < max_concurrency:
+                task = tasks.popleft()
+                running[submit(task)] = task
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                i, asset_key = running.pop(future)
+                try:
+                    xd = future.result()
+                except DatasetCreationError as e:
+                    logger.debug(e)
+                except Exception as e:
+                    logger.warning(f"Cannot open {products[i]} {asset_key or ''}: {e}")
+                else:
+                    opened[i] = True
+                    yield i, xd
+                remaining[i] -= 1
+                if remaining[i] > 0:
+                    continue
+
+                if opened[i]:
+                    yield i, None
+                elif asset_key is not None:
+                    # no asset could be opened, try the whole product as EOProduct.to_xarray does
+                    remaining[i] = 1
+                    tasks.appendleft((i, None))
+                else:
+                    logger.warning(f"Could not open {products[i]}")
+    finally:
+        # iteration stopped early: do not start pending opens
+        for future in running:
+            future.cancel()
+
+
+def iter_many(
+    products: Iterable[EOProduct],
+    wait: float = DEFAULT_DOWNLOAD_WAIT,
+    timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    roles: Iterable[str] = {"data", "data-mask"},
+    geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+    resolution: Optional[Resolution] = None,
+    overview_level: Optional[int] = None,
+    crs: Optional[Any] = None,
+    max_concurrency: Optional[int] = None,
+    download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+    **xarray_kwargs: Any,
+) -> Iterator[tuple[EOProduct, str, xr.Dataset]]:
+    """
+    Open the data of several products, yielding each dataset as soon as it is opened.
+
+    Datasets are yielded by order of completion, so that processing can start while other
+    assets are still being opened. Stopping the iteration cancels the pending opens.
+    See :func:`open_many` for parameters.
+
+    :returns: iterator of products, asset keys and :class:`xarray.Dataset`
+    """
+    products = list(products)
+    for i, xd in _iter_products_xarray(
+        products,
+        wait,
+        timeout,
+        roles,
+        geom,
+        max_concurrency,
+        resolution=resolution,
+        overview_level=overview_level,
+        crs=crs,
+        download_fallback=download_fallback,
+        **xarray_kwargs,
+    ):
+        if xd is not None:
+            for key, ds in xd.items():
+                yield products[i], key, ds
+
+
+def open_many(
+    products: Iterable[EOProduct],
+    wait: float = DEFAULT_DOWNLOAD_WAIT,
+    timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    roles: Iterable[str] = {"data", "data-mask"},
+    geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+    resolution: Optional[Resolution] = None,
+    overview_level: Optional[int] = None,
+    crs: Optional[Any] = None,
+    max_concurrency: Optional[int] = None,
+    download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+    **xarray_kwargs: Any,
+) -> Iterator[tuple[EOProduct, XarrayDict]]:
+    """
+    Open the data of several products, e.g. a whole :class:`eodag.api.search_result.SearchResult`,
+    yielding each product :class:`eodag_cube.types.XarrayDict` as soon as it is complete.
+
+    The assets of all products are opened through the shared I/O scheduler, so that
+    authentication, probing and opening of a product overlap with the others, sharing
+    filesystems, authentication and engines caches. Products that cannot be opened are
+    logged and skipped.
+
+    :param products: products to open
+    :param wait: (optional) If order is needed, wait time in minutes between two
+                 order status check
+    :param timeout: (optional) If order is needed, maximum time in minutes before
+                    stop checking order status
+    :param roles: (optional) roles of assets that must be fetched
+    :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                 See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+    :param resolution: (optional) resolution in raster CRS units at which rasters are read
+    :param overview_level: (optional) internal overview level at which rasters are read
+    :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                interest if ``geom`` is set
+    :param max_concurrency: (optional) maximum number of assets being opened simultaneously,
+                            defaults to the I/O scheduler number of workers
+    :param download_fallback: (optional) policy applied when data cannot be opened remotely.
+                              See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+    :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+    :returns: iterator of products and their dictionary of :class:`xarray.Dataset`
+    """
+    products = list(products)
+    results = [XarrayDict() for _ in products]
+    for i, xd in _iter_products_xarray(
+        products,
+        wait,
+        timeout,
+        roles,
+        geom,
+        max_concurrency,
+        resolution=resolution,
+        overview_level=overview_level,
+        crs=crs,
+        download_fallback=download_fallback,
+        **xarray_kwargs,
+    ):
+        if xd is not None:
+            results[i].update(xd)
+            continue
+        results[i].sort()
+        yield products[i], results[i]
+        # release reference to the yielded datasets
+        results[i] = XarrayDict()
+
+
+def _product_time(product: EOProduct, by_day: bool) -> datetime:
+    """Acquisition time of a product, as a naive UTC datetime"""
+    try:
+        time = datetime.fromisoformat(str(product.properties.get("datetime")).replace("Z", "+00:00"))
+    except ValueError as e:
+        raise DatasetCreationError(f"Cannot get {product} acquisition time: {e}") from e
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime.combine(time.date(), datetime.min.time()) if by_day else time
+
+
+def _read_mosaic_block(
+    products: list[EOProduct],
+    asset_key: str,
+    grid: RasterGrid,
+    window: Window,
+    dtype: np.dtype,
+    nodata: Union[int, float],
+    **read_kwargs: Any,
+) -> np.ndarray:
+    """Read a block of the grid from the first band of an asset of several products, the first
+    products having priority over the next ones where they have data. Products whose footprint
+    does not intersect the block are not opened"""
+    out = np.full((1, int(window.height), int(window.width)), nodata, dtype=dtype)
+    block_geometry = box(*transform_bounds(grid.crs, "EPSG:4326", *window_bounds(window, grid.transform)))
+    buffer = None
+    for product in products:
+        if asset_key not in product.assets:
+            continue
+        if product.geometry is not None and not product.geometry.intersects(block_geometry):
+            continue
+        is_nodata = np.isnan(out) if np.isnan(nodata) else out == nodata
+        if not is_nodata.any():
+            break
+        buffer = np.empty_like(out) if buffer is None else buffer
+        try:
+            product._read_raster_to_grid(
+                asset_key, grid=grid, out=buffer, indexes=[1], window=window, nodata=nodata, **read_kwargs
+            )
+        except (UnsupportedDatasetAddressScheme, OSError, RasterioIOError, DatasetCreationError) as e:
+            logger.warning(f"Cannot read {product} {asset_key}: {e}")
+            continue
+        np.copyto(out, buffer, where=is_nodata)
+    return out
+
+
+def to_timeseries_cube(
+    products: Iterable[EOProduct],
+    assets: Iterable[str],
+    resolution: Resolution,
+    crs: Any,
+    geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+    resampling: Resampling = DEFAULT_RESAMPLING,
+    dtype: DTypeLike = "float32",
+    chunks: Union[int, tuple[int, int]] = 1024,
+    by_day: bool = True,
+    wait: float = DEFAULT_DOWNLOAD_WAIT,
+    timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+) -> xr.Dataset:
+    """
+    Build a lazy ``time`` x ``band`` x ``y`` x ``x`` datacube from several products, e.g. a whole
+    :class:`eodag.api.search_result.SearchResult`.
+
+    The datacube grid is built from the given parameters and products geometries, so that nothing
+    is opened before computation. Each dask chunk is then read on demand from the first band of
+    the asset and the products of its time step, using pooled filesystems. Products acquired at the
+    same time (e.g. adjacent tiles) are mosaicked into a single time step, the first products having
+    priority where they overlap. It needs the ``dask`` extra: ``python -m pip install "eodag-cube[dask]"``.
+
+    :param products: products to stack
+    :param assets: keys of the assets to read as datacube bands
+    :param resolution: resolution in ``crs`` units, as a single value or a ``(xres, yres)`` tuple
+    :param crs: CRS of the datacube
+    :param geom: (optional) area of interest, defaults to the union of the products geometries.
+                 ``"search_intersection"`` is the union of the products search intersections.
+                 See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+    :param resampling: (optional) resampling method
+    :param dtype: (optional) dtype of the datacube. For float dtypes, nodata is set to ``NaN`` and
+                  assets scale and offset are applied
+    :param chunks: (optional) ``y`` and ``x`` dask chunks
+    :param by_day: (optional) group products by acquisition day instead of acquisition time
+    :param wait: (optional) If order is needed, wait time in minutes between two
+                 order status check
+    :param timeout: (optional) If order is needed, maximum time in minutes before
+                    stop checking order status
+    :returns: lazy datacube of the products
+    """
+    dask_array = import_dask_array()
+
+    products = list(products)
+    assets = list(assets)
+    if not products or not assets:
+        raise DatasetCreationError("Products and assets are needed to build a datacube")
+
+    # time steps
+    groups: dict[datetime, list[EOProduct]] = {}
+    for product in products:
+        groups.setdefault(_product_time(product, by_day), []).append(product)
+    times = sorted(groups)
+
+    # grid
+    geometry: Optional[BaseGeometry]
+    if geom is None:
+        geometry = unary_union([p.geometry for p in products])
+    elif geom == "search_intersection":
+        intersections = [p.search_intersection for p in products if p.search_intersection is not None]
+        geometry = unary_union(intersections) if intersections else None
+    else:
+        geometry = products[0]._get_clip_geometry(geom)
+    if geometry is None:
+        raise DatasetCreationError(f"Cannot build a datacube grid from {geom}")
+    grid = RasterGrid.from_bounds(crs, transform_bounds("EPSG:4326", crs, *geometry.bounds), resolution)
+
+    dtype = np.dtype(dtype)
+    nodata: Union[int, float] = np.nan if np.issubdtype(dtype, np.floating) else 0
+    read_kwargs = {"wait": wait, "timeout": timeout, "resampling": resampling}
+
+    def read_block(block_info: dict[Any, Any]) -> np.ndarray:
+        (t, _), (band, _), (row_start, row_stop), (col_start, col_stop) = block_info[None]["array-location"]
+        window = Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+        block = _read_mosaic_block(groups[times[t]], assets[band], grid, window, dtype, nodata, **read_kwargs)
+        return block[np.newaxis]
+
+    yx_chunks = (chunks, chunks) if isinstance(chunks, int) else chunks
+    data = dask_array.map_blocks(
+        read_block,
+        chunks=dask_array.core.normalize_chunks((1, 1, *yx_chunks), (len(times), len(assets), *grid.shape)),
+        dtype=dtype,
+        meta=np.array((), dtype=dtype),
+    )
+
+    x, y = grid.xy_coords()
+    ds = xr.Dataset(
+        {"band_data": (("time", "band", "y", "x"), data)},
+        coords={"time": times, "band": assets, "y": y, "x": x},
+    )
+    if not np.issubdtype(dtype, np.floating):
+        ds["band_data"].attrs["_FillValue"] = nodata
+    return ds.rio.write_crs(grid.crs).rio.write_transform(grid.transform)
@@ -18,18 +18,26 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union, cast
 
 import xarray as xr
 from eodag.api.product._assets import Asset as Asset_core
 from eodag.api.product._assets import AssetsDict as AssetsDict_core
 from eodag.utils import DEFAULT_DOWNLOAD_TIMEOUT, DEFAULT_DOWNLOAD_WAIT
 
+from eodag_cube.utils.download import DEFAULT_DOWNLOAD_FALLBACK
+
 if TYPE_CHECKING:
+    import asyncio
     from contextlib import nullcontext
 
     from fsspec.core import OpenFile
     from rasterio.env import Env
+    from shapely.geometry.base import BaseGeometry
+
+    from eodag_cube.api.product._product import EOProduct
+    from eodag_cube.utils.download import DownloadFallback
+    from eodag_cube.utils.raster import Resolution
 
 logger = logging.getLogger("eodag-cube.api.product")
 
@@ -72,6 +80,21 @@ class Asset(Asset_core):
         """
         return self.product.get_file_obj(self.key, wait, timeout)
 
+    async def aget_file_obj(
+        self,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    ) -> OpenFile:
+        """Coroutine opening asset data using fsspec
+
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :returns: asset data file object
+        """
+        return await cast("EOProduct", self.product).aget_file_obj(self.key, wait, timeout)
+
     def rio_env(self) -> Union[Env, nullcontext]:
         """Get rasterio environment
 
@@ -83,6 +106,11 @@ class Asset(Asset_core):
         self,
         wait: float = DEFAULT_DOWNLOAD_WAIT,
         timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resolution: Optional[Resolution] = None,
+        overview_level: Optional[int] = None,
+        crs: Optional[Any] = None,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
         **xarray_kwargs: Any,
     ) -> xr.Dataset:
         """
@@ -92,10 +120,77 @@ class Asset(Asset_core):
                      order status check
         :param timeout: (optional) If order is needed, maximum time in minutes before
                         stop checking order status
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                     See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+        :param resolution: (optional) resolution in raster CRS units at which rasters are read, as a
+                           single value or a ``(xres, yres)`` tuple
+        :param overview_level: (optional) internal overview level at which rasters are read
+        :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                    interest if ``geom`` is set
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely.
+                                  See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :returns: Asset data as a :class:`xarray.Dataset`
+        """
+        xd = self.product.to_xarray(
+            self.key,
+            wait,
+            timeout,
+            geom=geom,
+            resolution=resolution,
+            overview_level=overview_level,
+            crs=crs,
+            download_fallback=download_fallback,
+            **xarray_kwargs,
+        )
+        if len(xd) > 1:
+            logger.warning(f"Several Datasets were returned for {self.product} {self.key}: {xd.keys()}")
+        return next(iter(xd.values()))
+
+    async def ato_xarray(
+        self,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resolution: Optional[Resolution] = None,
+        overview_level: Optional[int] = None,
+        crs: Optional[Any] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+        **xarray_kwargs: Any,
+    ) -> xr.Dataset:
+        """
+        Coroutine returning asset data as a :class:`xarray.Dataset`.
+
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                     See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
+        :param resolution: (optional) resolution in raster CRS units at which rasters are read, as a
+                           single value or a ``(xres, yres)`` tuple
+        :param overview_level: (optional) internal overview level at which rasters are read
+        :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                    interest if ``geom`` is set
+        :param semaphore: (optional) semaphore limiting the number of files opened simultaneously
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely.
+                                  See :meth:`eodag_cube.api.product._product.EOProduct.to_xarray`
         :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
         :returns: Asset data as a :class:`xarray.Dataset`
         """
-        xd = self.product.to_xarray(self.key, wait, timeout, **xarray_kwargs)
+        xd = await cast("EOProduct", self.product).ato_xarray(
+            self.key,
+            wait,
+            timeout,
+            geom=geom,
+            resolution=resolution,
+            overview_level=overview_level,
+            crs=crs,
+            semaphore=semaphore,
+            download_fallback=download_fallback,
+            **xarray_kwargs,
+        )
         if len(xd) > 1:
             logger.warning(f"Several Datasets were returned for {self.product} {self.key}: {xd.keys()}")
         return next(iter(xd.values()))
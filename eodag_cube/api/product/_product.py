@@ -17,16 +17,25 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import copy
+import functools
 import logging
 import os
+import shutil
+import tarfile
+import time
+import zipfile
 from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Iterable, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, ContextManager, Iterable, Iterator, Optional, Union, cast
 from urllib.parse import urlparse
 
 import fsspec
+import numpy as np
 import rasterio
+import xarray as xr
 from boto3 import Session
 from boto3.resources.base import ServiceResource
 from eodag.api.product._product import EOProduct as EOProduct_core
@@ -36,21 +45,67 @@ from eodag.utils import (
     DEFAULT_DOWNLOAD_TIMEOUT,
     DEFAULT_DOWNLOAD_WAIT,
     USER_AGENT,
+    get_geometry_from_various,
 )
 from eodag.utils.exceptions import UnsupportedDatasetAddressScheme
 from fsspec.core import OpenFile
+from rasterio.enums import Resampling
+from rasterio.warp import transform_bounds
+from rasterio.windows import Window
 from requests import PreparedRequest
 from requests.auth import AuthBase
 from requests.structures import CaseInsensitiveDict
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
 
+from eodag_cube.api.batch import iter_many
 from eodag_cube.api.product._assets import AssetsDict
 from eodag_cube.types import XarrayDict
-from eodag_cube.utils.exceptions import DatasetCreationError
+from eodag_cube.utils.aio import DEFAULT_ASYNC_CONCURRENCY, async_guess_engines, run_in_scheduler
+from eodag_cube.utils.auth import get_auth_cache
+from eodag_cube.utils.download import (
+    DEFAULT_DOWNLOAD_FALLBACK,
+    DownloadFallback,
+    DownloadFallbackEvent,
+    DownloadFallbackRequest,
+    download_fallback_policy,
+    emit_download_fallback_event,
+    remote_size,
+)
+from eodag_cube.utils.exceptions import DatasetCreationError, DatasetNotIntersectingError
+from eodag_cube.utils.fs import get_filesystem_pool, get_zip_archive_pool, zip_archive
+from eodag_cube.utils.manifest import ManifestEntry, file_stat, get_scan_manifests
 from eodag_cube.utils.metadata import build_bands, build_stac_metadata, merge_bands
-from eodag_cube.utils.xarray import try_open_dataset
+from eodag_cube.utils.raster import (
+    DEFAULT_RESAMPLING,
+    RasterGrid,
+    Resolution,
+    build_rio_env,
+    common_grid,
+    get_rio_env_manager,
+    rasterio_source,
+    read_to_grid,
+)
+from eodag_cube.utils.scheduler import get_host, get_io_scheduler
+from eodag_cube.utils.xarray import (
+    LOCALFILE_ONLY_ENGINES,
+    clip_dataset,
+    get_engine_cache,
+    guess_engines,
+    has_engines,
+    import_dask_array,
+    try_open_dataset,
+)
+
+if TYPE_CHECKING:
+    from fsspec.spec import AbstractFileSystem
+    from numpy.typing import DTypeLike
 
 logger = logging.getLogger("eodag-cube.api.product")
 
+#: Tar archive suffixes, longest first, stripped to get the extraction directory
+TAR_ARCHIVE_SUFFIXES = (".tar.bz2", ".tar.gz", ".tar.xz", ".tbz2", ".tar", ".tbz", ".tgz", ".txz")
+
 
 class EOProduct(EOProduct_core):
     """A wrapper around an Earth Observation Product originating from a search.
@@ -102,22 +157,52 @@ class EOProduct(EOProduct_core):
         """
         product_location_scheme = dataset_address.split("://")[0]
         if "s3" in product_location_scheme and isinstance(self.downloader_auth, AwsAuth):
-            rio_env_dict = {"session": rasterio.session.AWSSession(**self.downloader_auth.get_rio_env())}
-            auth = self.downloader_auth.s3_resource
-            if auth is None:
-                auth = self.downloader_auth.authenticate()
-
-            if endpoint_url := auth.meta.client.meta.endpoint_url:
-                aws_s3_endpoint = endpoint_url.split("://")[-1]
-                rio_env_dict.update(
-                    AWS_S3_ENDPOINT=aws_s3_endpoint,
-                    AWS_HTTPS="YES",
-                    AWS_VIRTUAL_HOSTING="FALSE",
-                )
-            return rio_env_dict
+            # AWS session is built once per provider and reused until credentials expire
+            rio_env_dict = get_auth_cache().get(self.downloader_auth, "rio_env", self._build_s3_rio_env)
+            return dict(rio_env_dict)
         else:
             return {}
 
+    def _build_s3_rio_env(self) -> dict[str, Any]:
+        """Build rasterio environment variables needed for s3 data access.
+
+        :return: The rasterio environment variables
+        """
+        downloader_auth = cast(AwsAuth, self.downloader_auth)
+        rio_env_dict: dict[str, Any] = {"session": rasterio.session.AWSSession(**downloader_auth.get_rio_env())}
+        auth = downloader_auth.s3_resource
+        if auth is None:
+            auth = downloader_auth.authenticate()
+
+        if endpoint_url := auth.meta.client.meta.endpoint_url:
+            aws_s3_endpoint = endpoint_url.split("://")[-1]
+            rio_env_dict.update(
+                AWS_S3_ENDPOINT=aws_s3_endpoint,
+                AWS_HTTPS="YES",
+                AWS_VIRTUAL_HOSTING="FALSE",
+            )
+        return rio_env_dict
+
+    def _get_s3_storage_options(self) -> dict[str, Any]:
+        """Get fsspec s3 storage_options keyword arguments from AwsAuth credentials
+
+        :returns: s3 storage options, without path
+        """
+        downloader_auth = cast(AwsAuth, self.downloader_auth)
+        auth_kwargs: dict[str, Any] = dict()
+        if s3_endpoint := getattr(downloader_auth.config, "s3_endpoint", None):
+            auth_kwargs["client_kwargs"] = {"endpoint_url": s3_endpoint}
+        if creds := cast(Session, downloader_auth.s3_session).get_credentials():
+            auth_kwargs["key"] = creds.access_key
+            auth_kwargs["secret"] = creds.secret_key
+            if creds.token:
+                auth_kwargs["token"] = creds.token
+            if requester_pays := getattr(downloader_auth.config, "requester_pays", False):
+                auth_kwargs["requester_pays"] = requester_pays
+        else:
+            auth_kwargs["anon"] = True
+        return auth_kwargs
+
     def _get_storage_options(
         self,
         asset_key: Optional[str] = None,
@@ -127,7 +212,9 @@ class EOProduct(EOProduct_core):
         """
         Get fsspec storage_options keyword arguments
         """
-        auth = self.downloader_auth.authenticate() if self.downloader_auth else None
+        # authentication objects are cached and shared by all products of the provider
+        auth_cache = get_auth_cache()
+        auth = auth_cache.authenticate(self.downloader_auth) if self.downloader_auth else None
         if self.downloader is None:
             return {}
 
@@ -143,20 +230,8 @@ class EOProduct(EOProduct_core):
         headers = {**USER_AGENT}
 
         if isinstance(auth, ServiceResource) and isinstance(self.downloader_auth, AwsAuth):
-            auth_kwargs: dict[str, Any] = dict()
-            # AwsAuth
-            if s3_endpoint := getattr(self.downloader_auth.config, "s3_endpoint", None):
-                auth_kwargs["client_kwargs"] = {"endpoint_url": s3_endpoint}
-            if creds := cast(Session, self.downloader_auth.s3_session).get_credentials():
-                auth_kwargs["key"] = creds.access_key
-                auth_kwargs["secret"] = creds.secret_key
-                if creds.token:
-                    auth_kwargs["token"] = creds.token
-                if requester_pays := getattr(self.downloader_auth.config, "requester_pays", False):
-                    auth_kwargs["requester_pays"] = requester_pays
-            else:
-                auth_kwargs["anon"] = True
-            return {"path": url, **auth_kwargs}
+            auth_kwargs = auth_cache.get(self.downloader_auth, "s3_storage_options", self._get_s3_storage_options)
+            return {"path": url, **copy.deepcopy(auth_kwargs)}
 
         if isinstance(auth, AuthBase):
             # update url and headers with auth
@@ -193,12 +268,16 @@ class EOProduct(EOProduct_core):
             raise UnsupportedDatasetAddressScheme(f"Could not get {self} path")
 
         protocol = fsspec.utils.get_protocol(path)
+        # pooled filesystems share their client sessions between assets and products
+        fs_pool = get_filesystem_pool()
 
         if protocol == "zip+s3":
-            fs = fsspec.filesystem("s3", **storage_options)
-            return OpenFile(fs, path)
+            fs = fs_pool.get("s3", **storage_options)
+            # archive central directory is shared by all its members
+            archive_path, _, member = path.split("://", 1)[1].partition("!")
+            return OpenFile(get_zip_archive_pool().get(fs, archive_path), member)
 
-        fs = fsspec.filesystem(protocol, **storage_options)
+        fs = fs_pool.get(protocol, **storage_options)
         return fs.open(path=path)
 
     def rio_env(self, dataset_address: Optional[str] = None) -> Union[rasterio.env.Env, nullcontext]:
@@ -209,7 +288,7 @@ class EOProduct(EOProduct_core):
         """
         if dataset_address:
             if env_dict := self._get_rio_env(dataset_address):
-                return rasterio.Env(**env_dict)
+                return build_rio_env(env_dict, remote=True)
             return nullcontext()
 
         for asset in self.assets.values():
@@ -218,39 +297,174 @@ class EOProduct(EOProduct_core):
                 return cm
         return nullcontext()
 
-    def _build_local_xarray_dict(self, local_path: str, **xarray_kwargs: Any) -> XarrayDict:
+    def _get_clip_geometry(self, geom: Optional[Union[str, dict[str, float], BaseGeometry]]) -> Optional[BaseGeometry]:
+        """Get geometry used to clip product data
+
+        :param geom: area of interest, or ``"search_intersection"``
+        :returns: clip geometry
+        """
+        if geom is None or isinstance(geom, BaseGeometry):
+            return geom
+        if geom == "search_intersection":
+            if self.search_intersection is None:
+                logger.debug(f"{self} has no search intersection, data will not be clipped")
+            return self.search_intersection
+        return get_geometry_from_various(geometry=geom)
+
+    def _build_local_xarray_dict(
+        self, local_path: str, basename: Optional[str] = None, **xarray_kwargs: Any
+    ) -> XarrayDict:
         """Build :class:`eodag_cube.types.XarrayDict` for local data
 
-        :param local_path: local path to scan for data
+        Files are first classified by asset key and format, skipping metadata, previews or checksums,
+        then opened concurrently in the shared I/O scheduler. Data files found and the engines that
+        opened them are recorded in a scan manifest, re-used while the scanned files are unchanged.
+
+        :param local_path: local path to scan for data, a directory, a file, or a zip archive whose
+                           members are read in place
+        :param basename: (optional) name of the only files to open
         :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
         :returns: a dictionary of :class:`xarray.Dataset`
         """
-        xarray_dict = XarrayDict()
-        fs = fsspec.filesystem("file")
+        if zipfile.is_zipfile(local_path):
+            # only the needed members of the archive will be read, without extracting it
+            fs = fsspec.filesystem("zip", fo=local_path)
+        else:
+            fs = fsspec.filesystem("file")
+
+        manifests = get_scan_manifests()
+        if (entries := manifests.load(fs, local_path, basename)) is not None:
+            try:
+                xarray_dict, _ = self._open_local_files(
+                    fs, [(entry.path, entry.key, entry.engine) for entry in entries], strict=True, **xarray_kwargs
+                )
+                return xarray_dict
+            except DatasetCreationError as e:
+                logger.debug(f"Outdated scan manifest for {local_path}, scanning it again: {str(e)}")
+                manifests.invalidate(local_path, basename)
+
+        files_keys: list[tuple[str, str, Optional[str]]] = [
+            (file_path, key, None) for file_path, key in self._scan_local_files(fs, local_path, basename)
+        ]
+        xarray_dict, opened = self._open_local_files(fs, files_keys, **xarray_kwargs)
+
+        engine_cache = get_engine_cache()
+        manifests.save(
+            local_path,
+            basename,
+            [
+                ManifestEntry(
+                    file_path,
+                    key,
+                    engine_cache.get(("local", self.provider, self.collection, key)),
+                    *file_stat(fs, file_path),
+                )
+                for file_path, key in opened
+            ],
+        )
+        return xarray_dict
+
+    def _scan_local_files(
+        self, fs: AbstractFileSystem, local_path: str, basename: Optional[str] = None
+    ) -> list[tuple[str, str]]:
+        """Find the data files of local data, with their asset key
 
-        if os.path.isfile(local_path):
+        :param fs: local or zip archive filesystem
+        :param local_path: local path to scan for data
+        :param basename: (optional) name of the only files to keep
+        :returns: path and asset key of the files that installed engines may open
+        """
+        if "zip" in fs.protocol:
+            files = fs.find("")
+        elif os.path.isfile(local_path):
             files = [
                 local_path,
             ]
         else:
             files = [str(x) for x in Path(local_path).rglob("*") if x.is_file()]
 
+        # classify files before opening them, skipping those without asset key or known format
+        files_keys: list[tuple[str, str]] = []
         for file_path in files:
-            if not os.path.isfile(file_path):
+            if basename is not None and os.path.basename(file_path) != basename:
                 continue
-            file = fs.open(file_path)
+            key, _ = self.driver.guess_asset_key_and_roles(file_path, self)
+            if key is None:
+                logger.debug(f"Could not guess asset key for {file_path}")
+            elif not has_engines(OpenFile(fs, file_path)):
+                logger.debug(f"{file_path} skipped, no engine can open it")
+            else:
+                files_keys.append((file_path, key))
+        return files_keys
+
+    def _open_local_files(
+        self,
+        fs: AbstractFileSystem,
+        files_keys: list[tuple[str, str, Optional[str]]],
+        strict: bool = False,
+        **xarray_kwargs: Any,
+    ) -> tuple[XarrayDict, list[tuple[str, str]]]:
+        """Open local files concurrently in the shared I/O scheduler, keeping them in the given order
+
+        :param fs: local or zip archive filesystem
+        :param files_keys: path, asset key and engine (``None`` if unknown) of the files to open
+        :param strict: (optional) raise an error if a file cannot be opened instead of skipping it
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :returns: a dictionary of :class:`xarray.Dataset`, and path and asset key of the opened files
+        :raises: :class:`~eodag_cube.utils.exceptions.DatasetCreationError`
+        """
+        xarray_dict = XarrayDict()
+        opened: list[tuple[str, str]] = []
+
+        calls = []
+        for file_path, key, engine in files_keys:
+            if engine is not None:
+                file_kwargs = {"engine": engine, **xarray_kwargs}
+            else:
+                file_kwargs = {"engine_cache_key": ("local", self.provider, self.collection, key), **xarray_kwargs}
+            calls.append(functools.partial(self._open_local_file, fs, file_path, **file_kwargs))
+        # also concurrent when called from a scheduler thread, e.g. download fallback of a fan-out
+        futures = get_io_scheduler().submit_all(calls)
+        for (file_path, key, _), future in zip(files_keys, futures):
             try:
-                ds = try_open_dataset(file, **xarray_kwargs)
-                key, _ = self.driver.guess_asset_key_and_roles(file_path, self)
-                if key is not None:
-                    xarray_dict[key] = ds
-                    xarray_dict._files[key] = file
-                else:
-                    logger.debug(f"Could not guess asset key for {file_path}")
+                file, ds = future.result()
             except DatasetCreationError as e:
+                if strict:
+                    raise
                 logger.debug(e)
+                continue
+            xarray_dict[key] = ds
+            xarray_dict._files[key] = file
+            opened.append((file_path, key))
 
-        return xarray_dict
+        return xarray_dict, opened
+
+    def _open_local_file(
+        self, fs: AbstractFileSystem, file_path: str, **xarray_kwargs: Any
+    ) -> tuple[OpenFile, xr.Dataset]:
+        """Open a local file, or a member of a local zip archive, as :class:`xarray.Dataset`
+
+        Archive members are read in place, except those only readable by engines needing local
+        files, which are alone extracted to the fsspec local cache.
+
+        :param fs: local or zip archive filesystem
+        :param file_path: path of the file in its filesystem
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :returns: opened file and dataset
+        """
+        file = OpenFile(fs, file_path)
+        try:
+            with self._file_rio_env(file):
+                return file, try_open_dataset(file, **xarray_kwargs)
+        except DatasetCreationError:
+            if "zip" not in fs.protocol or not set(guess_engines(file)) & set(LOCALFILE_ONLY_ENGINES):
+                raise
+        archive_path = fs.of.path
+        local_path = fsspec.open_local(f"simplecache::zip://{file_path}::{archive_path}")
+        logger.debug(f"{file_path} extracted from {archive_path} to {local_path}")
+        file = fsspec.filesystem("file").open(local_path)
+        with self._file_rio_env(file):
+            return file, try_open_dataset(file, **xarray_kwargs)
 
     def to_xarray(
         self,
@@ -258,6 +472,12 @@ class EOProduct(EOProduct_core):
         wait: float = DEFAULT_DOWNLOAD_WAIT,
         timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
         roles: Iterable[str] = {"data", "data-mask"},
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resolution: Optional[Resolution] = None,
+        overview_level: Optional[int] = None,
+        crs: Optional[Any] = None,
+        lazy: bool = False,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
         **xarray_kwargs: Any,
     ) -> XarrayDict:
         """
@@ -270,54 +490,435 @@ class EOProduct(EOProduct_core):
         :param timeout: (optional) If order is needed, maximum time in minutes before
                         stop checking order status
         :param roles: (optional) roles of assets that must be fetched
-        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                     Can be defined in the same ways as the ``geom`` search parameter, or set to
+                     ``"search_intersection"`` to use the intersection of the product geometry
+                     with the search area
+        :param resolution: (optional) resolution in raster CRS units at which rasters are read, as a
+                           single value or a ``(xres, yres)`` tuple. Internal overviews are used when
+                           available, and rasters sharing the same extent are read onto the same grid
+        :param overview_level: (optional) internal overview level at which rasters are read
+        :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                    interest if ``geom`` is set
+        :param lazy: (optional) if ``True``, assets are only opened on first access to their dataset,
+                     or in the background using :meth:`eodag_cube.types.XarrayDict.prefetch`
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely: ``"never"``
+                                  download it, ``"always"`` download it, download it if its remote size in
+                                  bytes is below the given ``int``, or let a callable decide from the
+                                  :class:`eodag_cube.utils.download.DownloadFallbackRequest` it receives. Each
+                                  fallback emits a :class:`eodag_cube.utils.download.DownloadFallbackEvent`
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`. Use
+                              ``chunks="native"`` to read data by dask chunks aligned with its internal layout,
+                              and ``dtype="native"`` or ``dtype="float32"`` to limit memory usage. See
+                              :func:`eodag_cube.utils.xarray.try_open_dataset`
         :returns: a dictionary of :class:`xarray.Dataset`
+        :raises: :class:`~eodag_cube.utils.exceptions.DatasetNotIntersectingError` if the product
+                 does not intersect ``geom``, without downloading it
         """
-        if asset_key is None and len(self.assets) > 0:
-            # assets
+        geometry = self._get_clip_geometry(geom)
+        if geometry is not None and self.geometry is not None and not self.geometry.intersects(box(*geometry.bounds)):
+            raise DatasetNotIntersectingError(f"{self} does not intersect {geometry}")
 
-            # have roles been set in assets ?
-            roles_exist = any("roles" in a for a in self.assets.values())
+        asset_keys = self._get_asset_keys(roles) if asset_key is None else []
+        if asset_keys and lazy:
+            xd = XarrayDict()
+            for key in sorted(asset_keys):
+                xd.set_loader(
+                    key,
+                    functools.partial(
+                        self._to_xarray_single,
+                        key,
+                        wait,
+                        timeout,
+                        geometry,
+                        resolution=resolution,
+                        overview_level=overview_level,
+                        crs=crs,
+                        download_fallback=download_fallback,
+                        **xarray_kwargs,
+                    ),
+                    host=get_host(self.assets[key].get("href")),
+                )
+            return xd
 
+        if asset_keys:
+            # assets
             xd = XarrayDict()
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = (
-                    executor.submit(self.to_xarray, key, wait, timeout, **xarray_kwargs)
-                    for key, asset in self.assets.items()
-                    if roles
-                    and asset.get("roles")
-                    and any(r in asset["roles"] for r in roles)
-                    or not roles
-                    or not roles_exist
+            # assets are opened through the shared bounded I/O scheduler
+            scheduler = get_io_scheduler()
+            futures = [
+                scheduler.submit(
+                    self.to_xarray,
+                    key,
+                    wait,
+                    timeout,
+                    host=get_host(self.assets[key].get("href")),
+                    geom=geometry,
+                    resolution=resolution,
+                    overview_level=overview_level,
+                    crs=crs,
+                    download_fallback=download_fallback,
+                    **xarray_kwargs,
                 )
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        future_xd = future.result()
-                        xd.update(**future_xd)
-                    except DatasetCreationError as e:
-                        logger.debug(e)
+                for key in asset_keys
+            ]
+            errors: list[DatasetCreationError] = []
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future_xd = future.result()
+                    xd.update(future_xd)
+                except DatasetCreationError as e:
+                    logger.debug(e)
+                    errors.append(e)
 
             if xd:
                 xd.sort()
                 return xd
+            if errors and all(isinstance(e, DatasetNotIntersectingError) for e in errors):
+                # windowed read of an area without data, the whole product must not be downloaded
+                raise DatasetNotIntersectingError(f"{self} data does not intersect {geometry}") from errors[0]
 
         # single file
-        try:
-            file = self.get_file_obj(asset_key, wait, timeout)
-            # fix messy protocol with zip+s3 and ignore zip content after "!"
-            base_file_for_env = (
-                getattr(file, "full_name", file.path).replace("s3://zip+s3://", "zip+s3://").split("!")[0]
+        return self._to_xarray_single(
+            asset_key,
+            wait,
+            timeout,
+            geometry,
+            resolution=resolution,
+            overview_level=overview_level,
+            crs=crs,
+            download_fallback=download_fallback,
+            **xarray_kwargs,
+        )
+
+    def iter_xarray(
+        self,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        roles: Iterable[str] = {"data", "data-mask"},
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resolution: Optional[Resolution] = None,
+        overview_level: Optional[int] = None,
+        crs: Optional[Any] = None,
+        max_concurrency: Optional[int] = None,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+        **xarray_kwargs: Any,
+    ) -> Iterator[tuple[str, xr.Dataset]]:
+        """
+        Iterate over product data, yielding each :class:`xarray.Dataset` as soon as it is opened.
+
+        Assets are opened concurrently and yielded by order of completion, so that processing can
+        start while other assets are still being opened. Stopping the iteration cancels the pending
+        opens. Products without assets are yielded as a single ``data`` dataset.
+
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :param roles: (optional) roles of assets that must be fetched
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                     See :meth:`to_xarray`
+        :param resolution: (optional) resolution in raster CRS units at which rasters are read
+        :param overview_level: (optional) internal overview level at which rasters are read
+        :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                    interest if ``geom`` is set
+        :param max_concurrency: (optional) maximum number of assets being opened simultaneously
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely.
+                                  See :meth:`to_xarray`
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :returns: iterator of asset keys and :class:`xarray.Dataset`
+        """
+        for _, key, ds in iter_many(
+            [self],
+            wait,
+            timeout,
+            roles,
+            geom=geom,
+            resolution=resolution,
+            overview_level=overview_level,
+            crs=crs,
+            max_concurrency=max_concurrency,
+            download_fallback=download_fallback,
+            **xarray_kwargs,
+        ):
+            yield key, ds
+
+    def to_datacube(
+        self,
+        assets: Optional[Iterable[str]] = None,
+        resolution: Optional[Resolution] = None,
+        crs: Optional[Any] = None,
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resampling: Resampling = DEFAULT_RESAMPLING,
+        dtype: DTypeLike = "float32",
+        chunks: Optional[Union[int, str, tuple[int, int]]] = None,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        roles: Iterable[str] = {"data", "data-mask"},
+    ) -> xr.Dataset:
+        """
+        Return product raster assets stacked in a single :class:`xarray.Dataset` on a common grid.
+
+        Each asset is read straight into its slice of a ``band`` x ``y`` x ``x`` array, resampling
+        and reprojection happening at read time, so that no intermediate copy is made. Bands are
+        labelled with their asset key, suffixed with the band index for multi-band assets.
+
+        :param assets: (optional) keys of the assets to stack, defaults to the raster assets having one of
+                       the given ``roles``
+        :param resolution: (optional) resolution in ``crs`` units, as a single value or a ``(xres, yres)``
+                           tuple, defaults to the finest resolution of the assets
+        :param crs: (optional) CRS of the datacube, defaults to the CRS of the first asset
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read.
+                     See :meth:`to_xarray`
+        :param resampling: (optional) resampling method
+        :param dtype: (optional) dtype of the datacube. For float dtypes, nodata is set to ``NaN`` and
+                      assets scale and offset are applied
+        :param chunks: (optional) ``y`` and ``x`` dask chunks. If set, the datacube is backed by a dask array
+                       whose chunks are read on demand, needing the ``dask`` extra, otherwise it is read when built
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :param roles: (optional) roles of assets that must be fetched
+        :returns: datacube of the product assets
+        """
+        keys = list(assets) if assets is not None else self._get_asset_keys(roles)
+        for key in keys:
+            if key not in self.assets:
+                raise DatasetCreationError(f"{key} not found in {self} assets")
+        scheduler = get_io_scheduler()
+        futures = {
+            key: scheduler.submit(
+                self._get_raster_profile, key, wait, timeout, host=get_host(self.assets[key].get("href"))
             )
-            gdal_env = self._get_rio_env(base_file_for_env)
-            with rasterio.Env(**gdal_env):
-                ds = try_open_dataset(file, **xarray_kwargs)
-            # set attributes
-            ds.attrs.update(**self.properties)
-            xd_key = asset_key or "data"
-            xd = XarrayDict({xd_key: ds})
-            xd._files[xd_key] = file
-            return xd
+            for key in keys
+        }
+        profiles = {}
+        for key, future in futures.items():
+            try:
+                profiles[key] = future.result()
+            except (UnsupportedDatasetAddressScheme, OSError, DatasetCreationError) as e:
+                if assets is not None:
+                    raise DatasetCreationError(f"Cannot read {self} {key} as raster: {e}") from e
+                logger.debug(f"{key} skipped from {self} datacube: {e}")
+        if not profiles:
+            raise DatasetCreationError(f"No raster asset to build {self} datacube")
+
+        bounds = None
+        if (geometry := self._get_clip_geometry(geom)) is not None:
+            grid_crs = crs if crs is not None else next(iter(profiles.values()))["crs"]
+            bounds = transform_bounds("EPSG:4326", grid_crs, *geometry.bounds)
+        grid = common_grid(profiles.values(), resolution, crs, bounds)
+
+        # (asset key, 1-based band index) of each datacube band
+        bands = [(key, bidx) for key, profile in profiles.items() for bidx in range(1, profile["count"] + 1)]
+        dtype = np.dtype(dtype)
+        # a single fill value for all the bands, matching the datacube _FillValue
+        fill_value = None if np.issubdtype(dtype, np.floating) else (next(iter(profiles.values()))["nodata"] or 0)
+        read_kwargs = {"wait": wait, "timeout": timeout, "grid": grid, "resampling": resampling, "nodata": fill_value}
+
+        if chunks is None:
+            data = np.empty((len(bands), *grid.shape), dtype=dtype)
+            read_futures = []
+            start = 0
+            for key, profile in profiles.items():
+                read_futures.append(
+                    scheduler.submit(
+                        self._read_raster_to_grid,
+                        key,
+                        out=data[start : start + profile["count"]],
+                        host=get_host(self.assets[key].get("href")),
+                        **read_kwargs,
+                    )
+                )
+                start += profile["count"]
+            for read_future in read_futures:
+                read_future.result()
+        else:
+            dask_array = import_dask_array()
+
+            def read_block(block_info: dict[Any, Any]) -> np.ndarray:
+                (band, _), (row_start, row_stop), (col_start, col_stop) = block_info[None]["array-location"]
+                key, bidx = bands[band]
+                out = np.empty((1, row_stop - row_start, col_stop - col_start), dtype=dtype)
+                window = Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+                return self._read_raster_to_grid(key, out=out, indexes=[bidx], window=window, **read_kwargs)
+
+            yx_chunks = (chunks, chunks) if isinstance(chunks, (int, str)) else chunks
+            data = dask_array.map_blocks(
+                read_block,
+                chunks=dask_array.core.normalize_chunks((1, *yx_chunks), (len(bands), *grid.shape), dtype=dtype),
+                dtype=dtype,
+                meta=np.array((), dtype=dtype),
+            )
+
+        x, y = grid.xy_coords()
+        labels = [key if profiles[key]["count"] == 1 else f"{key}_{bidx}" for key, bidx in bands]
+        ds = xr.Dataset({"band_data": (("band", "y", "x"), data)}, coords={"band": labels, "y": y, "x": x})
+        if fill_value is not None:
+            ds["band_data"].attrs["_FillValue"] = fill_value
+        ds = ds.rio.write_crs(grid.crs).rio.write_transform(grid.transform)
+        ds.attrs.update(**self.properties)
+        return ds
 
+    async def aget_file_obj(
+        self,
+        asset_key: Optional[str] = None,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    ) -> OpenFile:
+        """Coroutine opening data using fsspec, see :meth:`get_file_obj`
+
+        Authentication and ordering are run in the shared I/O scheduler.
+
+        :param asset_key: (optional) key of the asset. If not specified the whole
+                          product will be opened
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :returns: product data file object
+        """
+        return await run_in_scheduler(self.get_file_obj, asset_key, wait, timeout)
+
+    async def ato_xarray(
+        self,
+        asset_key: Optional[str] = None,
+        wait: float = DEFAULT_DOWNLOAD_WAIT,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        roles: Iterable[str] = {"data", "data-mask"},
+        geom: Optional[Union[str, dict[str, float], BaseGeometry]] = None,
+        resolution: Optional[Resolution] = None,
+        overview_level: Optional[int] = None,
+        crs: Optional[Any] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+        **xarray_kwargs: Any,
+    ) -> XarrayDict:
+        """
+        Coroutine returning product data as a dictionary of :class:`xarray.Dataset`, see :meth:`to_xarray`.
+
+        Files format is identified using the async cores of the filesystems, and datasets are then
+        decoded in the shared I/O scheduler. Cancelling the coroutine cancels the pending opens.
+
+        :param asset_key: (optional) key of the asset. If not specified the whole
+                          product data will be retrieved
+        :param wait: (optional) If order is needed, wait time in minutes between two
+                     order status check
+        :param timeout: (optional) If order is needed, maximum time in minutes before
+                        stop checking order status
+        :param roles: (optional) roles of assets that must be fetched
+        :param geom: (optional) area of interest, only data intersecting its bounding box will be read
+        :param resolution: (optional) resolution in raster CRS units at which rasters are read
+        :param overview_level: (optional) internal overview level at which rasters are read
+        :param crs: (optional) CRS to which rasters are reprojected at read time, only reading the area of
+                    interest if ``geom`` is set
+        :param semaphore: (optional) semaphore limiting the number of files opened simultaneously,
+                          that can be shared by several coroutines. Defaults to a new semaphore
+                          allowing :data:`~eodag_cube.utils.aio.DEFAULT_ASYNC_CONCURRENCY` opens
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely.
+                                  See :meth:`to_xarray`
+        :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+        :returns: a dictionary of :class:`xarray.Dataset`
+        """
+        geometry = self._get_clip_geometry(geom)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(DEFAULT_ASYNC_CONCURRENCY)
+
+        if asset_key is None and len(self.assets) > 0:
+
+            async def ato_xarray_asset(key: str) -> XarrayDict:
+                try:
+                    return await self.ato_xarray(
+                        key,
+                        wait,
+                        timeout,
+                        geom=geometry,
+                        resolution=resolution,
+                        overview_level=overview_level,
+                        crs=crs,
+                        semaphore=semaphore,
+                        download_fallback=download_fallback,
+                        **xarray_kwargs,
+                    )
+                except DatasetCreationError as e:
+                    logger.debug(e)
+                    return XarrayDict()
+
+            xd = XarrayDict()
+            for asset_xd in await asyncio.gather(*(ato_xarray_asset(key) for key in self._get_asset_keys(roles))):
+                xd.update(asset_xd)
+
+            if xd:
+                xd.sort()
+                return xd
+
+        async with semaphore:
+            file: Optional[OpenFile] = None
+            try:
+                file = await self.aget_file_obj(asset_key, wait, timeout)
+                # format identified using the async cores of the filesystems, not to block workers
+                engines = None if xarray_kwargs.get("engine") else await async_guess_engines(file)
+                ds = await run_in_scheduler(
+                    self._open_file_dataset,
+                    file,
+                    asset_key,
+                    host=get_host(file.path),
+                    resolution=resolution,
+                    overview_level=overview_level,
+                    crs=crs,
+                    geometry=geometry,
+                    engines=engines,
+                    **xarray_kwargs,
+                )
+            except (
+                UnsupportedDatasetAddressScheme,
+                OSError,
+                DatasetCreationError,
+            ) as e:
+                logger.debug(f"Cannot open {self} {asset_key if asset_key else ''}: {e}")
+
+                # download the file and try again with local files
+                return await run_in_scheduler(
+                    self._build_downloaded_xarray_dict,
+                    asset_key,
+                    wait,
+                    timeout,
+                    geometry,
+                    file=file,
+                    reason=e,
+                    download_fallback=download_fallback,
+                    resolution=resolution,
+                    overview_level=overview_level,
+                    crs=crs,
+                    **xarray_kwargs,
+                )
+
+        return self._build_file_xarray_dict(file, ds, asset_key, geometry)
+
+    def _to_xarray_single(
+        self,
+        asset_key: Optional[str],
+        wait: float,
+        timeout: float,
+        geometry: Optional[BaseGeometry],
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+        **xarray_kwargs: Any,
+    ) -> XarrayDict:
+        """Open a single asset, or the whole product as a single file, downloading it if needed
+
+        :param asset_key: key of the asset, or ``None`` for the whole product
+        :param wait: If order is needed, wait time in minutes between two order status check
+        :param timeout: If order is needed, maximum time in minutes before stop checking order status
+        :param geometry: clip geometry
+        :param download_fallback: (optional) policy applied when data cannot be opened remotely
+        :param xarray_kwargs: keyword arguments passed to :func:`eodag_cube.utils.xarray.try_open_dataset`
+        :returns: a dictionary of :class:`xarray.Dataset`
+        """
+        file: Optional[OpenFile] = None
+        try:
+            file = self.get_file_obj(asset_key, wait, timeout)
+            ds = self._open_file_dataset(file, asset_key, geometry, **xarray_kwargs)
         except (
             UnsupportedDatasetAddressScheme,
             OSError,
@@ -326,29 +927,275 @@ class EOProduct(EOProduct_core):
             logger.debug(f"Cannot open {self} {asset_key if asset_key else ''}: {e}")
 
             # download the file and try again with local files
-            path = self.download(asset=asset_key, wait=wait, timeout=timeout, extract=True)
+            return self._build_downloaded_xarray_dict(
+                asset_key,
+                wait,
+                timeout,
+                geometry,
+                file=file,
+                reason=e,
+                download_fallback=download_fallback,
+                **xarray_kwargs,
+            )
 
-            if asset_key is not None:
-                # path is not asset-specific, find asset path
-                # TODO: make download return asset path
-                basename = urlparse(self.assets[asset_key]["href"]).path.strip("/").split("/")[-1]
-                try:
-                    path = str(next(Path(path).rglob(basename)))
-                except StopIteration:
-                    logger.debug(f"{basename} not found in {path}")
+        return self._build_file_xarray_dict(file, ds, asset_key, geometry)
+
+    def _get_asset_keys(self, roles: Iterable[str]) -> list[str]:
+        """Get keys of the assets having one of the given roles
+
+        :param roles: roles of assets that must be fetched
+        :returns: asset keys
+        """
+        # have roles been set in assets ?
+        roles_exist = any("roles" in a for a in self.assets.values())
+        return [
+            key
+            for key, asset in self.assets.items()
+            if roles and asset.get("roles") and any(r in asset["roles"] for r in roles) or not roles or not roles_exist
+        ]
+
+    def _file_rio_env(self, file: OpenFile) -> ContextManager[Any]:
+        """Get the rasterio environment used to read a file of the product
+
+        :param file: fsspec OpenFile
+        :returns: rasterio environment context manager
+        """
+        # zip archives members are read using their archive environment
+        env_file = zip_archive(file) or file
+        # fix messy protocol with zip+s3 and ignore zip content after "!"
+        base_file_for_env = (
+            getattr(env_file, "full_name", env_file.path).replace("s3://zip+s3://", "zip+s3://").split("!")[0]
+        )
+        remote = "file" not in env_file.fs.protocol
+        return get_rio_env_manager().env(self._get_rio_env(base_file_for_env), remote=remote)
+
+    def _open_file_dataset(
+        self,
+        file: OpenFile,
+        asset_key: Optional[str],
+        geometry: Optional[BaseGeometry] = None,
+        **kwargs: Any,
+    ) -> xr.Dataset:
+        """Open a file as :class:`xarray.Dataset` in the rasterio environment of the product
+
+        :param file: fsspec OpenFile
+        :param asset_key: key of the asset, or ``None`` for the whole product
+        :param geometry: (optional) clip geometry, limiting the extent of reprojected rasters
+        :param kwargs: keyword arguments passed to :func:`eodag_cube.utils.xarray.try_open_dataset`
+        :returns: opened dataset
+        """
+        if kwargs.get("crs") is not None and geometry is not None:
+            kwargs["geometry"] = geometry
+        with self._file_rio_env(file):
+            return try_open_dataset(file, engine_cache_key=(self.provider, self.collection, asset_key), **kwargs)
+
+    def _get_raster_profile(self, asset_key: str, wait: float, timeout: float) -> dict[str, Any]:
+        """Get the profile of a raster asset
+
+        :param asset_key: key of the asset
+        :param wait: If order is needed, wait time in minutes between two order status check
+        :param timeout: If order is needed, maximum time in minutes before stop checking order status
+        :returns: raster profile
+        """
+        file = self.get_file_obj(asset_key, wait, timeout)
+        url, opener = rasterio_source(file)
+        try:
+            with self._file_rio_env(file), rasterio.open(url, opener=opener) as src:
+                return src.profile
+        except rasterio.errors.RasterioIOError as e:
+            raise DatasetCreationError(str(e)) from e
+
+    def _read_raster_to_grid(
+        self,
+        asset_key: str,
+        wait: float,
+        timeout: float,
+        grid: RasterGrid,
+        out: np.ndarray,
+        indexes: Optional[list[int]] = None,
+        window: Optional[Window] = None,
+        resampling: Resampling = DEFAULT_RESAMPLING,
+        nodata: Optional[float] = None,
+    ) -> np.ndarray:
+        """Read a raster asset onto a grid into a preallocated array, scaled if it is a float array
+
+        :param asset_key: key of the asset
+        :param wait: If order is needed, wait time in minutes between two order status check
+        :param timeout: If order is needed, maximum time in minutes before stop checking order status
+        :param grid: output grid
+        :param out: output array
+        :param indexes: (optional) 1-based indexes of the bands to read, defaults to all bands
+        :param window: (optional) window of the grid to read
+        :param resampling: (optional) resampling method
+        :param nodata: (optional) value of the pixels without data, see :func:`~eodag_cube.utils.raster.read_to_grid`
+        :returns: the output array
+        """
+        file = self.get_file_obj(asset_key, wait, timeout)
+        url, opener = rasterio_source(file)
+        with self._file_rio_env(file), rasterio.open(url, opener=opener) as src:
+            indexes = indexes or list(range(1, src.count + 1))
+            read_to_grid(src, grid, out, indexes=indexes, window=window, resampling=resampling, nodata=nodata)
+            if np.issubdtype(out.dtype, np.floating):
+                # in place, not to copy the array
+                for band, bidx in zip(out, indexes):
+                    if (scale := src.scales[bidx - 1]) != 1:
+                        band *= scale
+                    if (offset := src.offsets[bidx - 1]) != 0:
+                        band += offset
+        return out
 
+    def _build_file_xarray_dict(
+        self,
+        file: OpenFile,
+        ds: xr.Dataset,
+        asset_key: Optional[str],
+        geometry: Optional[BaseGeometry],
+    ) -> XarrayDict:
+        """Build :class:`eodag_cube.types.XarrayDict` from a dataset opened from a file
+
+        :param file: fsspec OpenFile the dataset was opened from
+        :param ds: opened dataset
+        :param asset_key: key of the asset, or ``None`` for the whole product
+        :param geometry: clip geometry
+        :returns: a dictionary of :class:`xarray.Dataset`
+        """
+        if geometry is not None:
+            # windowed read: clipped before any data is loaded
+            try:
+                ds = clip_dataset(ds, geometry)
+            except DatasetCreationError:
+                # the dataset is closed by clip_dataset, close its file too
+                file.close()
+                raise
+        # set attributes
+        ds.attrs.update(**self.properties)
+        xd_key = asset_key or "data"
+        xd = XarrayDict({xd_key: ds})
+        xd._files[xd_key] = file
+        return xd
+
+    def _build_downloaded_xarray_dict(
+        self,
+        asset_key: Optional[str],
+        wait: float,
+        timeout: float,
+        geometry: Optional[BaseGeometry],
+        file: Optional[OpenFile] = None,
+        reason: Optional[Exception] = None,
+        download_fallback: DownloadFallback = DEFAULT_DOWNLOAD_FALLBACK,
+        **xarray_kwargs: Any,
+    ) -> XarrayDict:
+        """Download product or asset if allowed by the download fallback policy, and build
+        :class:`eodag_cube.types.XarrayDict` for local data
+
+        :param asset_key: key of the asset, or ``None`` for the whole product
+        :param wait: If order is needed, wait time in minutes between two order status check
+        :param timeout: If order is needed, maximum time in minutes before stop checking order status
+        :param geometry: clip geometry
+        :param file: (optional) fsspec OpenFile of the remote data, used to get its size
+        :param reason: (optional) error that prevented to open the remote data
+        :param download_fallback: (optional) download fallback policy
+        :param xarray_kwargs: keyword arguments passed to :func:`eodag_cube.utils.xarray.try_open_dataset`
+        :returns: a dictionary of :class:`xarray.Dataset`
+        """
+        path = self._download_fallback(asset_key, wait, timeout, file, reason, download_fallback)
+        if os.path.isfile(path) and not zipfile.is_zipfile(path) and tarfile.is_tarfile(path):
+            # only zip archives are read in place
+            path = self._extract_archive(path)
+
+        basename = None
+        if asset_key is not None:
+            # path is not asset-specific, find asset path
+            # TODO: make download return asset path
+            basename = urlparse(self.assets[asset_key]["href"]).path.strip("/").split("/")[-1]
+
+        xd = self._build_local_xarray_dict(path, basename=basename, **xarray_kwargs)
+        if not xd and basename is not None:
+            logger.debug(f"{basename} not found in {path}")
             xd = self._build_local_xarray_dict(path, **xarray_kwargs)
-            if not xd:
-                raise DatasetCreationError(
-                    f"Could not build local XarrayDict for {self} {asset_key if asset_key else ''}"
-                ) from None
-            # set attributes
-            for k in xd.keys():
-                xd[k].attrs.update(**self.properties)
-            # sort by keys
-            xd.sort()
+        if geometry is not None:
+            for k in list(xd.keys()):
+                try:
+                    xd[k] = clip_dataset(xd[k], geometry)
+                except DatasetCreationError as e:
+                    logger.debug(f"{k} skipped: {e}")
+                    del xd[k]
+                    # the dataset is closed by clip_dataset, close its file too
+                    if (file := xd._files.pop(k, None)) is not None:
+                        file.close()
+        if not xd:
+            raise DatasetCreationError(
+                f"Could not build local XarrayDict for {self} {asset_key if asset_key else ''}"
+            ) from None
+        # set attributes
+        for k in xd.keys():
+            xd[k].attrs.update(**self.properties)
+        # sort by keys
+        xd.sort()
 
-            return xd
+        return xd
+
+    def _download_fallback(
+        self,
+        asset_key: Optional[str],
+        wait: float,
+        timeout: float,
+        file: Optional[OpenFile],
+        reason: Optional[Exception],
+        download_fallback: DownloadFallback,
+    ) -> str:
+        """Download product or asset if allowed by the download fallback policy, emitting a
+        :class:`eodag_cube.utils.download.DownloadFallbackEvent`
+
+        :param asset_key: key of the asset, or ``None`` for the whole product
+        :param wait: If order is needed, wait time in minutes between two order status check
+        :param timeout: If order is needed, maximum time in minutes before stop checking order status
+        :param file: fsspec OpenFile of the remote data, if any
+        :param reason: error that prevented to open the remote data, if any
+        :param download_fallback: download fallback policy
+        :returns: local path of the downloaded data
+        """
+        asset = self.assets[asset_key] if asset_key is not None else self.properties
+        request = DownloadFallbackRequest(
+            str(self.properties.get("id")), self.provider, asset_key, remote_size(file, asset), str(reason or "")
+        )
+        policy, allowed = download_fallback_policy(download_fallback, request)
+        if not allowed:
+            emit_download_fallback_event(DownloadFallbackEvent(*request, policy=policy, allowed=False))
+            raise DatasetCreationError(
+                f"Cannot open {self} {asset_key or ''} remotely, and its download is refused by {policy} "
+                f"download fallback policy"
+            ) from reason
+
+        start = time.monotonic()
+        try:
+            # archives are kept as is, zip archives being read in place
+            path = self.download(asset=asset_key, wait=wait, timeout=timeout, extract=False)
+        except Exception as e:
+            duration = time.monotonic() - start
+            emit_download_fallback_event(
+                DownloadFallbackEvent(*request, policy=policy, allowed=True, duration=duration, error=str(e))
+            )
+            raise
+        emit_download_fallback_event(
+            DownloadFallbackEvent(*request, policy=policy, allowed=True, duration=time.monotonic() - start, path=path)
+        )
+        return path
+
+    @staticmethod
+    def _extract_archive(archive_path: str) -> str:
+        """Extract a tar archive, compressed or not, into a directory next to it named after the archive
+        without its suffix (``foo.tar.gz`` is extracted to ``foo``). Already extracted archives, whose
+        directory exists and is not empty, are not extracted again.
+
+        :param archive_path: local tar archive path
+        :returns: extracted directory path
+        """
+        suffix = next((ext for ext in TAR_ARCHIVE_SUFFIXES if archive_path.lower().endswith(ext)), None)
+        product_path = archive_path[: -len(suffix)] if suffix else os.path.splitext(archive_path)[0]
+        if not os.path.isdir(product_path) or not os.listdir(product_path):
+            shutil.unpack_archive(archive_path, product_path, format="tar")
+        return product_path
 
     def augment_from_xarray(
         self,
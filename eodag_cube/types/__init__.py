@@ -20,16 +20,68 @@
 from __future__ import annotations
 
 import logging
+import threading
+import weakref
 from collections import UserDict
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import xarray as xr
+from fsspec.core import OpenFile
 
-if TYPE_CHECKING:
-    from fsspec.core import OpenFile
+from eodag_cube.utils.exceptions import DatasetCreationError
+from eodag_cube.utils.scheduler import get_io_scheduler
 
 logger = logging.getLogger("eodag-cube.types")
 
+# file objects tracked by each live XarrayDict, by id
+_tracked_files: dict[int, dict[str, OpenFile]] = {}
+_tracked_files_lock = threading.Lock()
+
+
+def _untrack_files(xd_id: int) -> None:
+    with _tracked_files_lock:
+        _tracked_files.pop(xd_id, None)
+
+
+def _buffered_bytes(file: OpenFile) -> int:
+    """Size of the data buffered by a file object read cache"""
+    cache = getattr(file, "cache", None)
+    if cache is None:
+        return 0
+    data = getattr(cache, "cache", None)
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if hasattr(cache, "cache_info"):
+        # block caches
+        return cache.cache_info().currsize * getattr(cache, "blocksize", 0)
+    return 0
+
+
+def _files_stats(files: Iterable[OpenFile]) -> dict[str, int]:
+    files = list(files)
+    # fsspec OpenFile wrappers have no handle of their own, their file objects being opened on demand
+    opened = [f for f in files if hasattr(f, "closed") and not f.closed]
+    return {
+        "handles": len(opened),
+        "wrappers": sum(isinstance(f, OpenFile) for f in files),
+        "buffered_bytes": sum(_buffered_bytes(f) for f in opened),
+    }
+
+
+def open_files_stats() -> dict[str, int]:
+    """Get file objects statistics of all the live :class:`XarrayDict`
+
+    :returns: number of live dictionaries, open file handles, fsspec ``OpenFile`` wrappers and bytes
+              buffered by the read caches of the open files
+    """
+    with _tracked_files_lock:
+        files_dicts = list(_tracked_files.values())
+    return {
+        "dicts": len(files_dicts),
+        **_files_stats(f for files in files_dicts for f in list(files.values())),
+    }
+
 
 class XarrayDict(UserDict[str, xr.Dataset]):
     """
@@ -57,9 +109,157 @@ class XarrayDict(UserDict[str, xr.Dataset]):
     <XarrayDict> (2)
     {'foo': <xarray.Dataset> (x: 2) Size: 32B,
     'bar': <xarray.Dataset> (y: 3) Size: 48B}
+
+    Datasets can also be lazily opened: keys registered using :meth:`set_loader` are listed
+    with the other keys, but their dataset is only opened, and cached, on first access.
+
+    Copies share the datasets and loaders, but have their own state: file objects remain owned,
+    and closed, by the copied dictionary. Pickled dictionaries are restored without file objects,
+    datasets re-opening their own files.
     """
 
-    _files: dict[str, OpenFile] = {}
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._init_state()
+        self._loaders: dict[str, tuple[Callable[[], XarrayDict], Optional[str]]] = {}
+        super().__init__(*args, **kwargs)
+
+    def _init_state(self) -> None:
+        """Initialize the state bound to this instance, that is neither copied nor pickled"""
+        # file objects the datasets were opened from, closed with the datasets
+        self._files: dict[str, OpenFile] = {}
+        with _tracked_files_lock:
+            _tracked_files[id(self)] = self._files
+        # only forget references when garbage collected, file objects may still be used by datasets
+        weakref.finalize(self, _untrack_files, id(self))
+        self._loading: dict[str, Future[None]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        for attr in ("_files", "_loading", "_lock"):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_loaders", {})
+        self._init_state()
+
+    def copy(self) -> XarrayDict:
+        """Shallow copy, sharing datasets and loaders, file objects remaining owned by this dictionary
+
+        :returns: a copy of the dictionary
+        """
+        with self._lock:
+            other = type(self)()
+            other.data = dict(self.data)
+            other._loaders = dict(self._loaders)
+        return other
+
+    __copy__ = copy
+
+    def __getitem__(self, key: str) -> xr.Dataset:
+        if key not in self.data and key in self._loaders:
+            self._load(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, item: xr.Dataset) -> None:
+        self._loaders.pop(key, None)
+        super().__setitem__(key, item)
+
+    def __delitem__(self, key: str) -> None:
+        if self._loaders.pop(key, None) is not None and key not in self.data:
+            return
+        super().__delitem__(key)
+
+    def update(self, other: Any = (), /, **kwargs: xr.Dataset) -> None:
+        """Update datasets, and their file objects if ``other`` is an :class:`XarrayDict`"""
+        super().update(other, **kwargs)
+        if isinstance(other, XarrayDict):
+            self._files.update({k: f for k, f in other._files.items() if k in self.data})
+
+    def files_stats(self) -> dict[str, int]:
+        """Get file objects statistics
+
+        :returns: number of open file handles, fsspec ``OpenFile`` wrappers and bytes buffered by the
+                  read caches of the open files
+        """
+        return _files_stats(list(self._files.values()))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data or key in self._loaders
+
+    def __iter__(self) -> Iterator[str]:
+        # lazy datasets keep their position once opened
+        return iter(dict.fromkeys([*self._loaders, *self.data]))
+
+    def __len__(self) -> int:
+        return len(self._loaders.keys() | self.data.keys())
+
+    def set_loader(self, key: str, loader: Callable[[], XarrayDict], host: Optional[str] = None) -> None:
+        """Register a lazily opened dataset
+
+        :param key: dataset key
+        :param loader: callable opening the dataset, returning a dictionary containing it
+        :param host: (optional) host accessed by the loader, used to limit concurrent prefetches
+        """
+        self.data.pop(key, None)
+        self._loaders[key] = (loader, host)
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether the dataset of the given key has already been opened
+
+        :param key: dataset key
+        :returns: ``True`` if the dataset is opened
+        """
+        return key in self.data
+
+    def _load(self, key: str) -> None:
+        """Open a lazy dataset, waiting for it if it is already being opened by another thread"""
+        with self._lock:
+            if key in self.data or key not in self._loaders:
+                return
+            future = self._loading.get(key)
+            owner = future is None
+            if future is None:
+                future = self._loading[key] = Future()
+        if not owner:
+            future.result()
+            return
+
+        loader, _ = self._loaders[key]
+        try:
+            xd = loader()
+            with self._lock:
+                for k, ds in xd.data.items():
+                    self.data.setdefault(k, ds)
+                    if k in xd._files:
+                        self._files[k] = xd._files[k]
+            if key not in self.data:
+                raise DatasetCreationError(f"Could not open {key}, got {list(xd.data.keys())}")
+            future.set_result(None)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    def prefetch(self, keys: Optional[Iterable[str]] = None) -> list[Future[None]]:
+        """Open lazy datasets in the background, using the shared I/O scheduler
+
+        :param keys: (optional) keys of the datasets to open, defaults to all the datasets not opened yet
+        :returns: futures of the opening of each dataset
+        """
+        scheduler = get_io_scheduler()
+        keys = list(self._loaders) if keys is None else keys
+        futures = []
+        for key in keys:
+            if key not in self:
+                raise KeyError(key)
+            if key not in self.data:
+                futures.append(scheduler.submit(self._load, key, host=self._loaders[key][1]))
+        return futures
 
     def __enter__(self):
         return self
@@ -95,7 +295,12 @@ class XarrayDict(UserDict[str, xr.Dataset]):
         return (
             f"<{type(self).__name__}> ({len(self)})\n"
             + "{"
-            + ",\n".join([f"'{k}': {self._formatted_title_raw(v)}" for k, v in self.items()])
+            + ",\n".join(
+                [
+                    f"'{k}': {self._formatted_title_raw(self.data[k]) if k in self.data else '<not loaded>'}"
+                    for k in self
+                ]
+            )
             + "}"
         )
 
@@ -122,19 +327,28 @@ class XarrayDict(UserDict[str, xr.Dataset]):
                     </details>
                     </td></tr>
                     """
-                    for k, v in self.items()
+                    for k, v in self.data.items()
+                ]
+                + [
+                    f"""<tr {tr_style}><td style='text-align: left; color: grey;'>
+                        '{k}':&ensp;not loaded
+                    </td></tr>
+                    """
+                    for k in self._loaders
+                    if k not in self.data
                 ]
             )
             + "</tbody></table>"
         )
 
     def close(self) -> None:
-        """Close all datasets and associated file objects"""
-        for k, ds in self.items():
+        """Close all opened datasets and associated file objects"""
+        for k, ds in list(self.data.items()):
             ds.close()
             if k in self._files:
-                self._files[k].close()
+                self._files.pop(k).close()
 
     def sort(self) -> None:
         """In place sort items by keys"""
         self.data = dict(sorted(self.data.items()))
+        self._loaders = dict(sorted(self._loaders.items()))
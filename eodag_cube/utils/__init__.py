@@ -29,8 +29,12 @@ from typing import TYPE_CHECKING, Any, Optional, cast
 from urllib.parse import urlparse
 
 import requests
-from eodag.utils import guess_extension, parse_header
+from eodag.utils import HTTP_REQ_TIMEOUT, guess_extension, parse_header
 from rasterio.crs import CRS
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from eodag_cube.utils.scheduler import DEFAULT_MAX_WORKERS
 
 if TYPE_CHECKING:
     from fsspec.core import OpenFile
@@ -39,34 +43,77 @@ logger = logging.getLogger("eodag-cube.utils")
 
 DEFAULT_PROJ = CRS.from_epsg(4326)
 
+#: Last byte requested when probing a file using a ranged ``GET`` request
+PROBE_RANGE_END = 0
+
+_http_session = requests.Session()
+_http_session.mount("http://", HTTPAdapter(pool_maxsize=DEFAULT_MAX_WORKERS))
+_http_session.mount("https://", HTTPAdapter(pool_maxsize=DEFAULT_MAX_WORKERS))
+
+
+def get_http_session() -> requests.Session:
+    """Get the process-wide :class:`requests.Session` used for metadata requests
+
+    Its connection pool is shared by all header probes, so that successive requests to
+    the same host reuse open connections.
+
+    :returns: shared HTTP session
+    """
+    return _http_session
+
 
 def fsspec_file_headers(file: OpenFile) -> Optional[dict[str, Any]]:
     """
     Get HTTP headers from fsspec OpenFile
 
+    Uses a ``HEAD`` request, or if not allowed a ``GET`` request limited to the first byte
+    of the file.
+
     :param file: fsspec https OpenFile
     :returns: file headers or ``None``
     """
-    file_kwargs = getattr(file, "kwargs", {})
+    file_kwargs = dict(getattr(file, "kwargs", {}))
+    file_kwargs.setdefault("timeout", HTTP_REQ_TIMEOUT)
+    session = get_http_session()
     if "https" in file.fs.protocol:
         try:
-            resp = requests.head(file.path, **file_kwargs)
+            resp = session.head(file.path, **file_kwargs)
             resp.raise_for_status()
         except requests.RequestException:
             pass
         else:
             return dict(resp.headers)
         # if HEAD method is not available, try to get a minimal part of the file
+        file_kwargs["headers"] = {**(file_kwargs.get("headers") or {}), "Range": f"bytes=0-{PROBE_RANGE_END}"}
         try:
-            resp = requests.get(file.path, **file_kwargs)
-            resp.raise_for_status()
+            with session.get(file.path, stream=True, **file_kwargs) as resp:
+                resp.raise_for_status()
+                headers = dict(resp.headers)
+                if resp.status_code == 206:
+                    # consume the few requested bytes to release the connection to the pool
+                    resp.raw.read(PROBE_RANGE_END + 1)
+                    headers = full_size_headers(headers)
+                # otherwise the server ignored the range: close without reading the body
         except requests.RequestException:
             pass
         else:
-            return dict(resp.headers)
+            return headers
     return None
 
 
+def full_size_headers(headers: dict[str, Any]) -> dict[str, Any]:
+    """Replace the content length of a ranged response headers with the full file size
+
+    :param headers: headers of a ``206 Partial Content`` response
+    :returns: updated headers
+    """
+    content_range = CaseInsensitiveDict(headers).get("content-range", "")
+    if (total_size := content_range.rsplit("/", 1)[-1]).isdigit():
+        headers = {k: v for k, v in headers.items() if k.lower() != "content-length"}
+        headers["Content-Length"] = total_size
+    return headers
+
+
 def fsspec_file_extension(file: OpenFile) -> Optional[str]:
     """
     Get file extension from fsspec OpenFile
@@ -74,9 +121,21 @@ def fsspec_file_extension(file: OpenFile) -> Optional[str]:
     :param file: fsspec https OpenFile
     :returns: file extension or ``None``
     """
+    return file_extension_from_headers(file, fsspec_file_headers(file))
+
+
+def file_extension_from_headers(file: OpenFile, file_headers: Optional[dict[str, Any]]) -> Optional[str]:
+    """
+    Get file extension from fsspec OpenFile and its HTTP headers
+
+    :param file: fsspec OpenFile
+    :param file_headers: file HTTP headers, if any
+    :returns: file extension or ``None``
+    """
     IGNORED_MIMETYPES = ["application/octet-stream"]
     extension = None
-    if headers := fsspec_file_headers(file):
+    if file_headers:
+        headers = CaseInsensitiveDict(file_headers)
         content_disposition = headers.get("content-disposition")
         if content_disposition:
             filename = cast(
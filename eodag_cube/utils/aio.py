@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Asyncio-related utilities"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional, TypeVar
+
+import aiohttp
+
+from eodag_cube.utils import PROBE_RANGE_END, file_extension_from_headers, full_size_headers
+from eodag_cube.utils.scheduler import get_io_scheduler
+from eodag_cube.utils.xarray import SNIFF_SIZE, engines_for_extension, read_header, sniff_engines, sniff_format
+
+if TYPE_CHECKING:
+    from fsspec.core import OpenFile
+    from fsspec.spec import AbstractFileSystem
+
+logger = logging.getLogger("eodag-cube.utils.aio")
+
+T = TypeVar("T")
+
+#: Default maximum number of assets opened simultaneously by a coroutine
+DEFAULT_ASYNC_CONCURRENCY = int(os.getenv("EODAG_CUBE_ASYNC_CONCURRENCY", 64))
+
+
+async def run_in_scheduler(fn: Callable[..., T], /, *args: Any, host: Optional[str] = None, **kwargs: Any) -> T:
+    """Run a blocking callable in the shared :class:`~eodag_cube.utils.scheduler.IOScheduler`
+    without blocking the event loop.
+
+    If the awaiting task is cancelled before the callable started, it will not be run.
+
+    :param fn: callable to run
+    :param args: callable positional arguments
+    :param host: (optional) host accessed by the callable, used to apply per-host limits
+    :param kwargs: callable keyword arguments
+    :returns: callable result
+    """
+    return await asyncio.wrap_future(get_io_scheduler().submit(fn, *args, host=host, **kwargs))
+
+
+async def run_on_fs_loop(fs: AbstractFileSystem, coro: Coroutine[Any, Any, T]) -> T:
+    """Await a coroutine of an async fsspec filesystem from any event loop.
+
+    Pooled filesystems are bound to the fsspec I/O loop, coroutines using their client
+    sessions are run there and awaited without blocking a thread.
+
+    :param fs: async fsspec filesystem
+    :param coro: coroutine using the filesystem
+    :returns: coroutine result
+    """
+    if fs.loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, fs.loop))
+
+
+async def _http_headers(fs: AbstractFileSystem, url: str, kwargs: dict[str, Any]) -> Optional[dict[str, Any]]:
+    session = await fs.set_session()
+    try:
+        async with session.head(url, **kwargs) as resp:
+            resp.raise_for_status()
+            return dict(resp.headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+    # if HEAD method is not available, try to get a minimal part of the file
+    headers = {**(kwargs.get("headers") or {}), "Range": f"bytes=0-{PROBE_RANGE_END}"}
+    try:
+        async with session.get(url, **{**kwargs, "headers": headers}) as resp:
+            resp.raise_for_status()
+            if resp.status == 206:
+                await resp.content.read(PROBE_RANGE_END + 1)
+                return full_size_headers(dict(resp.headers))
+            return dict(resp.headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+
+async def _http_read_range(fs: AbstractFileSystem, url: str, kwargs: dict[str, Any], size: int) -> bytes:
+    session = await fs.set_session()
+    headers = {**(kwargs.get("headers") or {}), "Range": f"bytes=0-{size - 1}"}
+    async with session.get(url, **{**kwargs, "headers": headers}) as resp:
+        resp.raise_for_status()
+        # servers may ignore range requests, only read the needed bytes
+        return await resp.content.read(size)
+
+
+async def async_fsspec_file_headers(file: OpenFile) -> Optional[dict[str, Any]]:
+    """
+    Coroutine getting HTTP headers from fsspec OpenFile
+
+    Uses a ``HEAD`` request, or if not allowed a ``GET`` request limited to the first byte
+    of the file, through the filesystem client session.
+
+    :param file: fsspec https OpenFile
+    :returns: file headers or ``None``
+    """
+    if "https" not in file.fs.protocol:
+        return None
+    return await run_on_fs_loop(file.fs, _http_headers(file.fs, file.path, dict(getattr(file, "kwargs", {}))))
+
+
+async def async_fsspec_file_extension(file: OpenFile) -> Optional[str]:
+    """
+    Coroutine getting file extension from fsspec OpenFile
+
+    :param file: fsspec https OpenFile
+    :returns: file extension or ``None``
+    """
+    return file_extension_from_headers(file, await async_fsspec_file_headers(file))
+
+
+async def async_read_header(file: OpenFile) -> Optional[bytes]:
+    """Coroutine reading the first bytes of a file, used to identify its format
+
+    Async filesystems (http, s3) are read using their async core, others in the shared
+    I/O scheduler.
+
+    :param file: fsspec OpenFile
+    :returns: first bytes of the file or ``None``
+    """
+    fs = file.fs
+    if not getattr(fs, "async_impl", False):
+        return await run_in_scheduler(read_header, file)
+    try:
+        if "https" in fs.protocol:
+            coro = _http_read_range(fs, file.path, dict(getattr(file, "kwargs", {})), SNIFF_SIZE)
+        else:
+            coro = fs._cat_file(file.path, start=0, end=SNIFF_SIZE)
+        header = await run_on_fs_loop(fs, coro)
+    except Exception as e:
+        logger.debug(f"Could not read {file.path} header: {str(e)}")
+        return None
+    return header if isinstance(header, bytes) else None
+
+
+async def async_sniff_engines(file: OpenFile, header: Optional[bytes] = None) -> list[str]:
+    """Coroutine getting installed ``xarray`` engines matching fsspec OpenFile format
+
+    :param file: fsspec OpenFile
+    :param header: (optional) first bytes of the file, read from the file if not given
+    :returns: engines list, by order of preference
+    """
+    if header is None:
+        header = await async_read_header(file)
+    if sniff_format(file, header) == "zip":
+        # archive members are listed using a blocking filesystem
+        return await run_in_scheduler(sniff_engines, file, header)
+    return sniff_engines(file, header)
+
+
+async def async_guess_engines(file: OpenFile, header: Optional[bytes] = None) -> list[str]:
+    """Coroutine getting installed ``xarray`` engines able to open fsspec OpenFile, identified from its
+    first bytes, or else from its extension, without blocking the event loop
+
+    :param file: fsspec OpenFile
+    :param header: (optional) first bytes of the file, read from the file if not given
+    :returns: engines list, by order of preference, empty if the format could not be identified
+    """
+    if engines := await async_sniff_engines(file, header):
+        return engines
+    return engines_for_extension(await async_fsspec_file_extension(file))
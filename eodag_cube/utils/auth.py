@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Authentication-related utilities"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from eodag.plugins.authentication.base import Authentication
+
+logger = logging.getLogger("eodag-cube.utils.auth")
+
+T = TypeVar("T")
+
+#: Default time to live in seconds of cached authentication objects
+DEFAULT_AUTH_TTL = 300
+#: Cached objects are considered expired this number of seconds before their credentials expiration
+AUTH_EXPIRATION_MARGIN = 60
+
+#: Authentication plugins and credentials attributes storing an expiration datetime
+EXPIRATION_ATTRIBUTES = ["access_token_expiration", "token_expiration", "_expiry_time"]
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, dt.datetime):
+        return None
+    try:
+        return value.timestamp()
+    except (OverflowError, OSError, ValueError):
+        # datetime.min is used by some plugins for "not authenticated yet"
+        return 0.0
+
+
+def get_credentials_expiration(auth_plugin: Authentication) -> Optional[float]:
+    """Get the expiration time of the credentials currently held by an authentication plugin.
+
+    Handles OIDC and token plugins expiration, and temporary (STS) AWS credentials.
+
+    :param auth_plugin: authentication plugin
+    :returns: expiration as a timestamp, or ``None`` if credentials do not expire
+    """
+    candidates = [auth_plugin]
+    if s3_session := getattr(auth_plugin, "s3_session", None):
+        candidates.append(s3_session.get_credentials())
+
+    expirations = [
+        ts
+        for candidate in candidates
+        for attr in EXPIRATION_ATTRIBUTES
+        if (ts := _to_timestamp(getattr(candidate, attr, None))) is not None
+    ]
+    return min(expirations) if expirations else None
+
+
+class AuthCache:
+    """Time-aware cache of authentication objects and derived storage options.
+
+    Entries are stored per authentication plugin instance, which eodag shares among
+    all the products of a provider. An entry expires after ``ttl`` seconds, or earlier
+    if the credentials it was built with expire.
+
+    :param ttl: (optional) entries time to live in seconds, defaults to
+                ``EODAG_CUBE_AUTH_TTL`` environment variable or :data:`DEFAULT_AUTH_TTL`
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl if ttl is not None else float(os.getenv("EODAG_CUBE_AUTH_TTL", DEFAULT_AUTH_TTL))
+        self._entries: weakref.WeakKeyDictionary[Authentication, dict[str, tuple[Any, float]]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._plugin_locks: weakref.WeakKeyDictionary[Authentication, threading.Lock] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expires_at(self, auth_plugin: Authentication) -> float:
+        now = time.time()
+        expires_at = now + self.ttl
+        credentials_expiration = get_credentials_expiration(auth_plugin)
+        # past expirations are set by plugins that do not track credentials lifetime
+        if credentials_expiration is not None and credentials_expiration > now:
+            expires_at = min(expires_at, credentials_expiration - AUTH_EXPIRATION_MARGIN)
+        return expires_at
+
+    def get(self, auth_plugin: Authentication, name: str, factory: Callable[[], T]) -> T:
+        """Get a cached object, building it with ``factory`` if missing or expired
+
+        :param auth_plugin: authentication plugin the object depends on
+        :param name: name of the cached object
+        :param factory: callable building the object
+        :returns: cached or newly built object
+        """
+        with self._lock:
+            entries = self._entries.setdefault(auth_plugin, {})
+            plugin_lock = self._plugin_locks.setdefault(auth_plugin, threading.Lock())
+
+        # concurrent requests for the same plugin wait for a single authentication
+        with plugin_lock:
+            if name in entries:
+                value, expires_at = entries[name]
+                if time.time() < expires_at:
+                    with self._lock:
+                        self.hits += 1
+                    return value
+                logger.debug(f"Cached {name} expired for {auth_plugin.provider}")
+            with self._lock:
+                self.misses += 1
+
+            value = factory()
+            entries[name] = (value, self._expires_at(auth_plugin))
+            return value
+
+    def authenticate(self, auth_plugin: Authentication) -> Any:
+        """Get cached result of ``auth_plugin.authenticate()``
+
+        :param auth_plugin: authentication plugin
+        :returns: authentication object
+        """
+        return self.get(auth_plugin, "auth", auth_plugin.authenticate)
+
+    def invalidate(self, auth_plugin: Optional[Authentication] = None) -> None:
+        """Remove cached entries
+
+        :param auth_plugin: (optional) only remove entries of this plugin
+        """
+        with self._lock:
+            if auth_plugin is None:
+                self._entries.clear()
+            elif auth_plugin in self._entries:
+                self._entries[auth_plugin].clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics
+
+        :returns: number of cached plugins, ttl and hit / miss counters
+        """
+        with self._lock:
+            return {
+                "plugins": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_auth_cache = AuthCache()
+
+
+def get_auth_cache() -> AuthCache:
+    """Get the process-wide :class:`AuthCache`
+
+    :returns: shared authentication cache
+    """
+    return _auth_cache
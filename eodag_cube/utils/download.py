@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Download fallback policy, applied when data cannot be opened remotely"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:
+    from fsspec.core import OpenFile
+
+logger = logging.getLogger("eodag-cube.utils.download")
+
+#: Never download data that cannot be opened remotely
+NEVER = "never"
+#: Always download data that cannot be opened remotely
+ALWAYS = "always"
+
+
+class DownloadFallbackRequest(NamedTuple):
+    """Download fallback about to be run, passed to ``ask`` policies"""
+
+    #: product id
+    product: str
+    #: product provider
+    provider: str
+    #: key of the asset, or ``None`` for the whole product
+    asset_key: Optional[str]
+    #: remote size in bytes, ``None`` if unknown
+    size: Optional[int]
+    #: error that prevented to open the data remotely
+    reason: str
+
+
+#: Download fallback policy: :data:`NEVER`, :data:`ALWAYS`, a maximum size in bytes below which data is
+#: downloaded (data of unknown size is not), or a callable deciding from a :class:`DownloadFallbackRequest`
+DownloadFallback = Union[str, int, Callable[[DownloadFallbackRequest], bool]]
+
+
+class DownloadFallbackEvent(NamedTuple):
+    """Structured event emitted for each download fallback, allowed or not"""
+
+    #: product id
+    product: str
+    #: product provider
+    provider: str
+    #: key of the asset, or ``None`` for the whole product
+    asset_key: Optional[str]
+    #: remote size in bytes, ``None`` if unknown
+    size: Optional[int]
+    #: error that prevented to open the data remotely
+    reason: str
+    #: applied policy: ``never``, ``always``, ``below_size`` or ``ask``
+    policy: str
+    #: whether the download was allowed by the policy
+    allowed: bool
+    #: download duration in seconds, ``None`` if not downloaded
+    duration: Optional[float] = None
+    #: local path of the downloaded data, ``None`` if not downloaded
+    path: Optional[str] = None
+    #: download error, ``None`` if not downloaded or successfully downloaded
+    error: Optional[str] = None
+
+
+def _default_download_fallback() -> DownloadFallback:
+    policy = os.getenv("EODAG_CUBE_DOWNLOAD_FALLBACK", ALWAYS)
+    return int(policy) if policy.isdigit() else policy
+
+
+#: Default download fallback policy, from ``EODAG_CUBE_DOWNLOAD_FALLBACK`` environment variable:
+#: ``never``, ``always`` or a maximum size in bytes
+DEFAULT_DOWNLOAD_FALLBACK: DownloadFallback = _default_download_fallback()
+
+_listeners: list[Callable[[DownloadFallbackEvent], Any]] = []
+
+
+def add_download_fallback_listener(listener: Callable[[DownloadFallbackEvent], Any]) -> None:
+    """Register a callable receiving each :class:`DownloadFallbackEvent`
+
+    Events are also logged by the ``eodag-cube.utils.download`` logger, with the event
+    fields available in the ``download_fallback`` attribute of the log records.
+
+    :param listener: callable receiving the events
+    """
+    _listeners.append(listener)
+
+
+def remove_download_fallback_listener(listener: Callable[[DownloadFallbackEvent], Any]) -> None:
+    """Unregister a callable registered using :func:`add_download_fallback_listener`
+
+    :param listener: registered callable
+    """
+    _listeners.remove(listener)
+
+
+def emit_download_fallback_event(event: DownloadFallbackEvent) -> None:
+    """Log a download fallback event and pass it to the registered listeners
+
+    :param event: download fallback event
+    """
+    target = f"{event.product} {event.asset_key or ''}".strip()
+    if not event.allowed:
+        message = f"Download of {target} refused by {event.policy} download fallback policy"
+    elif event.error is not None:
+        message = f"Download of {target} failed after {event.duration:.1f}s: {event.error}"
+    else:
+        message = f"{target} downloaded in {event.duration:.1f}s as it could not be opened remotely"
+    logger.info(message, extra={"download_fallback": event._asdict()})
+    for listener in _listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            logger.warning(f"Download fallback listener {listener} failed: {e}")
+
+
+def remote_size(file: Optional[OpenFile], asset: Optional[dict[str, Any]] = None) -> Optional[int]:
+    """Get the size of remote data, from its STAC ``file:size`` metadata or its content length
+
+    :param file: (optional) fsspec OpenFile of the data
+    :param asset: (optional) asset or product properties of the data
+    :returns: size in bytes, ``None`` if unknown
+    """
+    if asset and isinstance(size := asset.get("file:size"), int):
+        return size
+    if file is None:
+        return None
+    try:
+        size = file.fs.size(file.path)
+    except Exception as e:
+        logger.debug(f"Could not get {file.path} size: {e}")
+        return None
+    return int(size) if size is not None else None
+
+
+def download_fallback_policy(policy: DownloadFallback, request: DownloadFallbackRequest) -> tuple[str, bool]:
+    """Apply a download fallback policy
+
+    :param policy: download fallback policy
+    :param request: download fallback about to be run
+    :returns: policy name and whether the download is allowed
+    """
+    if callable(policy):
+        return "ask", bool(policy(request))
+    if isinstance(policy, int) and not isinstance(policy, bool):
+        return "below_size", request.size is not None and request.size < policy
+    if policy in (NEVER, ALWAYS):
+        return policy, policy == ALWAYS
+    raise ValueError(
+        f"Invalid download fallback policy {policy!r}, must be {NEVER!r}, {ALWAYS!r}, a size in bytes or a callable"
+    )
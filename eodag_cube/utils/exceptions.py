@@ -22,3 +22,7 @@ from eodag.utils.exceptions import EodagError
 
 class DatasetCreationError(EodagError):
     """An error indicating that :class:`xarray.Dataset` or :class:`eodag_cube.types.XarrayDict` could not be created"""
+
+
+class DatasetNotIntersectingError(DatasetCreationError):
+    """An error indicating that a dataset does not intersect the requested area of interest"""
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""fsspec filesystems related utilities"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Optional
+
+import fsspec
+from fsspec.core import OpenFile
+from fsspec.implementations.zip import ZipFileSystem
+
+if TYPE_CHECKING:
+    from fsspec.spec import AbstractFileSystem
+
+logger = logging.getLogger("eodag-cube.utils.fs")
+
+#: Default maximum number of filesystem instances kept in the pool
+DEFAULT_FS_POOL_SIZE = 32
+
+#: Default maximum number of zip archives whose members index is kept in the pool
+DEFAULT_ZIP_POOL_SIZE = 16
+
+FileSystemKey = tuple[str, Optional[str], str]
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+def storage_options_fingerprint(storage_options: dict[str, Any]) -> str:
+    """Build a hash of storage options, used to identify credentials without storing them
+
+    :param storage_options: fsspec storage options
+    :returns: storage options sha256 hex digest
+    """
+    dumped = json.dumps(storage_options, sort_keys=True, default=_json_default)
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+def get_endpoint(storage_options: dict[str, Any]) -> Optional[str]:
+    """Get custom endpoint url from fsspec storage options
+
+    :param storage_options: fsspec storage options
+    :returns: endpoint url or ``None``
+    """
+    client_kwargs = storage_options.get("client_kwargs") or {}
+    return client_kwargs.get("endpoint_url") or storage_options.get("endpoint_url")
+
+
+class FileSystemPool:
+    """Least recently used pool of fsspec filesystem instances.
+
+    Instances are keyed by protocol, endpoint and credentials fingerprint, so that all
+    the assets of all products sharing the same provider configuration reuse the same
+    client sessions and their warm connections.
+
+    :param maxsize: (optional) maximum number of filesystem instances kept in the pool
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_FS_POOL_SIZE) -> None:
+        self.maxsize = maxsize
+        self._filesystems: OrderedDict[FileSystemKey, AbstractFileSystem] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(protocol: str, storage_options: dict[str, Any]) -> FileSystemKey:
+        """Get pool key for the given protocol and storage options
+
+        :param protocol: fsspec protocol
+        :param storage_options: fsspec storage options
+        :returns: protocol, endpoint and credentials fingerprint tuple
+        """
+        return protocol, get_endpoint(storage_options), storage_options_fingerprint(storage_options)
+
+    def get(self, protocol: str, **storage_options: Any) -> AbstractFileSystem:
+        """Get a filesystem instance from the pool, creating it if needed
+
+        :param protocol: fsspec protocol
+        :param storage_options: fsspec storage options
+        :returns: fsspec filesystem instance
+        """
+        key = self.key(protocol, storage_options)
+        with self._lock:
+            if key in self._filesystems:
+                self.hits += 1
+                self._filesystems.move_to_end(key)
+                return self._filesystems[key]
+            self.misses += 1
+
+        # instances lifecycle is handled by the pool, skip fsspec unbounded instance cache
+        fs = fsspec.filesystem(protocol, skip_instance_cache=True, **storage_options)
+
+        with self._lock:
+            fs = self._filesystems.setdefault(key, fs)
+            self._filesystems.move_to_end(key)
+            while len(self._filesystems) > self.maxsize:
+                evicted_key, _ = self._filesystems.popitem(last=False)
+                logger.debug(f"{evicted_key[0]} filesystem evicted from pool")
+        return fs
+
+    def invalidate(self, protocol: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """Remove filesystem instances from the pool, e.g. after credentials rotation
+
+        :param protocol: (optional) only invalidate instances using this protocol
+        :param endpoint: (optional) only invalidate instances using this endpoint
+        :returns: number of removed instances
+        """
+        with self._lock:
+            keys = [
+                k
+                for k in self._filesystems
+                if (protocol is None or k[0] == protocol) and (endpoint is None or k[1] == endpoint)
+            ]
+            for k in keys:
+                del self._filesystems[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all filesystem instances from the pool and reset counters"""
+        with self._lock:
+            self._filesystems.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._filesystems)
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool statistics
+
+        :returns: pool size, max size and hit / miss counters
+        """
+        with self._lock:
+            return {
+                "size": len(self._filesystems),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_filesystem_pool = FileSystemPool()
+
+
+def get_filesystem_pool() -> FileSystemPool:
+    """Get the process-wide :class:`FileSystemPool`
+
+    :returns: shared filesystem pool
+    """
+    return _filesystem_pool
+
+
+def zip_archive(file: OpenFile) -> Optional[OpenFile]:
+    """Get the archive containing a zip archive member
+
+    :param file: fsspec OpenFile
+    :returns: archive OpenFile, or ``None`` if the file is not a zip archive member
+    """
+    if "zip" not in file.fs.protocol:
+        return None
+    archive = getattr(file.fs, "of", None)
+    return archive if isinstance(archive, OpenFile) else None
+
+
+class ZipArchivePool:
+    """Least recently used pool of zip archives filesystems.
+
+    The central directory of an archive (members offsets, sizes and compression) is read
+    and parsed once when its filesystem is created, then shared by all the members opened
+    from the same archive, e.g. all the assets of a product.
+
+    :param maxsize: (optional) maximum number of archives kept in the pool
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_ZIP_POOL_SIZE) -> None:
+        self.maxsize = maxsize
+        self._archives: OrderedDict[tuple[int, str], ZipFileSystem] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fs: AbstractFileSystem, path: str) -> ZipFileSystem:
+        """Get the filesystem of a zip archive from the pool, reading its central directory if needed
+
+        :param fs: fsspec filesystem of the archive, expected to be pooled
+        :param path: archive path in its filesystem
+        :returns: zip archive filesystem
+        """
+        key = (id(fs), fs._strip_protocol(path))
+        with self._lock:
+            if key in self._archives:
+                self.hits += 1
+                self._archives.move_to_end(key)
+                return self._archives[key]
+            self.misses += 1
+
+        zip_fs = ZipFileSystem(fo=OpenFile(fs, key[1]), skip_instance_cache=True)
+
+        with self._lock:
+            zip_fs = self._archives.setdefault(key, zip_fs)
+            self._archives.move_to_end(key)
+            while len(self._archives) > self.maxsize:
+                (_, evicted_path), _ = self._archives.popitem(last=False)
+                logger.debug(f"{evicted_path} zip archive evicted from pool")
+        return zip_fs
+
+    def clear(self) -> None:
+        """Remove all archives from the pool and reset counters"""
+        with self._lock:
+            self._archives.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._archives)
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool statistics
+
+        :returns: pool size, max size and hit / miss counters
+        """
+        with self._lock:
+            return {
+                "size": len(self._archives),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_zip_archive_pool = ZipArchivePool()
+
+
+def get_zip_archive_pool() -> ZipArchivePool:
+    """Get the process-wide :class:`ZipArchivePool`
+
+    :returns: shared zip archives pool
+    """
+    return _zip_archive_pool
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Manifests of local products scans"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from fsspec.spec import AbstractFileSystem
+
+logger = logging.getLogger("eodag-cube.utils.manifest")
+
+#: Version of the manifests format, manifests of other versions are ignored
+MANIFEST_VERSION = 1
+
+#: Default maximum number of manifests kept in memory
+DEFAULT_MANIFESTS_SIZE = 256
+
+
+class ManifestEntry(NamedTuple):
+    """Data file found when scanning a local product"""
+
+    #: file path in its filesystem
+    path: str
+    #: asset key guessed for the file
+    key: str
+    #: ``xarray`` engine that opened the file, ``None`` if guessed by ``xarray``
+    engine: Optional[str]
+    #: file size in bytes
+    size: Optional[int]
+    #: file modification time
+    mtime: Optional[float]
+
+
+def file_stat(fs: AbstractFileSystem, path: str) -> tuple[Optional[int], Optional[float]]:
+    """Get the size and modification time of a file, used to check if it changed
+
+    :param fs: fsspec filesystem of the file
+    :param path: file path in its filesystem
+    :returns: file size and modification time, ``None`` if unknown
+    """
+    info = fs.info(path)
+    mtime = info.get("mtime")
+    return info.get("size"), float(mtime) if isinstance(mtime, (int, float)) else None
+
+
+class ScanManifests:
+    """Manifests of local products scans, recording the data files found in a product with
+    their asset key and engine.
+
+    Manifests are valid as long as the modification times of the scanned path and of all its
+    directories, and the size and modification time of its data files, are unchanged. Re-opening an
+    unchanged product then only checks its directories and data files, without listing its whole tree
+    nor probing formats.
+
+    The most recent manifests are kept in memory, and can be persisted to JSON files named after
+    the scanned path to be shared between processes. Manifests read from these files are then also
+    kept in memory.
+
+    :param path: (optional) directory where manifests are persisted, defaults to
+                 ``EODAG_CUBE_MANIFEST_DIR`` environment variable. Not persisted if empty.
+    :param maxsize: (optional) maximum number of manifests kept in memory
+    """
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = DEFAULT_MANIFESTS_SIZE) -> None:
+        self.path = path if path is not None else os.getenv("EODAG_CUBE_MANIFEST_DIR")
+        self.maxsize = maxsize
+        self._manifests: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scan_id(local_path: str, basename: Optional[str]) -> str:
+        scan = json.dumps([os.path.abspath(local_path), basename])
+        return hashlib.sha256(scan.encode()).hexdigest()
+
+    def _get(self, scan_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            if scan_id in self._manifests:
+                self._manifests.move_to_end(scan_id)
+                return self._manifests[scan_id]
+        if not self.path:
+            return None
+        try:
+            with open(os.path.join(self.path, f"{scan_id}.json")) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        self._set(scan_id, manifest)
+        return manifest
+
+    def _set(self, scan_id: str, manifest: Optional[dict[str, Any]]) -> None:
+        with self._lock:
+            if manifest is None:
+                self._manifests.pop(scan_id, None)
+                return
+            self._manifests[scan_id] = manifest
+            self._manifests.move_to_end(scan_id)
+            while len(self._manifests) > self.maxsize:
+                self._manifests.popitem(last=False)
+
+    def load(
+        self, fs: AbstractFileSystem, local_path: str, basename: Optional[str] = None
+    ) -> Optional[list[ManifestEntry]]:
+        """Load the manifest of a scan, if still valid
+
+        :param fs: fsspec filesystem of the scanned files
+        :param local_path: scanned local path
+        :param basename: (optional) name of the only scanned files
+        :returns: data files found by the scan, or ``None`` if there is no valid manifest
+        """
+        try:
+            if (manifest := self._get(self._scan_id(local_path, basename))) is None:
+                return None
+            if manifest.get("version") != MANIFEST_VERSION or any(
+                os.stat(path).st_mtime != mtime for path, mtime in manifest["dirs"].items()
+            ):
+                logger.debug(f"Outdated scan manifest for {local_path}")
+                return None
+            entries = [ManifestEntry(*entry) for entry in manifest["files"]]
+            if any(file_stat(fs, entry.path) != (entry.size, entry.mtime) for entry in entries):
+                logger.debug(f"Files of {local_path} changed since its scan manifest was saved")
+                return None
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.debug(f"Could not load scan manifest of {local_path}: {str(e)}")
+            return None
+        logger.debug(f"{local_path} scan manifest loaded")
+        return entries
+
+    def save(self, local_path: str, basename: Optional[str], entries: list[ManifestEntry]) -> None:
+        """Save the manifest of a scan
+
+        :param local_path: scanned local path
+        :param basename: name of the only scanned files, if any
+        :param entries: data files found by the scan
+        """
+        scan_id = self._scan_id(local_path, basename)
+        # files or directories added or removed change the modification time of their parent directory
+        dirs = {local_path}
+        if os.path.isdir(local_path):
+            dirs.update(dir_path for dir_path, _, _ in os.walk(local_path))
+        manifest: dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "path": os.path.abspath(local_path),
+            "dirs": {path: os.stat(path).st_mtime for path in sorted(dirs)},
+            "files": [list(entry) for entry in entries],
+        }
+        self._set(scan_id, manifest)
+        if not self.path:
+            return
+        manifest_path = os.path.join(self.path, f"{scan_id}.json")
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not save scan manifest of {local_path} to {manifest_path}: {str(e)}")
+
+    def invalidate(self, local_path: str, basename: Optional[str] = None) -> None:
+        """Remove the manifest of a scan
+
+        :param local_path: scanned local path
+        :param basename: (optional) name of the only scanned files
+        """
+        scan_id = self._scan_id(local_path, basename)
+        self._set(scan_id, None)
+        if not self.path:
+            return
+        try:
+            os.remove(os.path.join(self.path, f"{scan_id}.json"))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove scan manifest of {local_path}: {str(e)}")
+
+
+_scan_manifests = ScanManifests()
+
+
+def get_scan_manifests() -> ScanManifests:
+    """Get the process-wide :class:`ScanManifests`
+
+    :returns: shared scan manifests
+    """
+    return _scan_manifests
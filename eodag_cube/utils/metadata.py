@@ -60,6 +60,9 @@ def _get_nodata_value(var: DataArray) -> Union[float, str, None]:
     """
     if "nodata" in var.attrs:
         value = var.attrs["nodata"]
+    elif "_FillValue" in var.attrs:
+        # not masked data
+        value = var.attrs["_FillValue"]
     elif "_FillValue" in var.encoding:
         value = var.encoding["_FillValue"]
     elif "missing_value" in var.encoding:
@@ -82,6 +85,21 @@ def _get_nodata_value(var: DataArray) -> Union[float, str, None]:
     return value
 
 
+def _get_scale_offset(var: DataArray) -> dict[str, float]:
+    """
+    Get scale and offset of a variable, from its attributes if not applied, or from its encoding.
+
+    :param var: variable to get scale and offset from
+    :return: dictionary with ``scale`` and ``offset`` if set
+    """
+    scale_offset = {}
+    for key, attr in (("scale", "scale_factor"), ("offset", "add_offset")):
+        value = var.attrs.get(attr, var.encoding.get(attr))
+        if value is not None:
+            scale_offset[key] = float(value)
+    return scale_offset
+
+
 def set_variables(ds: Dataset) -> dict[str, Any]:
     """
     Set variables metadata from a :class:`xarray.Dataset`.
@@ -103,6 +121,7 @@ def set_variables(ds: Dataset) -> dict[str, Any]:
         if desc := var.attrs.get("description"):
             variables[str(var_name)]["description"] = desc
         variables[str(var_name)]["nodata"] = _get_nodata_value(var)
+        variables[str(var_name)].update(_get_scale_offset(var))
 
     for aux_name, desc in auxiliary_geo_vars.items():
         if aux_name in ds:
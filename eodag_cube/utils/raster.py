@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rasterio-related utilities"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+import rasterio
+from rasterio.crs import CRS
+from rasterio.enums import Resampling
+from rasterio.transform import array_bounds, from_origin
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import calculate_default_transform
+
+from eodag_cube.utils.exceptions import DatasetCreationError
+from eodag_cube.utils.fs import zip_archive
+from eodag_cube.utils.scheduler import get_io_scheduler
+
+if TYPE_CHECKING:
+    from fsspec.core import OpenFile
+    from rasterio.transform import Affine
+    from rasterio.windows import Window
+
+logger = logging.getLogger("eodag-cube.utils.raster")
+
+#: GDAL configuration options applied to rasterio environments, unless set in environment variables.
+#: They keep VSI caches efficient between successive opens of data.
+DEFAULT_GDAL_OPTIONS = {
+    "VSI_CACHE": "TRUE",
+}
+
+#: GDAL configuration options applied to rasterio environments of remote data, unless set in environment
+#: variables. They avoid listing remote directories and keep HTTP connections efficient. Not applied to
+#: local data, whose sidecar files (``.ovr``, ``.aux.xml``, ``.msk``, etc.) must be found by GDAL.
+DEFAULT_REMOTE_GDAL_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+}
+
+#: Resampling method used when reading rasters at another resolution than their native one
+DEFAULT_RESAMPLING = Resampling.average
+
+#: Relative tolerance used to match a target resolution with an overview resolution
+RESOLUTION_TOLERANCE = 0.01
+
+Resolution = Union[float, tuple[float, float]]
+
+#: Number of threads used by GDAL to warp rasters, as an integer or ``ALL_CPUS``
+WARP_NUM_THREADS = os.getenv("EODAG_CUBE_WARP_THREADS", "ALL_CPUS")
+
+
+def build_rio_env(env_options: dict[str, Any], remote: bool = False) -> rasterio.Env:
+    """Build a :class:`rasterio.env.Env` using default GDAL options
+
+    :param env_options: rasterio environment options
+    :param remote: (optional) whether the environment is used to read remote data
+    :returns: rasterio environment
+    """
+    default_options = {**DEFAULT_GDAL_OPTIONS, **(DEFAULT_REMOTE_GDAL_OPTIONS if remote else {})}
+    gdal_options = {k: v for k, v in default_options.items() if k not in os.environ}
+    return rasterio.Env(**{**gdal_options, **env_options})
+
+
+def _env_key(env_options: dict[str, Any]) -> Hashable:
+    # sessions are reused objects, compare them by identity
+    return tuple(sorted((k, id(v) if k == "session" else repr(v)) for k, v in env_options.items()))
+
+
+class RioEnvManager:
+    """Thread-safe manager of rasterio environments.
+
+    A rasterio environment is bound to the thread entering it. In the threads of the shared
+    :class:`~eodag_cube.utils.scheduler.IOScheduler`, the environment is kept active after use,
+    so that all the assets successively read by a worker with the same options and credentials
+    share a single environment, GDAL state and connections. It is only replaced when other
+    options or credentials are needed. In other threads, environments are exited after use, and
+    re-entering an equivalent environment nested in an active one is a no-op.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    @contextmanager
+    def env(self, env_options: dict[str, Any], remote: bool = False) -> Iterator[None]:
+        """Context manager entering a rasterio environment, unless an equivalent one is already active
+
+        :param env_options: rasterio environment options
+        :param remote: (optional) whether the environment is used to read remote data
+        """
+        local = self._local
+        key = (remote, _env_key(env_options))
+        active_key = getattr(local, "key", None)
+        depth = getattr(local, "depth", 0)
+        local.depth = depth + 1
+        try:
+            if active_key == key:
+                yield
+            elif depth == 0 and get_io_scheduler().in_worker():
+                # long-lived environment of the worker, replaced as no block uses it
+                self.release()
+                env = build_rio_env(env_options, remote=remote)
+                env.__enter__()
+                local.env, local.key = env, key
+                yield
+            else:
+                with build_rio_env(env_options, remote=remote):
+                    local.key = key
+                    try:
+                        yield
+                    finally:
+                        local.key = active_key
+        finally:
+            local.depth = depth
+
+    def release(self) -> None:
+        """Exit the rasterio environment kept active in the current thread, if any"""
+        if (env := getattr(self._local, "env", None)) is not None:
+            self._local.env = self._local.key = None
+            env.__exit__(None, None, None)
+
+
+_rio_env_manager = RioEnvManager()
+
+
+def get_rio_env_manager() -> RioEnvManager:
+    """Get the process-wide :class:`RioEnvManager`
+
+    :returns: shared rasterio environment manager
+    """
+    return _rio_env_manager
+
+
+def _xy_resolution(resolution: Resolution) -> tuple[float, float]:
+    if isinstance(resolution, (int, float)):
+        return float(resolution), float(resolution)
+    xres, yres = resolution
+    return float(xres), float(yres)
+
+
+def _matches_resolution(res: tuple[float, float], target: tuple[float, float]) -> bool:
+    return all(math.isclose(r, t, rel_tol=RESOLUTION_TOLERANCE) for r, t in zip(res, target))
+
+
+def get_overview_level(src: rasterio.io.DatasetReader, resolution: Resolution, exact: bool = True) -> Optional[int]:
+    """Get the internal overview level of a raster matching a target resolution
+
+    :param src: opened raster
+    :param resolution: target resolution in raster CRS units, as a single value or a ``(xres, yres)`` tuple
+    :param exact: (optional) if ``False``, get the coarsest overview level which is not coarser than
+                  the target resolution when none matches
+    :returns: overview level, ``-1`` for native resolution, or ``None`` if no overview matches
+    """
+    target = _xy_resolution(resolution)
+    if _matches_resolution(src.res, target):
+        return -1
+    left, bottom, right, top = src.bounds
+    closest_level = -1
+    for level, factor in enumerate(src.overviews(1)):
+        overview_res = (
+            (right - left) / math.ceil(src.width / factor),
+            (top - bottom) / math.ceil(src.height / factor),
+        )
+        if _matches_resolution(overview_res, target):
+            return level
+        if all(r < t for r, t in zip(overview_res, target)):
+            closest_level = level
+    return None if exact else closest_level
+
+
+def build_warped_vrt(
+    src: rasterio.io.DatasetReader,
+    resolution: Optional[Resolution] = None,
+    resampling: Resampling = DEFAULT_RESAMPLING,
+    crs: Optional[Any] = None,
+    bounds: Optional[tuple[float, float, float, float]] = None,
+) -> WarpedVRT:
+    """Build a :class:`rasterio.vrt.WarpedVRT` resampling and reprojecting a raster at read time.
+
+    The output grid keeps the raster upper-left corner, so that rasters sharing the same
+    extent (e.g. 10, 20 and 60 m bands of a Sentinel-2 tile) are read onto the same grid.
+    GDAL uses the closest internal overviews and only fetches the source blocks needed for
+    the output extent, so that downsampled or clipped reads transfer and decode only a
+    fraction of the data. Warping uses :data:`WARP_NUM_THREADS` threads.
+
+    :param src: opened raster
+    :param resolution: (optional) target resolution in target CRS units, as a single value or a
+                       ``(xres, yres)`` tuple, defaults to the raster resolution
+    :param resampling: (optional) resampling method
+    :param crs: (optional) target CRS, defaults to the raster CRS
+    :param bounds: (optional) ``(left, bottom, right, top)`` bounds in target CRS the output is limited to,
+                   expanded to whole pixels of the output grid so that clipped reads are not shifted
+    :returns: warped VRT
+    """
+    grid = common_grid([src.profile], resolution, crs, bounds)
+    return WarpedVRT(
+        src,
+        crs=grid.crs,
+        transform=grid.transform,
+        width=grid.width,
+        height=grid.height,
+        resampling=resampling,
+        warp_extras={"NUM_THREADS": WARP_NUM_THREADS},
+    )
+
+
+def _vsi_path(file: OpenFile) -> Optional[str]:
+    # GDAL virtual file system path of local and s3 files
+    if "local" in file.fs.protocol:
+        return file.path
+    if "s3" in file.fs.protocol:
+        return f"/vsis3/{file.path}"
+    return None
+
+
+def rasterio_source(file: OpenFile) -> tuple[str, Optional[Callable[..., Any]]]:
+    """Get the url and opener used to open a fsspec file with rasterio
+
+    :param file: fsspec OpenFile
+    :returns: url and opener, ``None`` if GDAL reads the file by itself
+    """
+    if (archive := zip_archive(file)) is not None and (vsi_path := _vsi_path(archive)) is not None:
+        # zip archives members are read in place by GDAL, that caches archives central directory
+        return f"/vsizip/{vsi_path}/{file.path}", None
+    # prevents to read all file in memory since rasterio 1.4.0
+    # https://github.com/rasterio/rasterio/issues/3232
+    opener = file.fs.open if not any(p in file.fs.protocol for p in ["local", "s3"]) else None
+    # fix messy protocol with zip+s3
+    url = getattr(file, "full_name", file.path).replace("s3://zip+s3://", "zip+s3://")
+    return url, opener
+
+
+class RasterGrid(NamedTuple):
+    """Grid onto which rasters are read"""
+
+    crs: CRS
+    transform: Affine
+    width: int
+    height: int
+
+    @classmethod
+    def from_bounds(cls, crs: Any, bounds: tuple[float, float, float, float], resolution: Resolution) -> RasterGrid:
+        """Build the grid covering the given bounds
+
+        :param crs: grid CRS
+        :param bounds: ``(left, bottom, right, top)`` bounds in grid CRS
+        :param resolution: grid resolution in grid CRS units, as a single value or a ``(xres, yres)`` tuple
+        :returns: grid aligned with the bounds upper-left corner
+        """
+        left, bottom, right, top = bounds
+        xres, yres = _xy_resolution(resolution)
+        return cls(
+            CRS.from_user_input(crs),
+            from_origin(left, top, xres, yres),
+            width=max(1, round((right - left) / xres)),
+            height=max(1, round((top - bottom) / yres)),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Grid ``(height, width)``"""
+        return self.height, self.width
+
+    def xy_coords(self) -> tuple[np.ndarray, np.ndarray]:
+        """Coordinates of the pixel centers
+
+        :returns: x and y coordinates
+        """
+        x = self.transform.c + self.transform.a * (np.arange(self.width) + 0.5)
+        y = self.transform.f + self.transform.e * (np.arange(self.height) + 0.5)
+        return x, y
+
+
+def _snap(value: float, origin: float, res: float, rounding: Callable[[float], int]) -> float:
+    # snap a coordinate to the pixel edges of a grid, tolerating floating point errors
+    pixels = (value - origin) / res
+    if math.isclose(pixels, round(pixels), abs_tol=1e-6):
+        return origin + round(pixels) * res
+    return origin + rounding(pixels) * res
+
+
+def common_grid(
+    profiles: Iterable[dict[str, Any]],
+    resolution: Optional[Resolution] = None,
+    crs: Optional[Any] = None,
+    bounds: Optional[tuple[float, float, float, float]] = None,
+) -> RasterGrid:
+    """Get the grid covering several rasters
+
+    :param profiles: rasters profiles, as given by :attr:`rasterio.io.DatasetReader.profile`
+    :param resolution: (optional) grid resolution in grid CRS units, defaults to the finest raster resolution
+    :param crs: (optional) grid CRS, defaults to the CRS of the first raster
+    :param bounds: (optional) ``(left, bottom, right, top)`` bounds in grid CRS the grid is limited to,
+                   expanded to whole pixels of the grid covering the rasters
+    :returns: grid covering the rasters, aligned with their upper-left corner
+    """
+    profiles = list(profiles)
+    if not profiles:
+        raise DatasetCreationError("No raster to build a grid from")
+    grid_crs = CRS.from_user_input(crs) if crs is not None else profiles[0]["crs"]
+
+    all_bounds = []
+    all_res = []
+    for profile in profiles:
+        transform, width, height = profile["transform"], profile["width"], profile["height"]
+        if profile["crs"] != grid_crs:
+            transform, width, height = calculate_default_transform(
+                profile["crs"], grid_crs, width, height, *array_bounds(height, width, profile["transform"])
+            )
+        all_bounds.append(array_bounds(height, width, transform))
+        all_res.append((transform.a, -transform.e))
+
+    left = min(b[0] for b in all_bounds)
+    bottom = min(b[1] for b in all_bounds)
+    right = max(b[2] for b in all_bounds)
+    top = max(b[3] for b in all_bounds)
+    if resolution is None:
+        resolution = min(r[0] for r in all_res), min(r[1] for r in all_res)
+
+    if bounds is not None:
+        if max(left, bounds[0]) >= min(right, bounds[2]) or max(bottom, bounds[1]) >= min(top, bounds[3]):
+            raise DatasetCreationError(f"Rasters do not intersect {bounds}")
+        # aligned with the pixels of the whole grid, not to shift rasters by a sub-pixel amount
+        xres, yres = _xy_resolution(resolution)
+        left, bottom, right, top = (
+            max(left, _snap(bounds[0], left, xres, math.floor)),
+            max(bottom, _snap(bounds[1], top, -yres, math.ceil)),
+            min(right, _snap(bounds[2], left, xres, math.ceil)),
+            min(top, _snap(bounds[3], top, -yres, math.floor)),
+        )
+
+    return RasterGrid.from_bounds(grid_crs, (left, bottom, right, top), resolution)
+
+
+def read_to_grid(
+    src: rasterio.io.DatasetReader,
+    grid: RasterGrid,
+    out: np.ndarray,
+    indexes: Optional[list[int]] = None,
+    window: Optional[Window] = None,
+    resampling: Resampling = DEFAULT_RESAMPLING,
+    nodata: Optional[float] = None,
+) -> np.ndarray:
+    """Read a raster onto a grid into a preallocated array.
+
+    Reprojection and resampling happen at read time, through a :class:`rasterio.vrt.WarpedVRT`,
+    without intermediate copy. Pixels without data are set to ``nodata``, defaulting to ``NaN``
+    for float arrays, or to the raster nodata value.
+
+    :param src: opened raster
+    :param grid: output grid
+    :param out: output array, of shape ``(len(indexes), height, width)`` of the grid or window
+    :param indexes: (optional) 1-based indexes of the bands to read, defaults to all bands
+    :param window: (optional) window of the grid to read
+    :param resampling: (optional) resampling method
+    :param nodata: (optional) value of the pixels without data
+    :returns: the output array
+    """
+    if nodata is None:
+        nodata = np.nan if np.issubdtype(out.dtype, np.floating) else (src.nodata or 0)
+    with WarpedVRT(
+        src,
+        crs=grid.crs,
+        transform=grid.transform,
+        width=grid.width,
+        height=grid.height,
+        resampling=resampling,
+        nodata=nodata,
+        dtype=out.dtype.name,
+    ) as vrt:
+        return vrt.read(indexes or list(range(1, src.count + 1)), window=window, out=out)
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026, CS GROUP - France, http://www.c-s.fr
+#
+# This file is part of EODAG project
+#     https://www.github.com/CS-SI/EODAG
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""I/O scheduling utilities shared by all products and assets"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar, cast
+from urllib.parse import urlparse
+
+logger = logging.getLogger("eodag-cube.utils.scheduler")
+
+T = TypeVar("T")
+
+# future, callable, host, args and kwargs of a task waiting for a host slot
+_PendingTask = tuple[Future[Any], Callable[..., Any], Optional[str], Any, Any]
+
+#: Default maximum number of I/O workers, same as :class:`concurrent.futures.ThreadPoolExecutor` default
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+#: Default maximum number of simultaneous I/O operations on a single host
+DEFAULT_MAX_WORKERS_PER_HOST = 8
+
+
+def get_host(url: Optional[str]) -> Optional[str]:
+    """Get the host (or bucket) part of an url, used to apply per-host limits
+
+    >>> get_host("https://foo.bar/baz.tif")
+    'foo.bar'
+    >>> get_host("/local/path.tif") is None
+    True
+
+    :param url: url to parse
+    :returns: url host or ``None`` for local paths
+    """
+    if not url:
+        return None
+    return urlparse(url).netloc or None
+
+
+class _WaitingFuture(Future[T]):
+    """Future of a task queued from a scheduler thread, run by the thread waiting for its result
+    if no worker started it yet"""
+
+    _run_waiting: Callable[[], None]
+
+    def result(self, timeout: Optional[float] = None) -> T:
+        """Run the task if needed, and return its result"""
+        self._run_waiting()
+        return super().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        """Run the task if needed, and return its exception"""
+        self._run_waiting()
+        return super().exception(timeout)
+
+
+class IOScheduler:
+    """Bounded thread pool executor used for all data I/O, with per-host limits.
+
+    Tasks on a host whose slots are all held wait in a per-host queue, and are only handed
+    to a worker thread once a slot is released, so that they never tie up workers needed by
+    tasks on other hosts.
+
+    Tasks submitted from a thread of the scheduler are run inline, so that nested
+    fan-outs (product, then assets) cannot exhaust the pool and deadlock. Host slots are
+    reentrant: nested tasks on a host whose slot is already held by their thread do not
+    acquire another one.
+
+    :param max_workers: (optional) maximum number of worker threads, defaults to
+                        ``EODAG_CUBE_MAX_WORKERS`` environment variable or
+                        :data:`DEFAULT_MAX_WORKERS`
+    :param max_workers_per_host: (optional) maximum number of simultaneous tasks on a
+                                 single host, defaults to ``EODAG_CUBE_MAX_WORKERS_PER_HOST``
+                                 environment variable or :data:`DEFAULT_MAX_WORKERS_PER_HOST`
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_workers_per_host: Optional[int] = None) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._pending: dict[str, deque[_PendingTask]] = {}
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._running_per_host: Counter[str] = Counter()
+        self.max_workers = DEFAULT_MAX_WORKERS
+        self.max_workers_per_host = DEFAULT_MAX_WORKERS_PER_HOST
+        self.configure(max_workers, max_workers_per_host)
+
+    def configure(self, max_workers: Optional[int] = None, max_workers_per_host: Optional[int] = None) -> None:
+        """Update scheduler limits. Running tasks are not interrupted.
+
+        :param max_workers: (optional) maximum number of worker threads
+        :param max_workers_per_host: (optional) maximum number of simultaneous tasks on a single host
+        """
+        max_workers = max_workers or int(os.getenv("EODAG_CUBE_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        max_workers_per_host = max_workers_per_host or int(
+            os.getenv("EODAG_CUBE_MAX_WORKERS_PER_HOST", DEFAULT_MAX_WORKERS_PER_HOST)
+        )
+        if max_workers < 1 or max_workers_per_host < 1:
+            raise ValueError("IOScheduler limits must be greater than 0")
+
+        with self._lock:
+            if max_workers != self.max_workers and self._executor is not None:
+                # a new executor will be lazily created with the new size
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if max_workers_per_host != self.max_workers_per_host:
+                self._host_semaphores.clear()
+            self.max_workers = max_workers
+            self.max_workers_per_host = max_workers_per_host
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="eodag-cube-io",
+                    initializer=self._init_worker,
+                )
+            return self._executor
+
+    def _init_worker(self) -> None:
+        self._local.is_worker = True
+
+    def in_worker(self) -> bool:
+        """Whether current thread is one of the scheduler workers"""
+        return getattr(self._local, "is_worker", False)
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        # must be called with self._lock held
+        return self._host_semaphores.setdefault(host, threading.BoundedSemaphore(self.max_workers_per_host))
+
+    @contextmanager
+    def _holding(self, host: Optional[str]) -> Iterator[None]:
+        """Mark the slot of the given host as held by current thread"""
+        held: Counter[str] = self._local.__dict__.setdefault("held_hosts", Counter())
+        if host is not None:
+            held[host] += 1
+        try:
+            yield
+        finally:
+            if host is not None:
+                held[host] -= 1
+
+    @contextmanager
+    def host_slot(self, host: Optional[str]) -> Iterator[None]:
+        """Context manager holding one of the available slots of the given host
+
+        :param host: host name, no limit is applied if ``None``
+        """
+        held: Counter[str] = self._local.__dict__.setdefault("held_hosts", Counter())
+        if host is None or held[host]:
+            # no limit, or slot already held by an outer task of this thread
+            yield
+            return
+        with self._lock:
+            semaphore = self._host_semaphore(host)
+        semaphore.acquire()
+        try:
+            with self._holding(host):
+                yield
+        finally:
+            self._release_host_slot(host, semaphore)
+
+    def _release_host_slot(self, host: str, semaphore: threading.BoundedSemaphore) -> None:
+        """Release a slot of the given host, handing it over to its next pending task if any"""
+        with self._lock:
+            pending = self._pending.get(host)
+            task = None
+            while pending and task is None:
+                task = pending.popleft()
+                if task[0].running() or task[0].done():
+                    # cancelled, or started by the thread waiting for it
+                    if task[0].cancelled():
+                        self._queued -= 1
+                    task = None
+            if pending is not None and not pending:
+                del self._pending[host]
+            if task is None:
+                semaphore.release()
+                return
+        self._dispatch(task, semaphore)
+
+    def _dispatch(self, task: _PendingTask, semaphore: Optional[threading.BoundedSemaphore]) -> None:
+        """Submit a task to the executor, its host slot being already acquired"""
+        future, fn, host, args, kwargs = task
+        try:
+            self._get_executor().submit(self._run_queued, future, fn, host, semaphore, args, kwargs)
+        except BaseException as e:
+            if host is not None and semaphore is not None:
+                self._release_host_slot(host, semaphore)
+            if self._start(future):
+                future.set_exception(e)
+
+    def _start(self, future: Future[Any]) -> bool:
+        """Mark a queued task as running, unless it was cancelled or already started by a worker
+        or by the thread waiting for it
+
+        :param future: future of the task
+        :returns: whether the task must be run
+        """
+        with self._lock:
+            try:
+                running = future.set_running_or_notify_cancel()
+            except RuntimeError:
+                # already started, the counters being updated by the thread that started it
+                return False
+            self._queued -= 1
+            return running
+
+    def _run(self, fn: Callable[..., T], host: Optional[str], args: Any, kwargs: Any) -> T:
+        with self._lock:
+            self._running += 1
+            if host is not None:
+                self._running_per_host[host] += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                if host is not None:
+                    self._running_per_host[host] -= 1
+                    if self._running_per_host[host] <= 0:
+                        del self._running_per_host[host]
+
+    def _run_queued(
+        self,
+        future: Future[T],
+        fn: Callable[..., T],
+        host: Optional[str],
+        semaphore: Optional[threading.BoundedSemaphore],
+        args: Any,
+        kwargs: Any,
+    ) -> None:
+        result: Optional[T] = None
+        error: Optional[BaseException] = None
+        running = self._start(future)
+        try:
+            if running:
+                with self._holding(host):
+                    result = self._run(fn, host, args, kwargs)
+        except BaseException as e:
+            error = e
+        finally:
+            # the slot is released before the result is set, to be available to the task waiting for it
+            if host is not None and semaphore is not None:
+                self._release_host_slot(host, semaphore)
+        if not running:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(cast(T, result))
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, host: Optional[str] = None, **kwargs: Any) -> Future[T]:
+        """Schedule ``fn(*args, **kwargs)`` for execution
+
+        Tasks on a host whose slots are all held wait in a per-host queue, without using a worker
+        thread, until one of these slots is released.
+
+        :param fn: callable to execute
+        :param args: positional arguments passed to ``fn``
+        :param host: (optional) host targeted by ``fn``, used to apply per-host limits
+        :param kwargs: keyword arguments passed to ``fn``
+        :returns: a future representing the execution of ``fn``
+        """
+        with self._lock:
+            self._submitted += 1
+
+        future: Future[T] = Future()
+        if self.in_worker():
+            # nested submission: run inline to prevent pool exhaustion
+            self._run_inline(future, fn, host, args, kwargs)
+            return future
+        self._enqueue(future, fn, host, args, kwargs)
+        return future
+
+    def submit_all(self, calls: Iterable[Callable[[], T]], host: Optional[str] = None) -> list[Future[T]]:
+        """Schedule several callables for concurrent execution, e.g. a fan-out over files
+
+        Unlike :meth:`submit`, callables submitted from a thread of the scheduler are not run inline
+        but also handed to the pool. Calling :meth:`~concurrent.futures.Future.result` on one of the
+        returned futures runs it in the calling thread if no worker started it yet, so that a nested
+        fan-out runs concurrently on idle workers without being able to deadlock the pool.
+
+        :param calls: callables without arguments to execute
+        :param host: (optional) host targeted by the callables, used to apply per-host limits
+        :returns: futures representing the execution of the callables, to be waited for using
+                  :meth:`~concurrent.futures.Future.result`
+        """
+        if not self.in_worker():
+            return [self.submit(call, host=host) for call in calls]
+
+        futures: list[Future[T]] = []
+        for call in calls:
+            with self._lock:
+                self._submitted += 1
+            future: _WaitingFuture[T] = _WaitingFuture()
+            future._run_waiting = functools.partial(self._run_waiting, future, call, host)
+            self._enqueue(future, call, host, (), {})
+            futures.append(future)
+        return futures
+
+    def _run_inline(self, future: Future[T], fn: Callable[..., T], host: Optional[str], args: Any, kwargs: Any) -> None:
+        try:
+            with self.host_slot(host):
+                result = self._run(fn, host, args, kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def _run_waiting(self, future: Future[T], fn: Callable[..., T], host: Optional[str]) -> None:
+        """Run a queued task in the thread waiting for it, if no worker started it yet"""
+        if self._start(future):
+            self._run_inline(future, fn, host, (), {})
+
+    def _enqueue(self, future: Future[T], fn: Callable[..., T], host: Optional[str], args: Any, kwargs: Any) -> None:
+        """Hand a task to the executor, or queue it until a slot of its host is released"""
+        task: _PendingTask = (future, fn, host, args, kwargs)
+        semaphore = None
+        with self._lock:
+            self._queued += 1
+            if host is not None:
+                semaphore = self._host_semaphore(host)
+                if host in self._pending or not semaphore.acquire(blocking=False):
+                    # all host slots are held, the task will be dispatched when one is released
+                    self._pending.setdefault(host, deque()).append(task)
+                    return
+        self._dispatch(task, semaphore)
+
+    def stats(self) -> dict[str, Any]:
+        """Get scheduler statistics
+
+        :returns: limits, queue depth (including tasks waiting for a host slot), running tasks (total
+                  and per host), utilisation ratio and submitted / completed tasks counters
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_workers_per_host": self.max_workers_per_host,
+                "queued": self._queued,
+                "running": self._running,
+                "utilisation": min(self._running, self.max_workers) / self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "running_per_host": dict(self._running_per_host),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shutdown scheduler workers. A new pool is created on next submission.
+
+        :param wait: (optional) wait for running tasks completion
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_io_scheduler: Optional[IOScheduler] = None
+_io_scheduler_lock = threading.Lock()
+
+
+def get_io_scheduler() -> IOScheduler:
+    """Get the process-wide :class:`IOScheduler`
+
+    :returns: shared I/O scheduler
+    """
+    global _io_scheduler
+    with _io_scheduler_lock:
+        if _io_scheduler is None:
+            _io_scheduler = IOScheduler()
+        return _io_scheduler
@@ -19,20 +19,325 @@
 
 from __future__ import annotations
 
+import importlib.util
+import json
 import logging
-from typing import TYPE_CHECKING, Any
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
 
+import fsspec
+import numpy as np
+import rasterio
 import rioxarray
 import xarray as xr
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import transform_bounds
+from rasterio.windows import Window
+from xarray.backends import BackendArray
+from xarray.core import indexing
 
 from eodag_cube.utils import fsspec_file_extension
-from eodag_cube.utils.exceptions import DatasetCreationError
+from eodag_cube.utils.exceptions import DatasetCreationError, DatasetNotIntersectingError
+from eodag_cube.utils.raster import RasterGrid, Resolution, build_warped_vrt, get_overview_level, rasterio_source
 
 if TYPE_CHECKING:
+    from types import ModuleType
+
     from fsspec.core import OpenFile
+    from numpy.typing import DTypeLike
+    from shapely.geometry.base import BaseGeometry
 
 logger = logging.getLogger("eodag-cube.utils.xarray")
 
+EngineCacheKey = tuple[Optional[str], ...]
+
+#: Number of bytes read at the beginning of a file to identify its format
+SNIFF_SIZE = 512
+
+#: File signatures found at the beginning of files, and the format they identify
+MAGIC_BYTES: list[tuple[bytes, str]] = [
+    (b"\x89HDF\r\n\x1a\n", "hdf5"),
+    (b"CDF\x01", "netcdf3"),
+    (b"CDF\x02", "netcdf3"),
+    (b"CDF\x05", "netcdf3"),
+    (b"GRIB", "grib"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"II+\x00", "tiff"),
+    (b"MM\x00+", "tiff"),
+    (b"\x00\x00\x00\x0cjP  \r\n\x87\n", "jp2"),
+    (b"\xffO\xffQ", "jp2"),
+    (b"PK\x03\x04", "zip"),
+]
+
+#: Files identifying a zarr store directory or zip archive
+ZARR_METADATA_FILES = [".zgroup", ".zarray", ".zmetadata", "zarr.json"]
+
+#: ``xarray`` engines able to open each format, by order of preference
+FORMAT_ENGINES: dict[str, list[str]] = {
+    "hdf5": ["h5netcdf", "netcdf4"],
+    "netcdf3": ["netcdf4", "scipy"],
+    "grib": ["cfgrib"],
+    "tiff": ["rasterio"],
+    "jp2": ["rasterio"],
+    "zarr": ["zarr"],
+}
+
+#: ``chunks`` value reading data by dask chunks aligned with its internal layout
+NATIVE_CHUNKS = "native"
+
+#: ``dtype`` value keeping data in its stored dtype, nodata, scale and offset being kept as attributes
+NATIVE_DTYPE = "native"
+
+#: Attributes of variables that must be masked or scaled, following CF conventions
+CF_MASK_AND_SCALE_ATTRS = ["_FillValue", "missing_value", "scale_factor", "add_offset"]
+
+#: Dimensions of the fields stored in a single GRIB message
+GRIB_FIELD_DIMS = ["latitude", "longitude", "y", "x", "values"]
+
+#: ``xarray`` engines that can only open local files
+LOCALFILE_ONLY_ENGINES = ["netcdf4", "cfgrib"]
+
+
+def read_header(file: OpenFile) -> Optional[bytes]:
+    """Read the first bytes of a file, using a single small request for remote files
+
+    :param file: fsspec OpenFile
+    :returns: first bytes of the file or ``None``
+    """
+    try:
+        if "https" in file.fs.protocol:
+            # stream the beginning of the file, servers may ignore range requests
+            with file.fs.open(file.path, "rb", block_size=0) as f:
+                header = f.read(SNIFF_SIZE)
+        else:
+            header = file.fs.cat_file(file.path, start=0, end=SNIFF_SIZE)
+    except Exception as e:
+        logger.debug(f"Could not read {file.path} header: {str(e)}")
+        return None
+    return header if isinstance(header, bytes) else None
+
+
+def sniff_format(file: OpenFile, header: Optional[bytes] = None) -> Optional[str]:
+    """Identify file format from its first bytes (magic numbers)
+
+    :param file: fsspec OpenFile
+    :param header: (optional) first bytes of the file, read from the file if not given
+    :returns: format name (one of :data:`FORMAT_ENGINES` keys) or ``None``
+    """
+    if "file" in file.fs.protocol and os.path.isdir(file.path):
+        if any(os.path.isfile(os.path.join(file.path, f)) for f in ZARR_METADATA_FILES):
+            return "zarr"
+        return None
+
+    if header is None:
+        header = read_header(file)
+    if not header:
+        return None
+    for signature, file_format in MAGIC_BYTES:
+        if header.startswith(signature):
+            return file_format
+    # GRIB messages may be preceded by a bulletin header
+    if b"GRIB" in header:
+        return "grib"
+    return None
+
+
+def _is_zarr_zip(file: OpenFile) -> bool:
+    try:
+        members = fsspec.filesystem("zip", fo=file, skip_instance_cache=True).ls("", detail=False)
+    except Exception as e:
+        logger.debug(f"Could not list {file.path} archive members: {str(e)}")
+        return False
+    return any(os.path.basename(member) in ZARR_METADATA_FILES for member in members)
+
+
+#: File extensions for which engines are resolved when building the lookup table
+KNOWN_EXTENSIONS = [
+    ".nc",
+    ".nc4",
+    ".cdf",
+    ".h5",
+    ".hdf5",
+    ".he5",
+    ".grib",
+    ".grb",
+    ".grib2",
+    ".grb2",
+    ".tif",
+    ".tiff",
+    ".jp2",
+    ".vrt",
+    ".zarr",
+    ".zip",
+    ".xml",
+    ".json",
+]
+
+_engines_lock = threading.Lock()
+_installed_engines: Optional[dict[str, Any]] = None
+_extension_engines: dict[str, list[str]] = {}
+
+
+def _engines_for_extension(ext: str, installed_engines: dict[str, Any]) -> list[str]:
+    # xarray backends check path file extension
+    return [engine for engine, backend in installed_engines.items() if backend.guess_can_open(f"foo{ext}")]
+
+
+def list_engines() -> dict[str, Any]:
+    """Get installed ``xarray`` engines, discovered once per process
+
+    :returns: backend entrypoints by engine name
+    """
+    global _installed_engines
+    if _installed_engines is None:
+        refresh_engines()
+    return cast(dict[str, Any], _installed_engines)
+
+
+def refresh_engines() -> None:
+    """Discover installed ``xarray`` engines and rebuild the extension to engines lookup table"""
+    global _installed_engines
+    with _engines_lock:
+        installed_engines = xr.backends.list_engines()
+        _extension_engines.clear()
+        for ext in KNOWN_EXTENSIONS:
+            _extension_engines[ext] = _engines_for_extension(ext, installed_engines)
+        _installed_engines = installed_engines
+
+
+def engines_for_extension(ext: Optional[str]) -> list[str]:
+    """Get ``xarray`` engines able to open files having the given extension
+
+    :param ext: file extension, including the leading dot
+    :returns: engines list
+    """
+    ext = ext or ""
+    # discover engines first, then check and read the table under the lock as it may be rebuilt
+    # by refresh_engines, using the engines it was built with
+    list_engines()
+    with _engines_lock:
+        if ext not in _extension_engines:
+            _extension_engines[ext] = _engines_for_extension(ext, cast(dict[str, Any], _installed_engines))
+        return list(_extension_engines[ext])
+
+
+def sniff_engines(file: OpenFile, header: Optional[bytes] = None) -> list[str]:
+    """Get installed ``xarray`` engines matching fsspec :class:`fsspec.core.OpenFile` format
+
+    :param file: fsspec OpenFile
+    :param header: (optional) first bytes of the file, read from the file if not given
+    :returns: engines list, by order of preference
+    """
+    if (file_format := sniff_format(file, header)) == "zip":
+        # only zipped zarr stores are opened as a whole, other archives need engines probing
+        file_format = "zarr" if _is_zarr_zip(file) else None
+    if not file_format:
+        return []
+    installed_engines = list_engines()
+    engines = [eng for eng in FORMAT_ENGINES[file_format] if eng in installed_engines]
+    logger.debug(f"{file.path} identified as {file_format}, matching engines: {engines}")
+    return engines
+
+
+class EngineCache:
+    """Cache of the ``xarray`` engines that succeeded in opening data.
+
+    Entries are keyed by tuples such as ``(provider, collection, asset_key)``, as all the
+    assets sharing these properties are opened the same way. The cache can be persisted
+    to a JSON file and pre-seeded, so that steady-state opens skip format probing.
+
+    :param path: (optional) path of the JSON file where the cache is persisted, defaults
+                 to ``EODAG_CUBE_ENGINE_CACHE`` environment variable. Not persisted if empty.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path if path is not None else os.getenv("EODAG_CUBE_ENGINE_CACHE")
+        self._engines: dict[EngineCacheKey, str] = {}
+        self._lock = threading.Lock()
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path) as f:
+                    self._engines = {tuple(key): engine for key, engine in json.load(f)}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Could not load engine cache from {self.path}: {str(e)}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump([[list(key), engine] for key, engine in self._engines.items()], f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save engine cache to {self.path}: {str(e)}")
+
+    def get(self, key: EngineCacheKey) -> Optional[str]:
+        """Get cached engine
+
+        :param key: cache key
+        :returns: engine name or ``None``
+        """
+        return self._engines.get(key)
+
+    def set(self, key: EngineCacheKey, engine: str) -> None:
+        """Cache engine that succeeded in opening data
+
+        :param key: cache key
+        :param engine: engine name
+        """
+        with self._lock:
+            if self._engines.get(key) != engine:
+                self._engines[key] = engine
+                self._save()
+
+    def seed(self, engines: dict[EngineCacheKey, str]) -> None:
+        """Pre-seed the cache
+
+        :param engines: engine names by cache key
+        """
+        with self._lock:
+            self._engines.update(engines)
+            self._save()
+
+    def invalidate(self, key: Optional[EngineCacheKey] = None) -> None:
+        """Remove cached engines
+
+        :param key: (optional) only remove this entry
+        """
+        with self._lock:
+            if key is None:
+                self._engines.clear()
+            else:
+                self._engines.pop(key, None)
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+
+_engine_cache = EngineCache()
+
+
+def get_engine_cache() -> EngineCache:
+    """Get the process-wide :class:`EngineCache`
+
+    :returns: shared engine cache
+    """
+    return _engine_cache
+
+
+def has_engines(file: OpenFile) -> bool:
+    """Check if installed ``xarray`` engines may open a local file, from its extension or else its first bytes
+
+    :param file: fsspec OpenFile
+    :returns: ``True`` if the file format is known by installed engines
+    """
+    ext = os.path.splitext(file.path)[1].lower()
+    return bool(engines_for_extension(ext) or sniff_engines(file))
+
 
 def guess_engines(file: OpenFile) -> list[str]:
     """Guess matching ``xarray`` engines for fsspec :class:`fsspec.core.OpenFile`
@@ -41,44 +346,300 @@ def guess_engines(file: OpenFile) -> list[str]:
     :returns: engines list
     """
     ext = fsspec_file_extension(file)
+    return engines_for_extension(ext)
+
+
+class _WarpedVRTArray(BackendArray):
+    """Lazily indexed array reading a warped VRT, whose source dataset is kept open"""
+
+    def __init__(self, vrt: WarpedVRT) -> None:
+        self.vrt = vrt
+        self.shape = (vrt.count, vrt.height, vrt.width)
+        self.dtype = np.dtype(vrt.dtypes[0])
+        # rasterio datasets are not thread-safe
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> _WarpedVRTArray:
+        # opened datasets cannot be copied, and are only read
+        return self
+
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> np.ndarray:
+        return indexing.explicit_indexing_adapter(key, self.shape, indexing.IndexingSupport.BASIC, self._getitem)
+
+    def _getitem(self, key: tuple[Union[int, slice], ...]) -> np.ndarray:
+        bands, rows, cols = (np.atleast_1d(np.arange(size)[k]) for k, size in zip(key, self.shape))
+        squeezed_axes = tuple(axis for axis, k in enumerate(key) if not isinstance(k, slice))
+        if not (bands.size and rows.size and cols.size):
+            return np.empty((bands.size, rows.size, cols.size), dtype=self.dtype).squeeze(axis=squeezed_axes)
+        # read the window containing the selection
+        row_start, col_start = int(rows.min()), int(cols.min())
+        window = Window(col_start, row_start, int(cols.max()) - col_start + 1, int(rows.max()) - row_start + 1)
+        with self.lock:
+            data = self.vrt.read((bands + 1).tolist(), window=window)
+        return data[:, rows - row_start][:, :, cols - col_start].squeeze(axis=squeezed_axes)
+
+
+def _open_warped_vrt(
+    src: rasterio.io.DatasetReader,
+    vrt: WarpedVRT,
+    mask_and_scale: bool = True,
+    chunks: Optional[Any] = None,
+    **xarray_kwargs: Any,
+) -> xr.DataArray:
+    """Lazily open a warped VRT as :class:`xarray.DataArray`, keeping its source open until the data array
+    is closed. Unlike :func:`rioxarray.open_rasterio`, the source is not re-opened from its name, which is
+    not possible for rasters opened using an opener."""
+    if xarray_kwargs:
+        logger.debug(f"{list(xarray_kwargs)} ignored when reading {src.name} through a warped VRT")
+    attrs: dict[str, Any] = {}
+    if vrt.nodata is not None:
+        attrs["_FillValue"] = vrt.nodata
+    if src.scales[0] != 1:
+        attrs["scale_factor"] = src.scales[0]
+    if src.offsets[0] != 0:
+        attrs["add_offset"] = src.offsets[0]
+    var = xr.Variable(("band", "y", "x"), indexing.LazilyIndexedArray(_WarpedVRTArray(vrt)), attrs)
+    if mask_and_scale:
+        var = xr.conventions.decode_cf_variable(
+            "band_data", var, concat_characters=False, decode_times=False, stack_char_dim=False
+        )
+    x, y = RasterGrid(vrt.crs, vrt.transform, vrt.width, vrt.height).xy_coords()
+    da = xr.DataArray(var, coords={"band": np.arange(1, vrt.count + 1), "y": y, "x": x})
+    da.rio.write_crs(vrt.crs, inplace=True).rio.write_transform(vrt.transform, inplace=True)
+    if chunks is not None:
+        da = da.chunk("auto" if chunks is True else chunks)
+
+    def close() -> None:
+        vrt.close()
+        src.close()
+
+    da.set_close(close)
+    return da
+
+
+def _open_rasterio(
+    url: str,
+    opener: Optional[Callable[..., Any]] = None,
+    resolution: Optional[Resolution] = None,
+    overview_level: Optional[int] = None,
+    crs: Optional[Any] = None,
+    geometry: Optional[BaseGeometry] = None,
+    **xarray_kwargs: Any,
+) -> Union[xr.Dataset, xr.DataArray, list[xr.Dataset]]:
+    if resolution is None and crs is None:
+        if overview_level is not None:
+            xarray_kwargs["overview_level"] = overview_level
+        return rioxarray.open_rasterio(url, opener=opener, **xarray_kwargs)
+
+    src = rasterio.open(url, opener=opener)
+    try:
+        if crs is None and resolution is not None and (level := get_overview_level(src, resolution)) is not None:
+            src.close()
+            logger.debug(f"{url} read from overview level {level} at {resolution} resolution")
+            return rioxarray.open_rasterio(
+                url, opener=opener, overview_level=level if level >= 0 else None, **xarray_kwargs
+            )
+
+        bounds = None
+        if crs is not None and geometry is not None:
+            bounds = transform_bounds("EPSG:4326", crs, *geometry.bounds)
+        vrt = build_warped_vrt(src, resolution, crs=crs, bounds=bounds)
+        logger.debug(f"{url} warped to {vrt.crs} at {vrt.res} resolution")
+        if opener is not None:
+            # the raster cannot be re-opened from its name, keep it open
+            return _open_warped_vrt(src, vrt, **xarray_kwargs)
+        with vrt:
+            da = rioxarray.open_rasterio(vrt, **xarray_kwargs)
+        src.close()
+        return da
+    except Exception:
+        src.close()
+        raise
+
+
+def import_dask_array() -> ModuleType:
+    """Import :mod:`dask.array`, needed to build lazy datacubes
+
+    :returns: :mod:`dask.array` module
+    :raises: :class:`ImportError` if dask is not installed
+    """
+    if importlib.util.find_spec("dask") is None:
+        raise ImportError(
+            'dask is required to build lazy datacubes, install it with: python -m pip install "eodag-cube[dask]"'
+        )
+    import dask.array
+
+    return dask.array
+
+
+def _pop_native_chunks(xarray_kwargs: dict[str, Any]) -> bool:
+    """Remove ``chunks="native"`` from keyword arguments, and check if data can be read by native chunks"""
+    if xarray_kwargs.get("chunks") != NATIVE_CHUNKS:
+        return False
+    del xarray_kwargs["chunks"]
+    if importlib.util.find_spec("dask") is None:
+        logger.warning(
+            "dask is required to read data by native chunks, data will not be chunked. Install it with: "
+            'python -m pip install "eodag-cube[dask]"'
+        )
+        return False
+    return True
+
 
-    guessed_engines = []
-    for engine, backend in xr.backends.list_engines().items():
-        # xarray backends check path file extension
-        if backend.guess_can_open(f"foo{ext}"):
-            guessed_engines.append(engine)
+def _native_chunks_kwargs(engine: Optional[str], xarray_kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Keyword arguments reading data by dask chunks aligned with its internal layout"""
+    if engine == "rasterio":
+        # automatic chunks are multiples of the internal tiles or strips, and without lock
+        # each thread reads its chunks using its own rasterio dataset
+        return {"chunks": True, "lock": False, **xarray_kwargs}
+    # empty dict uses on-disk chunks of netCDF / HDF5 / zarr variables. Default locks are kept
+    # as HDF5 library is not thread-safe
+    return {"chunks": {}, **xarray_kwargs}
 
-    return guessed_engines
 
+def _chunk_grib_messages(ds: xr.Dataset) -> xr.Dataset:
+    """Rechunk a GRIB dataset to one dask chunk per message, each message storing a single field"""
+    return ds.chunk({dim: 1 for dim in ds.dims if dim not in GRIB_FIELD_DIMS})
 
-def try_open_dataset(file: OpenFile, **xarray_kwargs: Any) -> xr.Dataset:
+
+def _mask_and_scale_as(ds: xr.Dataset, dtype: Optional[DTypeLike]) -> xr.Dataset:
+    """Lazily mask and scale the variables of a dataset opened without ``mask_and_scale``, as the given
+    float dtype. Nodata, scale and offset are moved to variables encoding, as :func:`xarray.open_dataset` does.
+    """
+    if dtype is None or dtype == NATIVE_DTYPE:
+        return ds
+    dtype = np.dtype(dtype)
+    decoded = {}
+    for name, da in ds.data_vars.items():
+        if not any(attr in da.attrs for attr in CF_MASK_AND_SCALE_ATTRS):
+            continue
+        var = da.variable.copy(deep=False)
+        # scale and offset dtype drive the decoded dtype
+        for attr in ("scale_factor", "add_offset"):
+            if attr in var.attrs:
+                var.attrs[attr] = dtype.type(var.attrs[attr])
+        var = xr.conventions.decode_cf_variable(
+            str(name), var, concat_characters=False, decode_times=False, stack_char_dim=False
+        )
+        if var.dtype != dtype:
+            if var.chunks is None:
+                # casting would load the data
+                logger.debug(f"{name} decoded as {var.dtype} instead of {dtype}")
+            else:
+                var = var.astype(dtype)
+        decoded[name] = var
+    if not decoded:
+        return ds
+    decoded_ds = ds.assign(decoded)
+    decoded_ds.set_close(ds._close)
+    return decoded_ds
+
+
+def _rasterio_to_dataset(da: Union[xr.Dataset, xr.DataArray, list[xr.Dataset]], path: str) -> xr.Dataset:
+    """Get dataset from :func:`rioxarray.open_rasterio` result"""
+    if isinstance(da, xr.DataArray):
+        ds = da.to_dataset(name="band_data")
+        # closing the dataset must release the underlying rasterio dataset
+        ds.set_close(da.close)
+        return ds
+    if isinstance(da, list):
+        logger.warning(f"Only 1/{len(da)} datasets list was kept for {path}")
+        return da[0]
+    return da
+
+
+def _reopen_file(file: OpenFile) -> Any:
+    # re-open file to prevent I/O operation on closed file
+    # (and `closed` attr does not seem up-to-date)
+    try:
+        return file.fs.open(path=file.path)
+    except Exception as e:
+        logger.debug(f"Could not re-open file: {str(e)}")
+        return file
+
+
+def try_open_dataset(
+    file: OpenFile,
+    engine_cache_key: Optional[EngineCacheKey] = None,
+    resolution: Optional[Resolution] = None,
+    overview_level: Optional[int] = None,
+    crs: Optional[Any] = None,
+    geometry: Optional[BaseGeometry] = None,
+    header: Optional[bytes] = None,
+    engines: Optional[list[str]] = None,
+    dtype: Optional[DTypeLike] = None,
+    **xarray_kwargs: Any,
+) -> xr.Dataset:
     """Try opening xarray dataset from fsspec OpenFile
 
     :param file: fsspec https OpenFile
-    :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`
+    :param engine_cache_key: (optional) key used to get and store the working engine in
+                             :class:`EngineCache`, e.g. ``(provider, collection, asset_key)``
+    :param resolution: (optional) resolution in raster CRS units at which rasters are read, as a
+                       single value or a ``(xres, yres)`` tuple. Matching internal overviews are used
+                       if available, otherwise rasters are resampled on a grid aligned with their
+                       upper-left corner
+    :param overview_level: (optional) internal overview level at which rasters are read
+    :param crs: (optional) CRS to which rasters are reprojected at read time, through a warped VRT
+    :param geometry: (optional) area of interest limiting the extent of reprojected rasters
+    :param header: (optional) first bytes of the file used to identify its format, read from the
+                   file if not given
+    :param engines: (optional) engines able to open the file by order of preference, already identified
+                    by the caller (e.g. using :func:`~eodag_cube.utils.aio.async_guess_engines`), skipping
+                    format probing. All installed engines are tried if empty
+    :param dtype: (optional) ``"native"`` to keep data in its stored dtype, nodata, scale and offset
+                  being kept in variables attributes, or float dtype (e.g. ``"float32"``) of the masked
+                  and scaled data. By default, data is masked and scaled as decided by ``xarray``
+    :param xarray_kwargs: (optional) keyword arguments passed to :func:`xarray.open_dataset`.
+                          Use ``chunks="native"`` to read data by dask chunks aligned with its
+                          internal tiles, on-disk chunks or GRIB messages
     :returns: opened xarray dataset
     """
-    LOCALFILE_ONLY_ENGINES = ["netcdf4", "cfgrib"]
+    native_chunks = _pop_native_chunks(xarray_kwargs)
+    if dtype is not None:
+        # masked and scaled after opening if needed
+        xarray_kwargs["mask_and_scale"] = False
 
+    engine_cache = get_engine_cache()
+    sniffed_engines = []
+    cached_engine = None
     if engine := xarray_kwargs.pop("engine", None):
         all_engines = [
             engine,
         ]
+    elif engine_cache_key is not None and (cached_engine := engine_cache.get(engine_cache_key)):
+        all_engines = [
+            cached_engine,
+        ]
+    elif engines is not None:
+        all_engines = engines or [*list_engines()]
+    elif sniffed_engines := sniff_engines(file, header):
+        # format identified from file content, no need for trial and error
+        all_engines = sniffed_engines
     else:
-        all_engines = guess_engines(file) or [*xr.backends.list_engines()]
+        all_engines = guess_engines(file) or [*list_engines()]
 
     if "file" in file.fs.protocol:
-        engines = all_engines
+        tried_engines = all_engines
 
         # use path str as cfgrib does not support fsspec OpenFile as input
         file_or_path = file.path
 
-        # if no engine was passed, let xarray guess it for local data
-        if len(engines) > 1:
+        # if no engine was passed nor identified, let xarray guess it for local data
+        if (
+            len(tried_engines) > 1
+            and not sniffed_engines
+            and resolution is None
+            and overview_level is None
+            and crs is None
+        ):
             try:
-                ds = xr.open_dataset(file_or_path, **xarray_kwargs)
+                ds = xr.open_dataset(
+                    file_or_path,
+                    **(_native_chunks_kwargs(None, xarray_kwargs) if native_chunks else xarray_kwargs),
+                )
                 logger.debug(f"{file.path} opened using {file.fs.protocol} + guessed engine")
-                return ds
+                return _mask_and_scale_as(ds, dtype)
 
             except Exception as e:
                 raise DatasetCreationError(f"Cannot open local dataset {file.path}: {str(e)}") from e
@@ -86,46 +647,142 @@ def try_open_dataset(file: OpenFile, **xarray_kwargs: Any) -> xr.Dataset:
     else:
         # remove engines that do not support remote access
         # https://tutorial.xarray.dev/intermediate/remote_data/remote-data.html#supported-format-read-from-buffers-remote-access
-        engines = [eng for eng in all_engines if eng not in LOCALFILE_ONLY_ENGINES]
+        tried_engines = [eng for eng in all_engines if eng not in LOCALFILE_ONLY_ENGINES]
 
         file_or_path = file
 
     # loop for engines on remote data, as xarray does not always guess it right
-    for engine in engines:
-        # re-open file to prevent I/O operation on closed file
-        # (and `closed` attr does not seem up-to-date)
-        try:
-            file = file.fs.open(path=file.path)
-        except Exception as e:
-            logger.debug(f"Could not re-open file: {str(e)}")
+    for engine in tried_engines:
+        reopened = _reopen_file(file)
+        if hasattr(reopened, "path"):
+            file = reopened
+        else:
+            # zip archive members are opened as plain file objects, keep their OpenFile
+            file_or_path = reopened
 
+        engine_kwargs = _native_chunks_kwargs(engine, xarray_kwargs) if native_chunks else xarray_kwargs
         try:
             if engine == "rasterio":
-                # prevents to read all file in memory since rasterio 1.4.0
-                # https://github.com/rasterio/rasterio/issues/3232
-                opener = file.fs.open if not any(p in file.fs.protocol for p in ["local", "s3"]) else None
-                # fix messy protocol with zip+s3
-                clean_url = getattr(file, "full_name", file.path).replace("s3://zip+s3://", "zip+s3://")
-                da = rioxarray.open_rasterio(
+                clean_url, opener = rasterio_source(file)
+                da = _open_rasterio(
                     clean_url,
                     opener=opener,
+                    resolution=resolution,
+                    overview_level=overview_level,
+                    crs=crs,
+                    geometry=geometry,
                     # default value from RasterioBackend
-                    mask_and_scale=True,
-                    **xarray_kwargs,
+                    **{"mask_and_scale": True, **engine_kwargs},
                 )
-                ds_or_list = da.to_dataset(name="band_data") if isinstance(da, xr.DataArray) else da
-                if isinstance(ds_or_list, list):
-                    logger.warning(f"Only 1/{len(ds_or_list)} datasets list was kept for {file.path}")
-                    ds = ds_or_list[0]
-                else:
-                    ds = ds_or_list
+                ds = _rasterio_to_dataset(da, file.path)
             else:
-                ds = xr.open_dataset(file_or_path, engine=engine, **xarray_kwargs)
+                if resolution is not None or overview_level is not None or crs is not None:
+                    logger.debug(f"Resolution, overview level and CRS are ignored by {engine} engine")
+                ds = xr.open_dataset(file_or_path, engine=engine, **engine_kwargs)
+                if native_chunks and engine == "cfgrib":
+                    ds = _chunk_grib_messages(ds)
 
         except Exception as e:
             logger.debug(f"Cannot open {file.path} with {file.fs.protocol} + {engine}: {str(e)}")
         else:
             logger.debug(f"{file.path} opened using {file.fs.protocol} + {engine}")
-            return ds
+            if engine_cache_key is not None:
+                engine_cache.set(engine_cache_key, engine)
+            return _mask_and_scale_as(ds, dtype)
+
+    if cached_engine:
+        # cached engine is outdated, probe again
+        logger.debug(f"Cached engine {cached_engine} failed for {engine_cache_key}, invalidating it")
+        engine_cache.invalidate(engine_cache_key)
+        return try_open_dataset(
+            file,
+            engine_cache_key=engine_cache_key,
+            resolution=resolution,
+            overview_level=overview_level,
+            crs=crs,
+            geometry=geometry,
+            header=header,
+            engines=engines,
+            dtype=dtype,
+            **({"chunks": NATIVE_CHUNKS} if native_chunks else {}),
+            **xarray_kwargs,
+        )
+
+    raise DatasetCreationError(f"None of the engines {tried_engines} could open the dataset at {file.path}.")
+
+
+#: Names of 1D coordinates holding longitudes and latitudes, by priority order
+LON_LAT_COORDS = [("longitude", "latitude"), ("lon", "lat")]
+
+
+def _slice_coord(coord: xr.DataArray, start: float, stop: float) -> slice:
+    # coordinates may be sorted in descending order, e.g. latitudes in GRIB files
+    if coord.size > 1 and coord[0] > coord[-1]:
+        return slice(stop, start)
+    return slice(start, stop)
+
+
+def _clip_lon_lat(ds: xr.Dataset, lon: str, lat: str, bounds: tuple[float, float, float, float]) -> xr.Dataset:
+    minx, miny, maxx, maxy = bounds
+    lon_values = np.asarray(ds[lon].values)
+    if float(lon_values.max()) > 180 and minx < 0 <= maxx:
+        # longitudes in [0, 360] range and bbox crossing 0°: select both sides of the grid,
+        # indexed in [-180, 180] range so that the selection is kept lazy and ordered
+        adjusted = np.where(lon_values > 180, lon_values - 360, lon_values)
+        indexes = np.nonzero((adjusted >= minx) & (adjusted <= maxx))[0]
+        indexes = indexes[np.argsort(adjusted[indexes], kind="stable")]
+        if lon_values.size > 1 and lon_values[0] > lon_values[-1]:
+            indexes = indexes[::-1]
+        ds = ds.isel({lon: indexes}).assign_coords({lon: (ds[lon].dims, adjusted[indexes], ds[lon].attrs)})
+        return ds.sel({lat: _slice_coord(ds[lat], miny, maxy)})
+    if float(lon_values.max()) > 180 and maxx < 0:
+        # longitudes in [0, 360] range
+        minx, maxx = minx % 360, maxx % 360
+    return ds.sel(
+        {
+            lon: _slice_coord(ds[lon], minx, maxx),
+            lat: _slice_coord(ds[lat], miny, maxy),
+        }
+    )
+
+
+def clip_dataset(ds: xr.Dataset, geometry: BaseGeometry) -> xr.Dataset:
+    """Lazily clip a dataset to the bounding box of a geometry.
+
+    Georeferenced rasters are indexed using the pixel window intersecting the geometry,
+    and other datasets are sliced on their longitude / latitude coordinates. As long as
+    the dataset is not loaded, only the intersecting data will then be read.
+
+    :param ds: dataset to clip
+    :param geometry: clip geometry, in ``EPSG:4326``
+    :returns: clipped dataset
+    :raises: :class:`~eodag_cube.utils.exceptions.DatasetNotIntersectingError`, the dataset being
+             closed, if it does not intersect the geometry
+    :raises: :class:`~eodag_cube.utils.exceptions.DatasetCreationError`, the dataset being
+             closed, if it cannot be clipped
+    """
+    minx, miny, maxx, maxy = geometry.bounds
+
+    if ds.rio.crs is not None:
+        try:
+            return ds.rio.clip_box(minx, miny, maxx, maxy, crs="EPSG:4326", auto_expand=True)
+        except rioxarray.exceptions.NoDataInBounds as e:
+            ds.close()
+            raise DatasetNotIntersectingError(f"Dataset does not intersect {geometry}: {e}") from e
+        except (
+            rioxarray.exceptions.MissingSpatialDimensionError,
+            rioxarray.exceptions.OneDimensionalRaster,
+        ) as e:
+            ds.close()
+            raise DatasetCreationError(f"Dataset cannot be clipped to {geometry}: {e}") from e
+
+    for lon, lat in LON_LAT_COORDS:
+        if lon in ds.coords and lat in ds.coords and ds[lon].ndim == 1 and ds[lat].ndim == 1:
+            clipped = _clip_lon_lat(ds, lon, lat, (minx, miny, maxx, maxy))
+            if clipped[lon].size == 0 or clipped[lat].size == 0:
+                ds.close()
+                raise DatasetNotIntersectingError(f"Dataset does not intersect {geometry}")
+            return clipped
 
-    raise DatasetCreationError(f"None of the engines {engines} could open the dataset at {file.path}.")
+    logger.debug("Dataset has no CRS nor 1D longitude / latitude coordinates, it will not be clipped")
+    return ds
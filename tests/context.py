@@ -39,5 +39,5 @@ from eodag.utils.exceptions import UnsupportedDatasetAddressScheme
 from eodag_cube.api.product import EOProduct
 from eodag_cube.utils import fsspec_file_extension, fsspec_file_headers
 from eodag_cube.utils.exceptions import DatasetCreationError
-from eodag_cube.utils.xarray import guess_engines, try_open_dataset
+from eodag_cube.utils.xarray import guess_engines, sniff_engines, sniff_format, try_open_dataset
 from tests import TEST_RESOURCES_PATH
@@ -30,6 +30,7 @@ from tests.context import (
     PluginConfig,
     path_to_uri,
 )
+from tests.utils import mock
 
 
 class TestEOProductXarray(EODagTestCase):
@@ -73,3 +74,16 @@ class TestEOProductXarray(EODagTestCase):
         self.assertIsInstance(xd_repr_html, str)
         self.assertTrue(xd_repr_html.startswith("<table"))
         self.assertTrue(xd_repr_html.endswith("</tbody></table>"))
+
+    def test_to_xarray_local_archive(self):
+        """to_xarray must read downloaded zip archives in place, without extracting them"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.register_downloader(AwsDownload("foo", PluginConfig()), None)
+
+        with mock.patch.object(product, "download", return_value=self.local_product_as_archive_path) as mock_download:
+            with product._build_downloaded_xarray_dict(None, 0, 0, None) as xarray_dict:
+                self.assertIn("B01", xarray_dict)
+                self.assertEqual(xarray_dict["B01"]["band_data"].shape, (1, 1830, 1830))
+                self.assertGreater(float(xarray_dict["B01"]["band_data"][0, :10, :10].mean()), 0)
+        mock_download.assert_called_once_with(asset=None, wait=0, timeout=0, extract=False)
+        self.assertFalse(os.path.exists(os.path.splitext(self.local_product_as_archive_path)[0]))
@@ -16,11 +16,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import copy
+import functools
 import os
+import pickle
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
 
+import fsspec
+import numpy as np
+import rasterio
+import shapely
 import xarray as xr
+from fsspec.caching import BytesCache
+from fsspec.core import OpenFile
 from rasterio.session import AWSSession
+from rasterio.warp import transform_bounds
 
+from eodag_cube import open_many, to_timeseries_cube
+from eodag_cube.types import XarrayDict, open_files_stats
+from eodag_cube.utils.download import add_download_fallback_listener, remove_download_fallback_listener
+from eodag_cube.utils.exceptions import DatasetNotIntersectingError
+from eodag_cube.utils.fs import get_filesystem_pool, get_zip_archive_pool
+from eodag_cube.utils.manifest import ScanManifests
+from eodag_cube.utils.scheduler import IOScheduler
+from eodag_cube.utils.xarray import try_open_dataset
 from tests import EODagTestCase
 from tests.context import (
     DEFAULT_DOWNLOAD_TIMEOUT,
@@ -73,6 +98,25 @@ class TestEOProduct(EODagTestCase):
         self.assertEqual(rio_env["AWS_S3_ENDPOINT"], "some.where")
         self.assertEqual(rio_env["AWS_VIRTUAL_HOSTING"], "FALSE")
 
+    def test_get_rio_env_reused(self):
+        """RIO env AWS session should be shared by products using the same auth plugin"""
+        auth_plugin = AwsAuth(
+            "foo",
+            PluginConfig.from_mapping(
+                {
+                    "type": "Authentication",
+                    "credentials": {"aws_access_key_id": "foo", "aws_secret_access_key": "bar"},
+                }
+            ),
+        )
+        sessions = []
+        for _ in range(2):
+            product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+            product.register_downloader(AwsDownload("foo", PluginConfig()), auth_plugin)
+            sessions.append(product._get_rio_env("s3://path/to/asset")["session"])
+        self.assertIsInstance(sessions[0], AWSSession)
+        self.assertIs(sessions[0], sessions[1])
+
     def test_get_storage_options_http_headers(self):
         """_get_storage_options should be adapted to the provider config"""
         product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
@@ -218,6 +262,27 @@ class TestEOProduct(EODagTestCase):
             },
         )
 
+    def test_get_storage_options_cached_auth(self):
+        """_get_storage_options should authenticate once for all products sharing an auth plugin"""
+        auth_plugin = AwsAuth(
+            "foo",
+            PluginConfig.from_mapping(
+                {
+                    "type": "Authentication",
+                    "credentials": {"aws_access_key_id": "foo", "aws_secret_access_key": "bar"},
+                }
+            ),
+        )
+        products = [EOProduct(self.provider, self.eoproduct_props, collection=self.collection) for _ in range(3)]
+        with mock.patch.object(auth_plugin, "authenticate", wraps=auth_plugin.authenticate) as mock_authenticate:
+            for product in products:
+                product.register_downloader(Download("foo", PluginConfig()), auth_plugin)
+                self.assertDictEqual(
+                    product._get_storage_options(),
+                    {"path": self.download_url, "key": "foo", "secret": "bar"},
+                )
+            mock_authenticate.assert_called_once()
+
     def test_get_storage_options_error(self):
         """_get_storage_options should be adapted to the provider config"""
         product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
@@ -225,22 +290,23 @@ class TestEOProduct(EODagTestCase):
         with self.assertRaises(DatasetCreationError, msg=f"foo not found in {product} assets"):
             product._get_storage_options(asset_key="foo")
 
-    @mock.patch("eodag_cube.api.product._product.fsspec.filesystem")
+    @mock.patch("eodag_cube.utils.fs.fsspec.filesystem")
     @mock.patch("eodag_cube.api.product._product.EOProduct._get_storage_options", autospec=True)
     def test_get_file_obj(self, mock_storage_options, mock_fs):
         """get_file_obj should call fsspec open with appropriate args"""
+        get_filesystem_pool().clear()
         product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
         # https
         mock_storage_options.return_value = {"path": "https://foo.bar", "baz": "qux"}
         file = product.get_file_obj()
-        mock_fs.assert_called_once_with("https", baz="qux")
+        mock_fs.assert_called_once_with("https", skip_instance_cache=True, baz="qux")
         mock_fs.return_value.open.assert_called_once_with(path="https://foo.bar")
         self.assertEqual(file, mock_fs.return_value.open.return_value)
         mock_fs.reset_mock()
         # s3
         mock_storage_options.return_value = {"path": "s3://foo.bar", "baz": "qux"}
         file = product.get_file_obj()
-        mock_fs.assert_called_once_with("s3", baz="qux")
+        mock_fs.assert_called_once_with("s3", skip_instance_cache=True, baz="qux")
         mock_fs.return_value.open.assert_called_once_with(path="s3://foo.bar")
         self.assertEqual(file, mock_fs.return_value.open.return_value)
         mock_fs.reset_mock()
@@ -250,15 +316,62 @@ class TestEOProduct(EODagTestCase):
             "baz": "qux",
         }
         file = product.get_file_obj()
-        mock_fs.assert_called_once_with("file", baz="qux")
+        mock_fs.assert_called_once_with("file", skip_instance_cache=True, baz="qux")
         mock_fs.return_value.open.assert_called_once_with(path=os.path.join("foo", "bar"))
         self.assertEqual(file, mock_fs.return_value.open.return_value)
         mock_fs.reset_mock()
+        # pooled filesystem is reused
+        mock_storage_options.return_value = {
+            "path": os.path.join("foo", "bar"),
+            "baz": "qux",
+        }
+        file = product.get_file_obj()
+        mock_fs.assert_not_called()
+        mock_fs.return_value.open.assert_called_with(path=os.path.join("foo", "bar"))
         # not found
         mock_storage_options.return_value = {"baz": "qux"}
         with self.assertRaises(UnsupportedDatasetAddressScheme, msg=f"Could not get {product} path"):
             product.get_file_obj()
 
+    @mock.patch("eodag_cube.api.product._product.EOProduct._get_storage_options", autospec=True)
+    def test_get_file_obj_zip(self, mock_storage_options):
+        """get_file_obj should share the central directory of a zip archive between its members"""
+        get_zip_archive_pool().clear()
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for band in ("B01", "B02"):
+                with rasterio.open(
+                    os.path.join(tmp_dir, f"{band}.tif"),
+                    "w",
+                    driver="GTiff",
+                    width=10,
+                    height=10,
+                    count=1,
+                    dtype="uint8",
+                ) as dst:
+                    dst.write(np.ones((1, 10, 10), dtype="uint8"))
+            with fs.open("/bucket/archive.zip", "wb") as f, zipfile.ZipFile(f, "w") as zf:
+                for band in ("B01", "B02"):
+                    zf.write(os.path.join(tmp_dir, f"{band}.tif"), f"data/{band}.tif")
+
+        # memory filesystem used in place of s3 one
+        with mock.patch.object(get_filesystem_pool(), "get", return_value=fs):
+            files = []
+            for band in ("B01", "B02"):
+                mock_storage_options.return_value = {"path": f"zip+s3://bucket/archive.zip!data/{band}.tif"}
+                files.append(product.get_file_obj(band))
+
+        self.assertIs(files[0].fs, files[1].fs)
+        self.assertEqual(get_zip_archive_pool().stats()["misses"], 1)
+        self.assertEqual(get_zip_archive_pool().stats()["hits"], 1)
+        for file in files:
+            ds = product._open_file_dataset(file, None)
+            self.assertEqual(float(ds["band_data"].mean()), 1)
+            ds.close()
+        get_zip_archive_pool().clear()
+        fs.rm("/bucket", recursive=True)
+
     @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
     @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
     def test_to_xarray(self, mock_get_file, mock_open_ds):
@@ -268,11 +381,303 @@ class TestEOProduct(EODagTestCase):
         mock_get_file.return_value.path = "http://foo.bar"
         xd = product.to_xarray(foo="bar")
         mock_get_file.assert_called_once_with(product, None, DEFAULT_DOWNLOAD_WAIT, DEFAULT_DOWNLOAD_TIMEOUT)
-        mock_open_ds.assert_called_once_with(mock_get_file.return_value, foo="bar")
+        mock_open_ds.assert_called_once_with(
+            mock_get_file.return_value,
+            engine_cache_key=(self.provider, self.collection, None),
+            resolution=None,
+            overview_level=None,
+            crs=None,
+            foo="bar",
+        )
         self.assertEqual(len(xd), 1)
         self.assertTrue(xd["data"].equals(mock_open_ds.return_value))
         self.assertDictEqual(product.properties, xd["data"].attrs)
 
+    @mock.patch("eodag_cube.api.product._product.clip_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_xarray_geom(self, mock_get_file, mock_open_ds, mock_clip):
+        """to_xarrray should clip datasets to the given geometry"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        mock_open_ds.return_value = xr.Dataset()
+        mock_clip.return_value = xr.Dataset({"foo": ("x", [1])})
+        mock_get_file.return_value.path = "http://foo.bar"
+
+        # no geometry
+        product.to_xarray()
+        mock_clip.assert_not_called()
+
+        # search intersection
+        xd = product.to_xarray(geom="search_intersection")
+        mock_clip.assert_called_once_with(mock_open_ds.return_value, product.search_intersection)
+        self.assertTrue(xd["data"].equals(mock_clip.return_value))
+
+        # bbox
+        mock_clip.reset_mock()
+        product.to_xarray(geom=[1, 43, 2, 44])
+        self.assertEqual(mock_clip.call_args[0][1].bounds, (1, 43, 2, 44))
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct.download", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.clip_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_xarray_geom_not_intersecting(self, mock_get_file, mock_open_ds, mock_clip, mock_download):
+        """to_xarrray should not download the product if its data does not intersect the given geometry"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update({k: {"href": f"http://{k}.bar"} for k in ("foo", "bar")})
+        mock_open_ds.side_effect = lambda *args, **kwargs: xr.Dataset()
+        mock_clip.side_effect = DatasetNotIntersectingError("does not intersect")
+
+        # product footprint
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy), self.assertRaisesRegex(DatasetNotIntersectingError, "does not intersect"):
+                product.to_xarray(geom=[10, 10, 11, 11], lazy=lazy)
+        mock_get_file.assert_not_called()
+
+        # assets data
+        with self.assertRaisesRegex(DatasetNotIntersectingError, "does not intersect"):
+            product.to_xarray(geom=[1, 43, 2, 44])
+        self.assertEqual(mock_clip.call_count, 2)
+        mock_download.assert_not_called()
+        # files of the datasets that cannot be clipped are closed
+        self.assertEqual(mock_get_file.return_value.close.call_count, 2)
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct._build_local_xarray_dict", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.download", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_xarray_download_fallback(self, mock_get_file, mock_open_ds, mock_download, mock_local_xd):
+        """to_xarray should download data that cannot be opened remotely following the download fallback policy"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update({"foo": {"href": "http://foo.bar", "file:size": 100}})
+        mock_get_file.return_value.path = "http://foo.bar"
+        mock_get_file.return_value.fs.size.side_effect = FileNotFoundError("no size")
+        mock_open_ds.side_effect = DatasetCreationError("cannot open foo")
+        mock_download.return_value = "/tmp/foo"
+        mock_local_xd.side_effect = lambda *args, **kwargs: XarrayDict({"foo": xr.Dataset()})
+
+        events = []
+        add_download_fallback_listener(events.append)
+        self.addCleanup(remove_download_fallback_listener, events.append)
+
+        for policy, expected_policy, allowed in [
+            ("always", "always", True),
+            ("never", "never", False),
+            (1000, "below_size", True),
+            (50, "below_size", False),
+            (lambda request: request.size == 100 and request.asset_key == "foo", "ask", True),
+        ]:
+            with self.subTest(policy=policy):
+                mock_download.reset_mock()
+                events.clear()
+                if allowed:
+                    xd = product.to_xarray("foo", download_fallback=policy)
+                    self.assertListEqual(list(xd.keys()), ["foo"])
+                    mock_download.assert_called_once_with(
+                        product,
+                        asset="foo",
+                        wait=DEFAULT_DOWNLOAD_WAIT,
+                        timeout=DEFAULT_DOWNLOAD_TIMEOUT,
+                        extract=False,
+                    )
+                else:
+                    with self.assertRaisesRegex(DatasetCreationError, "refused"):
+                        product.to_xarray("foo", download_fallback=policy)
+                    mock_download.assert_not_called()
+                self.assertEqual(len(events), 1)
+                self.assertEqual(events[0].policy, expected_policy)
+                self.assertEqual(events[0].allowed, allowed)
+                self.assertEqual(events[0].asset_key, "foo")
+                self.assertEqual(events[0].size, 100)
+                self.assertEqual(events[0].reason, "cannot open foo")
+                self.assertEqual(events[0].path, "/tmp/foo" if allowed else None)
+                self.assertEqual(events[0].duration is not None, allowed)
+
+        # unknown size is not below any size
+        del product.assets["foo"]["file:size"]
+        events.clear()
+        with self.assertRaisesRegex(DatasetCreationError, "refused"):
+            product.to_xarray("foo", download_fallback=1000)
+        self.assertIsNone(events[0].size)
+
+        # download errors are reported
+        mock_download.side_effect = OSError("disk full")
+        events.clear()
+        with self.assertRaisesRegex(OSError, "disk full"):
+            product.to_xarray("foo", download_fallback="always")
+        self.assertEqual(events[0].error, "disk full")
+
+        with self.assertRaisesRegex(ValueError, "Invalid download fallback policy"):
+            product.to_xarray("foo", download_fallback="sometimes")
+
+    @mock.patch("eodag_cube.api.product._product.clip_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct._build_local_xarray_dict", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.download", autospec=True)
+    def test_build_downloaded_xarray_dict_clip(self, mock_download, mock_local_xd, mock_clip):
+        """Downloaded datasets that cannot be clipped should be dropped with their file"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        mock_download.return_value = "/nonexistent/foo"
+        xd = XarrayDict({"foo": xr.Dataset(), "bar": xr.Dataset()})
+        files = {k: mock.MagicMock() for k in xd}
+        xd._files.update(files)
+        mock_local_xd.return_value = xd
+        bar_ds = xd["bar"]
+
+        def clip(ds, geometry):
+            if ds is bar_ds:
+                raise DatasetNotIntersectingError("bar does not intersect")
+            return ds
+
+        mock_clip.side_effect = clip
+
+        xd = product._build_downloaded_xarray_dict(
+            None, 0, 0, shapely.geometry.box(1, 43, 2, 44), download_fallback="always"
+        )
+        self.assertListEqual(list(xd.keys()), ["foo"])
+        self.assertListEqual(list(xd._files), ["foo"])
+        files["bar"].close.assert_called_once()
+        files["foo"].close.assert_not_called()
+
+    def test_extract_archive(self):
+        """_extract_archive should extract tar archives next to them, without their whole archive suffix"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            member_path = os.path.join(tmp_dir, "foo.txt")
+            Path(member_path).write_text("foo")
+            for name, mode in [("a.tar", "w"), ("b.tar.gz", "w:gz"), ("c.TGZ", "w:gz"), ("d.tar.bz2", "w:bz2")]:
+                with self.subTest(name=name):
+                    archive_path = os.path.join(tmp_dir, name)
+                    with tarfile.open(archive_path, mode) as tar:
+                        tar.add(member_path, arcname="foo.txt")
+                    product_path = EOProduct._extract_archive(archive_path)
+                    self.assertEqual(product_path, os.path.join(tmp_dir, name[0]))
+                    self.assertEqual(Path(product_path, "foo.txt").read_text(), "foo")
+
+    def test_build_local_xarray_dict_zip(self):
+        """_build_local_xarray_dict should read zip archive members in place"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tif_path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(
+                tif_path, "w", driver="GTiff", width=10, height=10, count=1, dtype="uint8", crs="EPSG:4326"
+            ) as dst:
+                dst.write(np.ones((1, 10, 10), dtype="uint8"))
+            nc_path = os.path.join(tmp_dir, "bar.nc")
+            xr.Dataset({"baz": ("x", [1, 2, 3])}).to_netcdf(nc_path, engine="netcdf4")
+            archive_path = os.path.join(tmp_dir, "archive.zip")
+            fs = fsspec.filesystem("zip", fo=archive_path, mode="w")
+            fs.put(tif_path, "data/foo.tif")
+            fs.put(nc_path, "data/bar.nc")
+            fs.close()
+            os.remove(tif_path)
+            os.remove(nc_path)
+
+            with product._build_local_xarray_dict(archive_path) as xd:
+                self.assertListEqual(sorted(xd.keys()), ["bar.nc", "foo"])
+                # raster read in place by GDAL
+                self.assertEqual(xd["foo"]["band_data"].encoding["source"], f"/vsizip/{archive_path}/data/foo.tif")
+                self.assertEqual(float(xd["foo"]["band_data"].mean()), 1)
+                # member only readable from a local file is extracted alone, out of the archive directory
+                self.assertListEqual(xd["bar.nc"]["baz"].values.tolist(), [1, 2, 3])
+                self.assertListEqual(os.listdir(tmp_dir), ["archive.zip"])
+
+            # files matching the given basename only
+            with product._build_local_xarray_dict(archive_path, basename="foo.tif") as xd:
+                self.assertListEqual(list(xd.keys()), ["foo"])
+
+    def test_build_local_xarray_dict_skipped_files(self):
+        """_build_local_xarray_dict should only open files having an asset key and a known format"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ("foo.tif", "data.bin"):
+                with rasterio.open(
+                    os.path.join(tmp_dir, name), "w", driver="GTiff", width=10, height=10, count=1, dtype="uint8"
+                ) as dst:
+                    dst.write(np.ones((1, 10, 10), dtype="uint8"))
+            for name, content in [("MTD.xml", "<xml/>"), ("preview.html", "<html/>"), ("foo.md5", "0"), ("README", "")]:
+                with open(os.path.join(tmp_dir, name), "w") as f:
+                    f.write(content)
+
+            with (
+                mock.patch("eodag_cube.api.product._product.try_open_dataset", wraps=try_open_dataset) as mock_open_ds,
+                product._build_local_xarray_dict(tmp_dir) as xd,
+            ):
+                self.assertListEqual(sorted(xd.keys()), ["data.bin", "foo"])
+            # format identified from file content when its extension is unknown
+            self.assertListEqual(
+                sorted(os.path.basename(c.args[0].path) for c in mock_open_ds.call_args_list), ["data.bin", "foo.tif"]
+            )
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct._open_local_file", autospec=True)
+    def test_open_local_files_worker(self, mock_open_local_file):
+        """_open_local_files should open files concurrently, also from a thread of the I/O scheduler"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        fs = fsspec.filesystem("file")
+        threads = set()
+
+        def open_local_file(product, fs, file_path, **kwargs):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.1)
+            return mock.MagicMock(), xr.Dataset(attrs={"path": file_path})
+
+        mock_open_local_file.side_effect = open_local_file
+        files_keys = [(f"/tmp/{k}.tif", k, "rasterio") for k in ("foo", "bar", "baz", "qux")]
+
+        scheduler = IOScheduler(max_workers=4)
+        self.addCleanup(scheduler.shutdown)
+        with mock.patch("eodag_cube.api.product._product.get_io_scheduler", return_value=scheduler):
+            xd, opened = scheduler.submit(product._open_local_files, fs, files_keys).result(timeout=5)
+        self.assertListEqual(list(xd.keys()), ["foo", "bar", "baz", "qux"])
+        self.assertListEqual(opened, [(path, key) for path, key, _ in files_keys])
+        self.assertGreater(len(threads), 1)
+
+    @mock.patch("eodag_cube.api.product._product.get_scan_manifests")
+    def test_build_local_xarray_dict_manifest(self, mock_get_scan_manifests):
+        """_build_local_xarray_dict should re-use the scan manifest of unchanged local data"""
+        mock_get_scan_manifests.return_value = ScanManifests("")
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(file_path, "w", driver="GTiff", width=10, height=10, count=1, dtype="uint8") as dst:
+                dst.write(np.ones((1, 10, 10), dtype="uint8"))
+            with open(os.path.join(tmp_dir, "MTD.xml"), "w") as f:
+                f.write("<xml/>")
+
+            with product._build_local_xarray_dict(tmp_dir) as xd:
+                self.assertListEqual(list(xd.keys()), ["foo"])
+
+            # neither tree walk nor format probing
+            with (
+                mock.patch("eodag_cube.api.product._product.Path.rglob") as mock_rglob,
+                mock.patch("eodag_cube.api.product._product.has_engines") as mock_has_engines,
+                mock.patch("eodag_cube.api.product._product.try_open_dataset", wraps=try_open_dataset) as mock_open_ds,
+                product._build_local_xarray_dict(tmp_dir) as xd,
+            ):
+                self.assertListEqual(list(xd.keys()), ["foo"])
+            mock_rglob.assert_not_called()
+            mock_has_engines.assert_not_called()
+            self.assertEqual(mock_open_ds.call_args.kwargs["engine"], "rasterio")
+
+            # outdated manifest of modified data
+            with open(os.path.join(tmp_dir, "bar.tif"), "wb") as f:
+                f.write(open(file_path, "rb").read())
+            with (
+                mock.patch(
+                    "eodag_cube.api.product._product.Path.rglob", autospec=True, side_effect=Path.rglob
+                ) as mock_rglob,
+                product._build_local_xarray_dict(tmp_dir) as xd,
+            ):
+                self.assertListEqual(sorted(xd.keys()), ["bar", "foo"])
+            mock_rglob.assert_called_once()
+
+            # outdated manifest of data that cannot be opened any more
+            product._build_local_xarray_dict(tmp_dir).close()
+            stat = os.stat(os.path.join(tmp_dir, "bar.tif"))
+            with open(os.path.join(tmp_dir, "bar.tif"), "r+b") as f:
+                f.write(b"corrupted")
+            os.utime(os.path.join(tmp_dir, "bar.tif"), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            with product._build_local_xarray_dict(tmp_dir) as xd:
+                self.assertListEqual(list(xd.keys()), ["foo"])
+
     @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
     @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
     def test_to_xarray_assets(self, mock_get_file, mock_open_ds):
@@ -290,9 +695,448 @@ class TestEOProduct(EODagTestCase):
         xd = product.to_xarray(foo="bar")
         mock_get_file.assert_any_call(product, "foo", DEFAULT_DOWNLOAD_WAIT, DEFAULT_DOWNLOAD_TIMEOUT)
         mock_get_file.assert_any_call(product, "bar", DEFAULT_DOWNLOAD_WAIT, DEFAULT_DOWNLOAD_TIMEOUT)
-        mock_open_ds.assert_called_with(mock_get_file.return_value, foo="bar")
+        mock_open_ds.assert_any_call(
+            mock_get_file.return_value,
+            engine_cache_key=(self.provider, self.collection, "foo"),
+            resolution=None,
+            overview_level=None,
+            crs=None,
+            foo="bar",
+        )
+        mock_open_ds.assert_any_call(
+            mock_get_file.return_value,
+            engine_cache_key=(self.provider, self.collection, "bar"),
+            resolution=None,
+            overview_level=None,
+            crs=None,
+            foo="bar",
+        )
         self.assertEqual(len(xd), 2)
         self.assertTrue(xd["foo"].equals(mock_open_ds.return_value))
         self.assertTrue(xd["bar"].equals(mock_open_ds.return_value))
         self.assertDictEqual(product.properties, xd["foo"].attrs)
         self.assertDictEqual(product.properties, xd["bar"].attrs)
+
+    @mock.patch("eodag_cube.api.product._product.async_guess_engines", new_callable=mock.AsyncMock)
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_ato_xarray_assets(self, mock_get_file, mock_open_ds, mock_guess_engines):
+        """ato_xarrray should return well built XarrayDict, opening assets concurrently within limits"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update({"foo": {"href": "http://foo.bar"}, "bar": {"href": "http://bar.baz"}})
+        mock_get_file.return_value.path = "http://foo.bar"
+        mock_guess_engines.return_value = ["rasterio"]
+
+        running = {"current": 0, "max": 0}
+        lock = threading.Lock()
+
+        def open_ds(*args, **kwargs):
+            with lock:
+                running["current"] += 1
+                running["max"] = max(running["max"], running["current"])
+            time.sleep(0.05)
+            with lock:
+                running["current"] -= 1
+            return xr.Dataset()
+
+        mock_open_ds.side_effect = open_ds
+
+        async def run():
+            # semaphores must be created in the running event loop
+            return await product.ato_xarray(semaphore=asyncio.Semaphore(1), foo="bar")
+
+        xd = asyncio.run(run())
+        self.assertEqual(len(xd), 2)
+        self.assertDictEqual(product.properties, xd["foo"].attrs)
+        self.assertEqual(running["max"], 1)
+        mock_open_ds.assert_any_call(
+            mock_get_file.return_value,
+            engine_cache_key=(self.provider, self.collection, "foo"),
+            resolution=None,
+            overview_level=None,
+            crs=None,
+            engines=["rasterio"],
+            foo="bar",
+        )
+
+        # asset
+        ds = asyncio.run(product.assets["bar"].ato_xarray())
+        self.assertIsInstance(ds, xr.Dataset)
+
+        # engine passed, format is not probed
+        mock_guess_engines.reset_mock()
+        asyncio.run(product.assets["bar"].ato_xarray(engine="rasterio"))
+        mock_guess_engines.assert_not_called()
+        self.assertIsNone(mock_open_ds.call_args.kwargs["engines"])
+
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_open_many(self, mock_get_file, mock_open_ds):
+        """open_many should yield XarrayDict of products that could be opened"""
+        products = [EOProduct(self.provider, self.eoproduct_props, collection=self.collection) for _ in range(3)]
+        products[0].assets.update({"foo": {"href": "http://foo.bar"}, "bar": {"href": "http://bar.baz"}})
+        products[2].assets.update({"baz": {"href": "http://baz.qux"}})
+
+        def get_file(product, asset_key, *args):
+            if product is products[1]:
+                raise DatasetCreationError("cannot open product")
+            return mock.MagicMock(path="http://foo.bar")
+
+        def open_ds(file, engine_cache_key, **kwargs):
+            if engine_cache_key[-1] == "baz":
+                raise DatasetCreationError("cannot open baz")
+            return xr.Dataset()
+
+        mock_get_file.side_effect = get_file
+        mock_open_ds.side_effect = open_ds
+
+        with mock.patch.object(products[1], "download", side_effect=DatasetCreationError("cannot download")):
+            results = {id(p): xd for p, xd in open_many(products, max_concurrency=2, foo="bar")}
+
+        self.assertEqual(len(results), 2)
+        self.assertListEqual(list(results[id(products[0])].keys()), ["bar", "foo"])
+        # product that could not be opened nor downloaded is skipped
+        self.assertNotIn(id(products[1]), results)
+        # asset could not be opened, whole product was
+        self.assertListEqual(list(results[id(products[2])].keys()), ["data"])
+        mock_get_file.assert_any_call(products[2], None, DEFAULT_DOWNLOAD_WAIT, DEFAULT_DOWNLOAD_TIMEOUT)
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_datacube(self, mock_get_file):
+        """to_datacube should read assets onto a common grid"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update(
+            {
+                "B02": {"href": "http://foo.bar/B02.tif", "roles": ["data"]},
+                "B05": {"href": "http://foo.bar/B05.tif", "roles": ["data"]},
+                "thumbnail": {"href": "http://foo.bar/thumbnail.png", "roles": ["thumbnail"]},
+            }
+        )
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for key, res, count, nodata in (("B02", 10, 1, 0), ("B05", 20, 2, 65535)):
+                path = os.path.join(tmp_dir, f"{key}.tif")
+                size = 600 // res
+                data = np.full((count, size, size), res, dtype="uint16")
+                # first row without data
+                data[:, 0] = nodata
+                with rasterio.open(
+                    path,
+                    "w",
+                    driver="GTiff",
+                    width=size,
+                    height=size,
+                    count=count,
+                    dtype="uint16",
+                    nodata=nodata,
+                    crs="EPSG:32631",
+                    transform=rasterio.transform.from_origin(300000, 5000000, res, res),
+                ) as dst:
+                    dst.write(data)
+                    dst.scales = (0.5,) * count
+                with open(path, "rb") as f:
+                    fs.pipe(f"/{key}.tif", f.read())
+        mock_get_file.side_effect = lambda product, key, *args: fs.open(f"/{key}.tif")
+
+        ds = product.to_datacube()
+        self.assertEqual(ds["band_data"].shape, (3, 60, 60))
+        self.assertEqual(ds["band_data"].dtype, "float32")
+        self.assertListEqual(ds["band"].values.tolist(), ["B02", "B05_1", "B05_2"])
+        self.assertEqual(ds.rio.crs, "EPSG:32631")
+        self.assertEqual(ds.rio.transform(), rasterio.transform.from_origin(300000, 5000000, 10, 10))
+        # resampled and scaled
+        np.testing.assert_array_equal(ds["band_data"].sel(band="B02")[1:], 5)
+        np.testing.assert_array_equal(ds["band_data"].sel(band="B05_2")[2:], 10)
+        self.assertTrue(np.isnan(ds["band_data"].sel(band="B05_2")[:2]).all())
+        self.assertEqual(ds.attrs["id"], product.properties["id"])
+
+        # native dtype, with a single fill value for all the bands
+        ds = product.to_datacube(dtype="uint16")
+        self.assertEqual(ds["band_data"].attrs["_FillValue"], 0)
+        np.testing.assert_array_equal(ds["band_data"][:, 0], 0)
+        np.testing.assert_array_equal(ds["band_data"].sel(band="B05_1")[2:], 20)
+
+        # dask backed, native dtype, resolution and area of interest
+        ds = product.to_datacube(assets=["B05"], resolution=60, dtype="uint16", chunks=5)
+        self.assertEqual(ds["band_data"].chunks, ((1, 1), (5, 5), (5, 5)))
+        self.assertEqual(int(ds["band_data"].max()), 20)
+        geom = transform_bounds("EPSG:32631", "EPSG:4326", 300200, 4999600, 300400, 4999800)
+        ds = product.to_datacube(geom=list(geom), resolution=20)
+        self.assertLess(ds.sizes["x"], 30)
+        self.assertTrue(np.isnan(ds["band_data"]).sum() == 0)
+        # grid aligned with the assets pixels
+        self.assertEqual(ds.rio.transform().c % 20, 0)
+        self.assertEqual(ds.rio.transform().f % 20, 0)
+
+        # explicitly requested assets must be rasters
+        with self.assertRaises(DatasetCreationError):
+            product.to_datacube(assets=["thumbnail"])
+        with self.assertRaisesRegex(DatasetCreationError, "qux not found"):
+            product.to_datacube(assets=["qux"])
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_timeseries_cube(self, mock_get_file):
+        """to_timeseries_cube should lazily stack products by acquisition day"""
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        products = []
+        # two adjacent tiles acquired the same day, and another acquisition
+        for i, (left, date, value) in enumerate(
+            [
+                (300000, "2024-01-01T10:00:00Z", 1),
+                (300300, "2024-01-01T10:00:05Z", 2),
+                (300000, "2024-01-06T10:00:00Z", 3),
+            ]
+        ):
+            footprint = shapely.geometry.box(
+                *transform_bounds("EPSG:32631", "EPSG:4326", left, 4999400, left + 300, 5e6)
+            )
+            product = EOProduct(
+                self.provider,
+                {**self.eoproduct_props, "id": f"foo{i}", "datetime": date, "geometry": footprint},
+                collection=self.collection,
+            )
+            product.search_intersection = footprint
+            product.assets.update({"B02": {"href": f"http://foo.bar/{i}/B02.tif"}})
+            products.append(product)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "B02.tif")
+                with rasterio.open(
+                    path,
+                    "w",
+                    driver="GTiff",
+                    width=30,
+                    height=60,
+                    count=1,
+                    dtype="uint16",
+                    crs="EPSG:32631",
+                    transform=rasterio.transform.from_origin(left, 5000000, 10, 10),
+                ) as dst:
+                    dst.write(np.full((1, 60, 30), value, dtype="uint16"))
+                with open(path, "rb") as f:
+                    fs.pipe(f"/foo{i}/B02.tif", f.read())
+        mock_get_file.side_effect = lambda product, key, *args: fs.open(f"/{product.properties['id']}/{key}.tif")
+
+        geom = transform_bounds("EPSG:32631", "EPSG:4326", 300000, 4999400, 300600, 5000000)
+        ds = to_timeseries_cube(products, ["B02"], resolution=20, crs="EPSG:32631", geom=list(geom), chunks=16)
+        # nothing is opened before computation
+        mock_get_file.assert_not_called()
+        self.assertEqual(ds.sizes["time"], 2)
+        self.assertEqual(ds["band_data"].data.chunksize, (1, 1, 16, 16))
+        self.assertEqual(ds.rio.crs, "EPSG:32631")
+
+        data = ds["band_data"].sel(band="B02", x=slice(300050, 300550), y=slice(4999950, 4999450)).values
+        # same day tiles are mosaicked
+        self.assertEqual(data[0, 0, 0], 1)
+        self.assertEqual(data[0, 0, -1], 2)
+        self.assertEqual(data[1, 0, 0], 3)
+        self.assertTrue(np.isnan(data[1, 0, -1]))
+
+        # products not intersecting a block are not opened
+        mock_get_file.reset_mock()
+        ds["band_data"].sel(band="B02", x=slice(300050, 300150), y=slice(4999950, 4999850)).compute()
+        self.assertListEqual(
+            sorted(call.args[0].properties["id"] for call in mock_get_file.call_args_list), ["foo0", "foo2"]
+        )
+
+        # search intersections of all the products
+        ds = to_timeseries_cube(products, ["B02"], resolution=20, crs="EPSG:32631", geom="search_intersection")
+        np.testing.assert_allclose(ds.rio.bounds(), (300000, 4999400, 300600, 5000000), atol=40)
+
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_timeseries_cube_nodata(self, mock_get_file):
+        """to_timeseries_cube should fill integer cubes nodata from the next products"""
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        footprint = shapely.geometry.box(*transform_bounds("EPSG:32631", "EPSG:4326", 300000, 4999400, 300300, 5e6))
+        products = []
+        # overlapping tiles acquired the same day, the first one having a nodata row
+        for i, value in enumerate([1, 2]):
+            product = EOProduct(
+                self.provider,
+                {**self.eoproduct_props, "id": f"foo{i}", "datetime": "2024-01-01T10:00:00Z", "geometry": footprint},
+                collection=self.collection,
+            )
+            product.assets.update({"B02": {"href": f"http://foo.bar/{i}/B02.tif"}})
+            products.append(product)
+            data = np.full((1, 60, 30), value, dtype="uint16")
+            data[:, 0, :] = 65535 if i == 0 else value
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "B02.tif")
+                with rasterio.open(
+                    path,
+                    "w",
+                    driver="GTiff",
+                    width=30,
+                    height=60,
+                    count=1,
+                    dtype="uint16",
+                    crs="EPSG:32631",
+                    transform=rasterio.transform.from_origin(300000, 5000000, 10, 10),
+                    nodata=65535,
+                ) as dst:
+                    dst.write(data)
+                with open(path, "rb") as f:
+                    fs.pipe(f"/foo{i}/B02.tif", f.read())
+        mock_get_file.side_effect = lambda product, key, *args: fs.open(f"/{product.properties['id']}/{key}.tif")
+
+        geom = transform_bounds("EPSG:32631", "EPSG:4326", 300000, 4999400, 300300, 5000000)
+        ds = to_timeseries_cube(
+            products, ["B02"], resolution=10, crs="EPSG:32631", geom=list(geom), dtype="uint16", chunks=16
+        )
+        self.assertEqual(ds["band_data"].attrs["_FillValue"], 0)
+        data = ds["band_data"].sel(band="B02").isel(time=0).compute()
+        # source nodata is filled by the next product, and never leaks into the cube
+        self.assertIn(2, data.values)
+        self.assertIn(1, data.values)
+        self.assertNotIn(65535, data.values)
+
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_to_xarray_lazy(self, mock_get_file, mock_open_ds):
+        """to_xarray with lazy=True should open assets on first access"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update(
+            {k: {"href": f"http://{k}.bar"} for k in ("foo", "bar", "baz")},
+        )
+        mock_open_ds.side_effect = lambda *args, **kwargs: xr.Dataset()
+
+        with product.to_xarray(lazy=True) as xd:
+            self.assertListEqual(list(xd.keys()), ["bar", "baz", "foo"])
+            self.assertIn("foo", xd)
+            self.assertIn("<not loaded>", repr(xd))
+            mock_get_file.assert_not_called()
+
+            self.assertIsInstance(xd["foo"], xr.Dataset)
+            self.assertTrue(xd.is_loaded("foo"))
+            self.assertFalse(xd.is_loaded("bar"))
+            # dataset is cached
+            self.assertIs(xd["foo"], xd["foo"])
+            mock_get_file.assert_called_once_with(product, "foo", DEFAULT_DOWNLOAD_WAIT, DEFAULT_DOWNLOAD_TIMEOUT)
+
+            futures = xd.prefetch(["bar"])
+            self.assertEqual(len(futures), 1)
+            futures[0].result(timeout=5)
+            self.assertTrue(xd.is_loaded("bar"))
+            self.assertEqual(mock_get_file.call_count, 2)
+
+            futures = xd.prefetch()
+            self.assertEqual(len(futures), 1)
+            self.assertTrue(all(isinstance(ds, xr.Dataset) for ds in xd.values()))
+            self.assertEqual(mock_get_file.call_count, 3)
+            # keys order is kept
+            self.assertListEqual(list(xd.keys()), ["bar", "baz", "foo"])
+            with self.assertRaises(KeyError):
+                xd.prefetch(["qux"])
+
+        # whole product opened if no asset has the given roles, as when not lazy
+        mock_get_file.reset_mock()
+        product.assets["foo"]["roles"] = ["thumbnail"]
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy), product.to_xarray(roles=["data"], lazy=lazy) as xd:
+                self.assertListEqual(list(xd.keys()), ["data"])
+                self.assertTrue(xd.is_loaded("data"))
+                self.assertEqual(mock_get_file.call_args.args[1], None)
+
+    def test_xarray_dict_files(self):
+        """XarrayDict should track its own file objects"""
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        fs.pipe({"/foo.bin": b"x" * 1000, "/bar.bin": b"y" * 1000})
+        stats = open_files_stats()
+
+        xd1 = XarrayDict({"foo": xr.Dataset()})
+        xd1._files["foo"] = mock.MagicMock(
+            closed=False, cache=BytesCache(100, lambda start, end: fs.cat_file("/foo.bin", start, end), 1000)
+        )
+        xd1._files["foo"].cache._fetch(0, 10)
+        xd2 = XarrayDict({"bar": xr.Dataset()})
+        xd2._files["bar"] = fs.open("/bar.bin")
+        self.assertEqual(xd1.files_stats()["handles"], 1)
+        self.assertGreaterEqual(xd1.files_stats()["buffered_bytes"], 100)
+        self.assertEqual(open_files_stats()["dicts"], stats["dicts"] + 2)
+        self.assertEqual(open_files_stats()["handles"], stats["handles"] + 2)
+
+        # fsspec OpenFile wrappers are not open handles
+        xd2._files["baz"] = OpenFile(fs, "/bar.bin")
+        self.assertEqual(xd2.files_stats()["handles"], 1)
+        self.assertEqual(xd2.files_stats()["wrappers"], 1)
+        del xd2._files["baz"]
+
+        # merged dicts keep file objects
+        xd3 = XarrayDict()
+        xd3.update(xd2)
+        self.assertIs(xd3._files["bar"], xd2._files["bar"])
+
+        # closing a dict does not close the files of the others
+        xd1.close()
+        self.assertFalse(xd2._files["bar"].closed)
+        self.assertDictEqual(xd1.files_stats(), {"handles": 0, "wrappers": 0, "buffered_bytes": 0})
+
+        # copies are tracked, and closing them does not close the files of the copied dict
+        xd4 = xd2.copy()
+        self.assertIsNot(xd4._lock, xd2._lock)
+        self.assertEqual(open_files_stats()["dicts"], stats["dicts"] + 4)
+        for xd_copy in (copy.copy(xd2), xd4):
+            self.assertIsInstance(xd_copy, XarrayDict)
+            self.assertListEqual(list(xd_copy.keys()), ["bar"])
+            xd_copy.close()
+            self.assertFalse(xd2._files["bar"].closed)
+            self.assertIn("bar", xd2._files)
+
+        # pickled without file objects
+        xd5 = pickle.loads(pickle.dumps(xd2))
+        self.assertListEqual(list(xd5.keys()), ["bar"])
+        self.assertDictEqual(xd5._files, {})
+        self.assertEqual(open_files_stats()["dicts"], stats["dicts"] + 5)
+
+        # garbage collected dicts are not tracked anymore
+        del xd1, xd2, xd3, xd4, xd5, xd_copy
+        self.assertEqual(open_files_stats()["dicts"], stats["dicts"])
+
+    def test_xarray_dict_lazy_copy_pickle(self):
+        """Lazy XarrayDict should be copied and pickled before and after its datasets are opened"""
+        xd = XarrayDict()
+        xd.set_loader("foo", functools.partial(XarrayDict, {"foo": xr.Dataset({"a": ("x", [1, 2])})}))
+
+        for xd_copy in (xd.copy(), copy.copy(xd), pickle.loads(pickle.dumps(xd))):
+            self.assertFalse(xd_copy.is_loaded("foo"))
+            self.assertListEqual(list(xd_copy.keys()), ["foo"])
+            self.assertListEqual(xd_copy["foo"]["a"].values.tolist(), [1, 2])
+            # loaded in the copy only
+            self.assertFalse(xd.is_loaded("foo"))
+
+        xd.prefetch()[0].result(timeout=5)
+        for xd_copy in (xd.copy(), pickle.loads(pickle.dumps(xd))):
+            self.assertTrue(xd_copy.is_loaded("foo"))
+            self.assertListEqual(xd_copy["foo"]["a"].values.tolist(), [1, 2])
+            # own state
+            self.assertListEqual(xd_copy.prefetch(), [])
+            self.assertIsNot(xd_copy._loading, xd._loading)
+
+    @mock.patch("eodag_cube.api.product._product.try_open_dataset", autospec=True)
+    @mock.patch("eodag_cube.api.product._product.EOProduct.get_file_obj", autospec=True)
+    def test_iter_xarray(self, mock_get_file, mock_open_ds):
+        """iter_xarray should yield datasets by order of completion and stop pending opens on break"""
+        product = EOProduct(self.provider, self.eoproduct_props, collection=self.collection)
+        product.assets.update({"foo": {"href": "http://foo.bar"}, "bar": {"href": "http://bar.baz"}})
+        bar_yielded = threading.Event()
+
+        def open_ds(file, engine_cache_key, **kwargs):
+            if engine_cache_key[-1] == "foo":
+                # foo is opened once bar has been consumed
+                self.assertTrue(bar_yielded.wait(timeout=5))
+            return xr.Dataset()
+
+        mock_open_ds.side_effect = open_ds
+
+        keys = []
+        for key, ds in product.iter_xarray(max_concurrency=2):
+            self.assertIsInstance(ds, xr.Dataset)
+            keys.append(key)
+            bar_yielded.set()
+        self.assertListEqual(keys, ["bar", "foo"])
+
+        # stopping the iteration does not open remaining assets
+        mock_get_file.reset_mock()
+        datasets = product.iter_xarray(max_concurrency=1)
+        next(datasets)
+        datasets.close()
+        self.assertEqual(mock_get_file.call_count, 1)
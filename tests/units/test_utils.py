@@ -16,21 +16,58 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import datetime as dt
+import functools
+import os
+import tempfile
+import threading
+import time
 import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import fsspec.implementations
 import fsspec.implementations.http
 import numpy as np
+import rasterio
 import responses
+import rioxarray
+import shapely
 import xarray as xr
 from fsspec.core import OpenFile
+from fsspec.implementations.zip import ZipFileSystem
+from rasterio.warp import transform_bounds
 
 from eodag_cube.utils import metadata
+from eodag_cube.utils.aio import (
+    async_fsspec_file_extension,
+    async_fsspec_file_headers,
+    async_guess_engines,
+    async_read_header,
+    async_sniff_engines,
+    run_in_scheduler,
+)
+from eodag_cube.utils.auth import AuthCache, get_credentials_expiration
+from eodag_cube.utils.fs import FileSystemPool, ZipArchivePool, storage_options_fingerprint, zip_archive
+from eodag_cube.utils.manifest import ManifestEntry, ScanManifests, file_stat
+from eodag_cube.utils.raster import RioEnvManager, build_rio_env, build_warped_vrt, rasterio_source
+from eodag_cube.utils.scheduler import IOScheduler, get_host, get_io_scheduler
+from eodag_cube.utils.xarray import (
+    SNIFF_SIZE,
+    EngineCache,
+    clip_dataset,
+    engines_for_extension,
+    import_dask_array,
+    refresh_engines,
+)
 from tests.context import (
     DatasetCreationError,
     fsspec_file_extension,
     fsspec_file_headers,
     guess_engines,
+    sniff_engines,
+    sniff_format,
     try_open_dataset,
 )
 from tests.utils import mock
@@ -108,6 +145,71 @@ class TestUtils(unittest.TestCase):
 
         run()
 
+    def test_fsspec_file_headers_bytes_budget(self):
+        """fsspec_file_headers must not download the whole file when HEAD is not allowed"""
+        file_size = 64 * 1024 * 1024
+        chunk = b"0" * 65536
+        sent = {"bytes": 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            honour_range = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(405)
+                self.end_headers()
+
+            def do_GET(self):
+                range_header = self.headers.get("Range")
+                if range_header and self.honour_range:
+                    start, end = (int(x) for x in range_header.split("=")[1].split("-"))
+                    self.send_response(206)
+                    self.send_header("Content-Type", "image/jp2")
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
+                    self.send_header("Content-Length", str(end - start + 1))
+                    self.end_headers()
+                    self.wfile.write(b"0" * (end - start + 1))
+                    sent["bytes"] += end - start + 1
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jp2")
+                self.send_header("Content-Length", str(file_size))
+                self.end_headers()
+                try:
+                    for _ in range(file_size // len(chunk)):
+                        self.wfile.write(chunk)
+                        sent["bytes"] += len(chunk)
+                except OSError:
+                    pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/bar.baz"
+            file = mock.MagicMock(path=url, kwargs={})
+            file.fs.protocol = ("https", "http")
+
+            # ranged request
+            headers = fsspec_file_headers(file)
+            self.assertEqual(headers["Content-Type"], "image/jp2")
+            self.assertEqual(headers["Content-Length"], str(file_size))
+            self.assertEqual(sent["bytes"], 1)
+            self.assertEqual(fsspec_file_extension(file), ".jp2")
+
+            # range not supported by server: body is not read
+            Handler.honour_range = False
+            sent["bytes"] = 0
+            headers = fsspec_file_headers(file)
+            self.assertEqual(headers["Content-Type"], "image/jp2")
+            thread.join(timeout=0.5)
+            self.assertLess(sent["bytes"], file_size)
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def test_fsspec_file_extension(self):
         """fsspec_file_extension must return openfile file extension"""
 
@@ -136,9 +238,8 @@ class TestUtils(unittest.TestCase):
 
 
 class TestXarray(unittest.TestCase):
-    @mock.patch("eodag_cube.utils.requests.head", autospec=True)
-    @mock.patch("eodag_cube.utils.requests.get", autospec=True)
-    def test_guess_engines(self, mock_head, mock_get):
+    @mock.patch("eodag_cube.utils.get_http_session", autospec=True)
+    def test_guess_engines(self, mock_session):
         """guess_engines must return guessed xarray engines"""
 
         all_engines = xr.backends.list_engines()
@@ -160,6 +261,445 @@ class TestXarray(unittest.TestCase):
         file = OpenFile(fs, "https://foo/bar.grib")
         self.assertIn("cfgrib", guess_engines(file))
 
+    @mock.patch("eodag_cube.utils.xarray.xr.backends.list_engines", autospec=True)
+    def test_engines_discovered_once(self, mock_list_engines):
+        """xarray engines must be discovered once and looked up by extension"""
+        backend = mock.Mock()
+        backend.guess_can_open.side_effect = lambda path: path.endswith(".nc")
+        mock_list_engines.return_value = {"foo_engine": backend}
+        # restore real engines once patch is stopped
+        self.addCleanup(refresh_engines)
+
+        refresh_engines()
+        for _ in range(3):
+            self.assertEqual(engines_for_extension(".nc"), ["foo_engine"])
+            self.assertEqual(engines_for_extension(".baz"), [])
+        self.assertEqual(mock_list_engines.call_count, 1)
+
+        # unknown extensions are resolved once
+        guess_can_open_calls = backend.guess_can_open.call_count
+        engines_for_extension(".baz")
+        self.assertEqual(backend.guess_can_open.call_count, guess_can_open_calls)
+
+        # lookups do not fail while the table is rebuilt
+        errors = []
+
+        def lookup():
+            try:
+                for i in range(200):
+                    self.assertEqual(engines_for_extension(f".nc{i}"), [])
+                    self.assertEqual(engines_for_extension(".nc"), ["foo_engine"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(50):
+            refresh_engines()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(errors, [])
+
+    def test_clip_dataset(self):
+        """clip_dataset must lazily clip datasets to the geometry bounding box"""
+        geometry = shapely.geometry.box(1.05, 1.05, 1.95, 1.95)
+
+        # georeferenced raster: 0.1° pixels covering [0, 10] x [0, 10]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(
+                path,
+                "w",
+                driver="GTiff",
+                width=100,
+                height=100,
+                count=1,
+                dtype="uint8",
+                crs="EPSG:4326",
+                transform=rasterio.transform.from_bounds(0, 0, 10, 10, 100, 100),
+            ) as dst:
+                dst.write(np.arange(100, dtype="uint8").reshape(1, 1, 100).repeat(100, axis=1))
+
+            ds = xr.open_dataset(path, engine="rasterio")
+            clipped = clip_dataset(ds, geometry)
+            self.assertEqual(clipped["band_data"].shape, (1, 10, 10))
+            # data was not loaded
+            self.assertFalse(clipped["band_data"].variable._in_memory)
+            self.assertEqual(float(clipped["band_data"].min()), 10)
+
+            with self.assertRaises(DatasetCreationError):
+                clip_dataset(ds, shapely.geometry.box(20, 20, 21, 21))
+            ds.close()
+
+        # longitude / latitude coordinates, with descending latitudes
+        ds = xr.Dataset(
+            {"foo": (("latitude", "longitude"), np.zeros((10, 10)))},
+            coords={"latitude": np.arange(9.5, 0, -1), "longitude": np.arange(0.5, 10)},
+        )
+        clipped = clip_dataset(ds, shapely.geometry.box(1, 1, 4, 3))
+        self.assertListEqual(clipped["latitude"].values.tolist(), [2.5, 1.5])
+        self.assertListEqual(clipped["longitude"].values.tolist(), [1.5, 2.5, 3.5])
+
+        # longitudes in [0, 360] range, with bbox crossing 0°
+        ds = xr.Dataset(
+            {"foo": (("latitude", "longitude"), np.tile(np.arange(360.0), (10, 1)))},
+            coords={"latitude": np.arange(9.5, 0, -1), "longitude": np.arange(0.5, 360)},
+        )
+        clipped = clip_dataset(ds, shapely.geometry.box(-2, 1, 2, 3))
+        self.assertListEqual(clipped["longitude"].values.tolist(), [-1.5, -0.5, 0.5, 1.5])
+        self.assertListEqual(clipped["foo"][0].values.tolist(), [358, 359, 0, 1])
+        self.assertListEqual(clipped["latitude"].values.tolist(), [2.5, 1.5])
+        clipped = clip_dataset(ds, shapely.geometry.box(-3, 1, -1, 3))
+        self.assertListEqual(clipped["longitude"].values.tolist(), [357.5, 358.5])
+
+        # datasets that cannot be clipped are closed
+        ds = xr.Dataset(
+            {"foo": (("y", "x"), np.zeros((5, 1)))},
+            coords={"y": np.arange(4.5, 0, -1), "x": [0.5]},
+        ).rio.write_crs("EPSG:4326")
+        with mock.patch.object(xr.Dataset, "close") as mock_close, self.assertRaises(DatasetCreationError):
+            clip_dataset(ds, shapely.geometry.box(0, 1, 1, 3))
+        mock_close.assert_called_once()
+
+        # no spatial coordinates
+        ds = xr.Dataset({"foo": ("x", [1, 2])})
+        self.assertIs(clip_dataset(ds, geometry), ds)
+
+    def test_try_open_dataset_native_chunks(self):
+        """try_open_dataset must read data by chunks aligned with its internal layout"""
+        fs = fsspec.filesystem("file", skip_instance_cache=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tif_path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(
+                tif_path,
+                "w",
+                driver="GTiff",
+                width=600,
+                height=600,
+                count=2,
+                dtype="uint16",
+                crs="EPSG:32631",
+                transform=rasterio.transform.from_origin(0, 6000, 10, 10),
+                tiled=True,
+                blockxsize=128,
+                blockysize=128,
+            ) as dst:
+                dst.write(np.ones((2, 600, 600), dtype="uint16"))
+
+            with mock.patch("rioxarray.open_rasterio", wraps=rioxarray.open_rasterio) as mock_open_rasterio:
+                ds = try_open_dataset(fs.open(tif_path), chunks="native")
+            self.assertFalse(mock_open_rasterio.call_args.kwargs["lock"])
+            band_chunks, y_chunks, x_chunks = ds["band_data"].chunks
+            self.assertEqual(band_chunks, (1, 1))
+            self.assertTrue(all(c % 128 == 0 for c in y_chunks[:-1] + x_chunks[:-1]))
+            self.assertEqual(float(ds["band_data"].mean()), 1)
+            ds.close()
+
+            nc_path = os.path.join(tmp_dir, "foo.nc")
+            xr.Dataset({"a": (("y", "x"), np.ones((100, 60)))}).to_netcdf(
+                nc_path, engine="netcdf4", encoding={"a": {"chunksizes": (25, 30)}}
+            )
+            ds = try_open_dataset(fs.open(nc_path), chunks="native")
+            self.assertEqual(ds["a"].chunks, ((25,) * 4, (30, 30)))
+            ds.close()
+
+    def test_import_dask_array(self):
+        """import_dask_array must name the dask extra if dask is not installed"""
+        self.assertTrue(hasattr(import_dask_array(), "map_blocks"))
+        with mock.patch("importlib.util.find_spec", return_value=None):
+            with self.assertRaisesRegex(ImportError, r"eodag-cube\[dask\]"):
+                import_dask_array()
+
+    def test_try_open_dataset_dtype(self):
+        """try_open_dataset must keep native dtypes or mask and scale data as the given dtype"""
+        fs = fsspec.filesystem("file", skip_instance_cache=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(
+                path,
+                "w",
+                driver="GTiff",
+                width=10,
+                height=10,
+                count=1,
+                dtype="uint16",
+                nodata=0,
+                crs="EPSG:32631",
+                transform=rasterio.transform.from_origin(0, 100, 10, 10),
+            ) as dst:
+                dst.write(np.arange(100, dtype="uint16").reshape((1, 10, 10)))
+                dst.scales = (0.0001,)
+                dst.offsets = (-0.1,)
+
+            for dtype, expected_dtype, expected_values in [
+                ("native", "uint16", [0, 1]),
+                ("float32", "float32", [np.nan, -0.0999]),
+                (None, None, [np.nan, -0.0999]),
+            ]:
+                with self.subTest(dtype=dtype):
+                    ds = try_open_dataset(fs.open(path), dtype=dtype)
+                    if expected_dtype:
+                        self.assertEqual(ds["band_data"].dtype, expected_dtype)
+                    np.testing.assert_allclose(ds["band_data"].values[0, 0, :2], expected_values, rtol=1e-5)
+                    # nodata, scale and offset are reported whatever the dtype
+                    variable = metadata.build_stac_metadata(ds)["cube:variables"]["band_data"]
+                    self.assertEqual(variable["nodata"], 0)
+                    self.assertAlmostEqual(variable["scale"], 0.0001)
+                    self.assertAlmostEqual(variable["offset"], -0.1)
+                    ds.close()
+
+    def test_try_open_dataset_resolution(self):
+        """try_open_dataset must read rasters from overviews or resampled to the target resolution"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.tif")
+            with rasterio.open(
+                path,
+                "w",
+                driver="GTiff",
+                width=600,
+                height=600,
+                count=1,
+                dtype="uint16",
+                crs="EPSG:32631",
+                transform=rasterio.transform.from_origin(0, 6000, 10, 10),
+                tiled=True,
+            ) as dst:
+                dst.write(np.ones((1, 600, 600), dtype="uint16"))
+                dst.build_overviews([2, 6])
+
+            # resampled on a grid aligned with raster upper-left corner
+            ds = try_open_dataset(fsspec.filesystem("file", skip_instance_cache=True).open(path), resolution=30)
+            self.assertEqual(ds["band_data"].shape, (1, 200, 200))
+            self.assertEqual(ds.rio.transform(), rasterio.transform.from_origin(0, 6000, 30, 30))
+            self.assertEqual(float(ds["band_data"].mean()), 1)
+            ds.close()
+
+            # reprojected and clipped at read time
+            geometry = shapely.geometry.box(*transform_bounds("EPSG:32631", "EPSG:4326", 2000, 2000, 4000, 4000))
+            ds = try_open_dataset(
+                fsspec.filesystem("file", skip_instance_cache=True).open(path), crs="EPSG:4326", geometry=geometry
+            )
+            self.assertEqual(ds.rio.crs, "EPSG:4326")
+            np.testing.assert_allclose(ds.rio.bounds(), geometry.bounds, atol=1e-3)
+            self.assertEqual(float(ds["band_data"].mean()), 1)
+            ds.close()
+
+            # clipped read on a grid aligned with raster pixels
+            with rasterio.open(path) as src, build_warped_vrt(src, bounds=(2003, 1997, 3996, 4004)) as vrt:
+                self.assertEqual(vrt.transform, rasterio.transform.from_origin(2000, 4010, 10, 10))
+                self.assertEqual((vrt.width, vrt.height), (200, 202))
+
+            fs = fsspec.filesystem("memory", skip_instance_cache=True)
+            with open(path, "rb") as f:
+                fs.pipe("/foo.tif", f.read())
+
+        file = fs.open("memory://foo.tif")
+        for kwargs, shape, overview_level in [
+            ({"resolution": 10}, (1, 600, 600), None),
+            ({"resolution": 20}, (1, 300, 300), 0),
+            ({"resolution": (60, 60)}, (1, 100, 100), 1),
+            ({"overview_level": 1}, (1, 100, 100), 1),
+            # resampled through a warped VRT keeping the raster opened with rasterio opener
+            ({"resolution": 30}, (1, 200, 200), None),
+        ]:
+            with self.subTest(**kwargs):
+                with mock.patch(
+                    "eodag_cube.utils.xarray.rioxarray.open_rasterio", wraps=rioxarray.open_rasterio
+                ) as mock_open_rio:
+                    ds = try_open_dataset(file, **kwargs)
+                if mock_open_rio.called:
+                    self.assertEqual(mock_open_rio.call_args.kwargs.get("overview_level"), overview_level)
+                self.assertEqual(ds["band_data"].shape, shape)
+                self.assertEqual(ds.rio.transform().a, 6000 / shape[-1])
+                self.assertEqual(float(ds["band_data"].mean()), 1)
+                ds.close()
+
+        # reprojected and clipped at read time, lazily read when rasterio opener is used
+        ds = try_open_dataset(file, crs="EPSG:4326", geometry=geometry)
+        self.assertEqual(ds.rio.crs, "EPSG:4326")
+        np.testing.assert_allclose(ds.rio.bounds(), geometry.bounds, atol=1e-3)
+        self.assertEqual(float(ds["band_data"][0, ::2, 1:3].mean()), 1)
+        self.assertEqual(float(ds["band_data"].mean()), 1)
+        ds.close()
+        fs.rm("/foo.tif")
+
+    def test_sniff_format(self):
+        """sniff_format must identify file formats from their first bytes"""
+        fs = fsspec.filesystem("memory")
+        headers = {
+            "hdf5": b"\x89HDF\r\n\x1a\n\x00\x00",
+            "netcdf3": b"CDF\x01\x00\x00",
+            "grib": b"GRIB\x00\x00",
+            "tiff": b"II*\x00\x08\x00",
+            "jp2": b"\x00\x00\x00\x0cjP  \r\n\x87\n\x00",
+            "zip": b"PK\x03\x04\x00",
+        }
+        for file_format, header in headers.items():
+            fs.pipe(f"/sniff/foo.{file_format}", header + b"\x00" * 1024)
+            self.assertEqual(sniff_format(OpenFile(fs, f"/sniff/foo.{file_format}")), file_format)
+
+        # grib with bulletin header
+        fs.pipe("/sniff/bulletin.bin", b"\x01\r\r\nHEADER\r\r\nGRIB\x00")
+        self.assertEqual(sniff_format(OpenFile(fs, "/sniff/bulletin.bin")), "grib")
+        # unknown format
+        fs.pipe("/sniff/foo.xml", b"<?xml version='1.0'?>")
+        self.assertIsNone(sniff_format(OpenFile(fs, "/sniff/foo.xml")))
+        # unreadable
+        self.assertIsNone(sniff_format(OpenFile(fs, "/sniff/missing")))
+
+        self.assertEqual(sniff_engines(OpenFile(fs, "/sniff/foo.tiff")), ["rasterio"])
+        self.assertIn("h5netcdf", sniff_engines(OpenFile(fs, "/sniff/foo.hdf5")))
+        self.assertEqual(sniff_engines(OpenFile(fs, "/sniff/foo.xml")), [])
+        # archives are only opened as zarr stores when they contain zarr metadata
+        self.assertEqual(sniff_engines(OpenFile(fs, "/sniff/foo.zip")), [])
+        for name, member in [("archive.zip", "MTD.xml"), ("store.zip", ".zmetadata")]:
+            with fs.open(f"/sniff/{name}", "wb") as f, zipfile.ZipFile(f, "w") as zf:
+                zf.writestr(member, "{}")
+        with mock.patch("eodag_cube.utils.xarray.list_engines", return_value={"zarr": None, "rasterio": None}):
+            self.assertEqual(sniff_engines(OpenFile(fs, "/sniff/archive.zip")), [])
+            self.assertEqual(sniff_engines(OpenFile(fs, "/sniff/store.zip")), ["zarr"])
+        fs.rm("/sniff", recursive=True)
+
+    @mock.patch("eodag_cube.utils.xarray.guess_engines", autospec=True)
+    def test_try_open_dataset_sniffed(self, mock_guess_engines):
+        """try_open_dataset must use engine identified from file content"""
+        fs = fsspec.filesystem("memory")
+        fs.pipe("/sniffed/bar.bin", b"II*\x00" + b"\x00" * 1024)
+        file = OpenFile(fs, "/sniffed/bar.bin")
+        with mock.patch(
+            "eodag_cube.utils.xarray.rioxarray.open_rasterio",
+        ) as mock_open_rio:
+            mock_open_rio.return_value = xr.DataArray()
+            ds = try_open_dataset(file)
+            self.assertIsInstance(ds, xr.Dataset)
+            mock_open_rio.assert_called_once()
+            # engines identified by the caller
+            with mock.patch("eodag_cube.utils.xarray.sniff_engines") as mock_sniff_engines:
+                try_open_dataset(file, engines=["rasterio"])
+            mock_sniff_engines.assert_not_called()
+            self.assertEqual(mock_open_rio.call_count, 2)
+        mock_guess_engines.assert_not_called()
+        fs.rm("/sniffed", recursive=True)
+
+    def test_engine_cache(self):
+        """EngineCache must store, persist, seed and invalidate engines"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "engines.json")
+            engine_cache = EngineCache(cache_path)
+            engine_cache.set(("foo", "bar", "B01"), "rasterio")
+            engine_cache.seed({("foo", "bar", None): "h5netcdf", ("foo", "baz", "data"): "cfgrib"})
+            self.assertEqual(engine_cache.get(("foo", "bar", "B01")), "rasterio")
+
+            # persisted
+            engine_cache = EngineCache(cache_path)
+            self.assertEqual(len(engine_cache), 3)
+            self.assertEqual(engine_cache.get(("foo", "bar", None)), "h5netcdf")
+
+            engine_cache.invalidate(("foo", "bar", None))
+            self.assertIsNone(EngineCache(cache_path).get(("foo", "bar", None)))
+            engine_cache.invalidate()
+            self.assertEqual(len(EngineCache(cache_path)), 0)
+
+        # not persisted
+        engine_cache = EngineCache("")
+        engine_cache.set(("foo",), "rasterio")
+        self.assertEqual(engine_cache.get(("foo",)), "rasterio")
+
+    def test_scan_manifests(self):
+        """ScanManifests must store, persist and invalidate scans of unchanged local data"""
+        fs = fsspec.filesystem("file")
+        with tempfile.TemporaryDirectory() as tmp_dir, tempfile.TemporaryDirectory() as manifest_dir:
+            os.makedirs(os.path.join(tmp_dir, "sub"))
+            os.makedirs(os.path.join(tmp_dir, "empty"))
+            file_path = os.path.join(tmp_dir, "sub", "foo.nc")
+            with open(file_path, "w") as f:
+                f.write("foo")
+            entries = [ManifestEntry(file_path, "foo", "h5netcdf", *file_stat(fs, file_path))]
+            self.assertEqual(entries[0].size, 3)
+
+            manifests = ScanManifests(manifest_dir)
+            self.assertIsNone(manifests.load(fs, tmp_dir))
+            manifests.save(tmp_dir, None, entries)
+            self.assertListEqual(manifests.load(fs, tmp_dir), entries)
+            # scans of other files have their own manifests
+            self.assertIsNone(manifests.load(fs, tmp_dir, "foo.nc"))
+
+            # persisted, and kept in memory once loaded
+            other_manifests = ScanManifests(manifest_dir)
+            self.assertListEqual(other_manifests.load(fs, tmp_dir), entries)
+            self.assertEqual(len(other_manifests._manifests), 1)
+
+            # directories added in a previously empty directory outdate the manifest
+            os.makedirs(os.path.join(tmp_dir, "empty", "new"))
+            with open(os.path.join(tmp_dir, "empty", "new", "bar.nc"), "w") as f:
+                f.write("bar")
+            os.utime(os.path.join(tmp_dir, "empty"), (0, 0))
+            self.assertIsNone(manifests.load(fs, tmp_dir))
+            manifests.save(tmp_dir, None, entries)
+            self.assertListEqual(manifests.load(fs, tmp_dir), entries)
+
+            # files added in a sub-directory outdate the manifest
+            with open(os.path.join(tmp_dir, "sub", "bar.nc"), "w") as f:
+                f.write("bar")
+            os.utime(os.path.join(tmp_dir, "sub"), (0, 0))
+            self.assertIsNone(manifests.load(fs, tmp_dir))
+
+            # modified files outdate the manifest
+            manifests.save(tmp_dir, None, entries)
+            self.assertListEqual(manifests.load(fs, tmp_dir), entries)
+            with open(file_path, "a") as f:
+                f.write("foo")
+            self.assertIsNone(manifests.load(fs, tmp_dir))
+
+            manifests.save(tmp_dir, None, [])
+            self.assertListEqual(manifests.load(fs, tmp_dir), [])
+            manifests.invalidate(tmp_dir)
+            self.assertIsNone(manifests.load(fs, tmp_dir))
+            self.assertIsNone(ScanManifests(manifest_dir).load(fs, tmp_dir))
+            self.assertListEqual(os.listdir(manifest_dir), [])
+
+            # not persisted
+            manifests = ScanManifests("")
+            manifests.save(tmp_dir, None, [])
+            self.assertListEqual(manifests.load(fs, tmp_dir), [])
+            self.assertIsNone(ScanManifests("").load(fs, tmp_dir))
+
+    @mock.patch("eodag_cube.utils.xarray.xr.open_dataset", return_value=xr.Dataset())
+    @mock.patch("eodag_cube.utils.xarray.get_engine_cache")
+    @mock.patch("eodag_cube.utils.xarray.sniff_engines", return_value=["h5netcdf"])
+    def test_try_open_dataset_engine_cache(self, mock_sniff_engines, mock_get_engine_cache, mock_open_dataset):
+        """try_open_dataset must use, update and invalidate cached engines"""
+        engine_cache = EngineCache("")
+        mock_get_engine_cache.return_value = engine_cache
+        fs = fsspec.filesystem("https")
+        fs.open = mock.MagicMock()
+        file = OpenFile(fs, "https://foo/bar.nc")
+        key = ("foo", "bar", "baz")
+
+        # engine found by probing is cached
+        try_open_dataset(file, engine_cache_key=key)
+        self.assertEqual(engine_cache.get(key), "h5netcdf")
+        mock_sniff_engines.assert_called_once()
+
+        # cached engine is used without probing
+        mock_sniff_engines.reset_mock()
+        try_open_dataset(file, engine_cache_key=key)
+        mock_sniff_engines.assert_not_called()
+        mock_open_dataset.assert_called_with(file, engine="h5netcdf")
+
+        # failing cached engine is invalidated
+        def open_dataset(*args, engine, **kwargs):
+            if engine != "h5netcdf":
+                raise ValueError(f"cannot open with {engine}")
+            return xr.Dataset()
+
+        engine_cache.set(key, "foo")
+        mock_open_dataset.side_effect = open_dataset
+        try_open_dataset(file, engine_cache_key=key)
+        mock_sniff_engines.assert_called_once()
+        self.assertEqual(engine_cache.get(key), "h5netcdf")
+
     @mock.patch("eodag_cube.utils.xarray.guess_engines", return_value=["h5netcdf", "foo"])
     @mock.patch("eodag_cube.api.product._product.fsspec.open")
     def test_try_open_dataset_local(self, mock_open, mock_guess_engines):
@@ -510,3 +1050,409 @@ class TestMetadataUtils(unittest.TestCase):
         self.assertEqual(len(bands), 2)
         self.assertEqual(bands[0]["name"], "band1")
         self.assertEqual(bands[1]["name"], "band2")
+
+
+class TestFileSystemPool(unittest.TestCase):
+    @mock.patch("eodag_cube.utils.fs.fsspec.filesystem", side_effect=lambda *a, **kw: mock.MagicMock())
+    def test_filesystem_pool(self, mock_fs):
+        """FileSystemPool must reuse filesystems per protocol, endpoint and credentials"""
+        pool = FileSystemPool(maxsize=2)
+        fs = pool.get("s3", key="foo", client_kwargs={"endpoint_url": "https://foo.bar"})
+        self.assertIs(pool.get("s3", key="foo", client_kwargs={"endpoint_url": "https://foo.bar"}), fs)
+        mock_fs.assert_called_once_with(
+            "s3", skip_instance_cache=True, key="foo", client_kwargs={"endpoint_url": "https://foo.bar"}
+        )
+        # rotated credentials
+        self.assertIsNot(pool.get("s3", key="bar", client_kwargs={"endpoint_url": "https://foo.bar"}), fs)
+        self.assertEqual(pool.stats(), {"size": 2, "maxsize": 2, "hits": 1, "misses": 2})
+
+        # least recently used instance is evicted
+        https_fs = pool.get("https")
+        self.assertEqual(len(pool), 2)
+        self.assertIsNot(pool.get("s3", key="foo", client_kwargs={"endpoint_url": "https://foo.bar"}), fs)
+
+        # invalidation
+        self.assertEqual(pool.invalidate(protocol="s3", endpoint="https://foo.bar"), 1)
+        self.assertIs(pool.get("https"), https_fs)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+    def test_zip_archive_pool(self):
+        """ZipArchivePool must read the central directory of each archive once"""
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        for name in ("foo", "bar", "baz"):
+            with fs.open(f"/{name}.zip", "wb") as f, zipfile.ZipFile(f, "w") as zf:
+                zf.writestr("data/a.txt", f"{name} a")
+                zf.writestr("data/b.txt", f"{name} b")
+
+        pool = ZipArchivePool(maxsize=2)
+        with mock.patch("eodag_cube.utils.fs.ZipFileSystem", wraps=ZipFileSystem) as mock_zip_fs:
+            zip_fs = pool.get(fs, "memory://foo.zip")
+            self.assertIs(pool.get(fs, "/foo.zip"), zip_fs)
+            mock_zip_fs.assert_called_once()
+        self.assertEqual(zip_fs.cat_file("data/b.txt"), b"foo b")
+        # members know their archive
+        member = OpenFile(zip_fs, "data/a.txt")
+        self.assertEqual(zip_archive(member).path, "/foo.zip")
+        self.assertIsNone(zip_archive(OpenFile(fs, "/foo.zip")))
+        # members of s3 archives are read by GDAL
+        s3_archive = OpenFile(mock.MagicMock(protocol=("s3", "s3a")), "bucket/foo.zip")
+        s3_member = OpenFile(mock.MagicMock(protocol="zip", of=s3_archive), "data/a.tif")
+        self.assertEqual(rasterio_source(s3_member), ("/vsizip//vsis3/bucket/foo.zip/data/a.tif", None))
+        self.assertEqual(pool.stats(), {"size": 1, "maxsize": 2, "hits": 1, "misses": 1})
+
+        # least recently used archive is evicted
+        pool.get(fs, "/bar.zip")
+        pool.get(fs, "/baz.zip")
+        self.assertEqual(len(pool), 2)
+        self.assertIsNot(pool.get(fs, "/foo.zip"), zip_fs)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        for name in ("foo", "bar", "baz"):
+            fs.rm(f"/{name}.zip")
+
+    def test_storage_options_fingerprint(self):
+        """storage_options_fingerprint must be stable and hide credentials"""
+        fingerprint = storage_options_fingerprint({"key": "foo", "headers": {"a": "b"}})
+        self.assertEqual(fingerprint, storage_options_fingerprint({"headers": {"a": "b"}, "key": "foo"}))
+        self.assertNotIn("foo", fingerprint)
+        self.assertNotEqual(fingerprint, storage_options_fingerprint({"key": "bar", "headers": {"a": "b"}}))
+
+
+class TestAuthCache(unittest.TestCase):
+    def test_auth_cache(self):
+        """AuthCache must cache authentication objects per plugin and count hits / misses"""
+        auth_cache = AuthCache(ttl=100)
+        plugin = mock.MagicMock(spec=["authenticate", "provider"])
+        self.assertIs(auth_cache.authenticate(plugin), auth_cache.authenticate(plugin))
+        plugin.authenticate.assert_called_once()
+        other_plugin = mock.MagicMock(spec=["authenticate", "provider"])
+        auth_cache.authenticate(other_plugin)
+        other_plugin.authenticate.assert_called_once()
+        self.assertEqual(auth_cache.stats(), {"plugins": 2, "ttl": 100, "hits": 1, "misses": 2})
+
+        # invalidation
+        auth_cache.invalidate(plugin)
+        auth_cache.authenticate(plugin)
+        self.assertEqual(plugin.authenticate.call_count, 2)
+
+        # expired entries
+        auth_cache = AuthCache(ttl=0)
+        auth_cache.authenticate(plugin)
+        auth_cache.authenticate(plugin)
+        self.assertEqual(plugin.authenticate.call_count, 4)
+
+    def test_auth_cache_credentials_expiration(self):
+        """AuthCache must honour credentials expiration"""
+        auth_cache = AuthCache(ttl=1000)
+        plugin = mock.MagicMock(spec=["authenticate", "provider", "access_token_expiration"])
+
+        # token expiring before the end of the expiration margin
+        plugin.access_token_expiration = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=30)
+        auth_cache.authenticate(plugin)
+        auth_cache.authenticate(plugin)
+        self.assertEqual(plugin.authenticate.call_count, 2)
+
+        # long-lived token
+        plugin.access_token_expiration = dt.datetime.now(dt.timezone.utc) + dt.timedelta(hours=1)
+        auth_cache.authenticate(plugin)
+        auth_cache.authenticate(plugin)
+        self.assertEqual(plugin.authenticate.call_count, 3)
+
+    def test_get_credentials_expiration(self):
+        """get_credentials_expiration must read plugins and aws credentials expiration"""
+        expiration = dt.datetime.now(dt.timezone.utc) + dt.timedelta(hours=1)
+        plugin = mock.MagicMock(spec=["token_expiration"], token_expiration=expiration)
+        self.assertEqual(get_credentials_expiration(plugin), expiration.timestamp())
+
+        plugin = mock.MagicMock(spec=["s3_session"])
+        plugin.s3_session.get_credentials.return_value = mock.MagicMock(spec=["_expiry_time"], _expiry_time=expiration)
+        self.assertEqual(get_credentials_expiration(plugin), expiration.timestamp())
+
+        plugin = mock.MagicMock(spec=["access_token_expiration"], access_token_expiration=dt.datetime.min)
+        self.assertEqual(get_credentials_expiration(plugin), 0.0)
+        self.assertIsNone(get_credentials_expiration(mock.MagicMock(spec=[])))
+
+
+class TestRioEnv(unittest.TestCase):
+    def test_build_rio_env(self):
+        """build_rio_env must apply default GDAL options unless set in environment"""
+        with build_rio_env({"FOO": "bar"}) as env:
+            options = env.options
+        self.assertEqual(options["FOO"], "bar")
+        self.assertEqual(options["VSI_CACHE"], "TRUE")
+        # sidecar files of local data must be found by GDAL
+        self.assertNotIn("GDAL_DISABLE_READDIR_ON_OPEN", options)
+        self.assertNotIn("GDAL_HTTP_MULTIPLEX", options)
+
+        with build_rio_env({"FOO": "bar"}, remote=True) as env:
+            options = env.options
+        self.assertEqual(options["GDAL_DISABLE_READDIR_ON_OPEN"], "EMPTY_DIR")
+        self.assertEqual(options["GDAL_HTTP_VERSION"], "2")
+        self.assertEqual(options["VSI_CACHE"], "TRUE")
+
+        with mock.patch.dict("os.environ", {"VSI_CACHE": "FALSE"}):
+            with build_rio_env({}) as env:
+                self.assertNotIn("VSI_CACHE", env.options)
+
+    @mock.patch("eodag_cube.utils.raster.build_rio_env", wraps=build_rio_env)
+    def test_rio_env_manager(self, mock_build_rio_env):
+        """RioEnvManager must not re-enter an equivalent environment in the same thread"""
+        manager = RioEnvManager()
+        session = mock.MagicMock()
+        with manager.env({"session": session, "FOO": "bar"}):
+            with manager.env({"FOO": "bar", "session": session}):
+                pass
+            mock_build_rio_env.assert_called_once()
+            with manager.env({"FOO": "baz"}):
+                pass
+            self.assertEqual(mock_build_rio_env.call_count, 2)
+        # environment is re-entered once exited
+        with manager.env({"session": session, "FOO": "bar"}):
+            pass
+        self.assertEqual(mock_build_rio_env.call_count, 3)
+        # local and remote environments differ
+        with manager.env({"session": session, "FOO": "bar"}, remote=True):
+            pass
+        self.assertEqual(mock_build_rio_env.call_count, 4)
+
+    @mock.patch("eodag_cube.utils.raster.build_rio_env", wraps=build_rio_env)
+    def test_rio_env_manager_worker(self, mock_build_rio_env):
+        """RioEnvManager must keep a long-lived environment in scheduler workers"""
+        manager = RioEnvManager()
+
+        def task():
+            for _ in range(3):
+                with manager.env({"FOO": "bar"}, remote=True):
+                    pass
+            # kept active between successive uses
+            options = [rasterio.env.getenv().get("FOO")]
+            mock_build_rio_env.assert_called_once()
+
+            # replaced when other options are needed, nested environments are scoped
+            with manager.env({"FOO": "baz"}):
+                with manager.env({"FOO": "qux"}):
+                    options.append(rasterio.env.getenv().get("FOO"))
+                options.append(rasterio.env.getenv().get("FOO"))
+            options.append(rasterio.env.getenv().get("FOO"))
+            self.assertEqual(mock_build_rio_env.call_count, 3)
+
+            manager.release()
+            options.append(rasterio.env.hasenv())
+            return options
+
+        scheduler = IOScheduler(max_workers=1)
+        with mock.patch("eodag_cube.utils.raster.get_io_scheduler", return_value=scheduler):
+            self.assertListEqual(scheduler.submit(task).result(timeout=5), ["bar", "qux", "baz", "baz", False])
+        scheduler.shutdown()
+
+
+class TestIOScheduler(unittest.TestCase):
+    def test_io_scheduler_shared(self):
+        """get_io_scheduler must return a process-wide scheduler"""
+        self.assertIs(get_io_scheduler(), get_io_scheduler())
+
+    def test_get_host(self):
+        """get_host must return url host or bucket"""
+        self.assertEqual(get_host("https://foo.bar/baz.tif"), "foo.bar")
+        self.assertEqual(get_host("s3://bucket/baz.tif"), "bucket")
+        self.assertIsNone(get_host("/foo/bar.tif"))
+        self.assertIsNone(get_host(None))
+
+    def test_io_scheduler_limits(self):
+        """IOScheduler must bound running tasks globally and per host"""
+        scheduler = IOScheduler(max_workers=4, max_workers_per_host=2)
+        release = threading.Event()
+        max_running = {"foo": 0}
+        lock = threading.Lock()
+
+        def task():
+            with lock:
+                max_running["foo"] = max(max_running["foo"], scheduler.stats()["running_per_host"].get("foo", 0))
+            release.wait(5)
+            return "done"
+
+        futures = [scheduler.submit(task, host="foo") for _ in range(6)]
+        release.set()
+        self.assertEqual([f.result() for f in futures], ["done"] * 6)
+        self.assertLessEqual(max_running["foo"], 2)
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["max_workers"], 4)
+        self.assertEqual(stats["submitted"], 6)
+        self.assertEqual(stats["completed"], 6)
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(stats["running"], 0)
+        self.assertEqual(stats["utilisation"], 0)
+        scheduler.shutdown()
+
+    def test_io_scheduler_host_queue(self):
+        """IOScheduler tasks waiting for a host slot must not tie up workers"""
+        scheduler = IOScheduler(max_workers=4, max_workers_per_host=1)
+        release = threading.Event()
+        started = {host: threading.Event() for host in ("foo", "bar")}
+
+        def task(host):
+            started[host].set()
+            return release.wait(5)
+
+        futures = [scheduler.submit(task, "foo", host="foo") for _ in range(4)]
+        other = scheduler.submit(started["bar"].set, host="bar")
+        self.assertTrue(started["bar"].wait(1))
+        other.result(timeout=5)
+        self.assertTrue(started["foo"].wait(1))
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["running"], 1)
+        self.assertEqual(stats["queued"], 3)
+        self.assertEqual(stats["running_per_host"], {"foo": 1})
+
+        # cancelled waiting tasks are skipped
+        self.assertTrue(futures[-1].cancel())
+        release.set()
+        self.assertListEqual([f.result(timeout=5) for f in futures[:-1]], [True] * 3)
+        stats = scheduler.stats()
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(stats["completed"], 4)
+        scheduler.shutdown()
+
+    def test_io_scheduler_nested(self):
+        """IOScheduler nested submissions must not deadlock a single worker pool"""
+        scheduler = IOScheduler(max_workers=1)
+
+        def outer():
+            return [f.result() for f in [scheduler.submit(lambda x: x * 2, i) for i in range(3)]]
+
+        self.assertEqual(scheduler.submit(outer).result(timeout=5), [0, 2, 4])
+        scheduler.shutdown()
+
+        # nested tasks on a host whose slots are all held by outer tasks
+        scheduler = IOScheduler(max_workers=2, max_workers_per_host=1)
+
+        def outer_host():
+            return scheduler.submit(lambda: "done", host="foo").result()
+
+        self.assertEqual(scheduler.submit(outer_host, host="foo").result(timeout=5), "done")
+        self.assertEqual(scheduler.stats()["running_per_host"], {})
+        scheduler.shutdown()
+
+    def test_io_scheduler_submit_all(self):
+        """IOScheduler nested fan-outs submitted together must run concurrently without deadlock"""
+        scheduler = IOScheduler(max_workers=4)
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        def task(i):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.1)
+            with lock:
+                running["now"] -= 1
+            return i * 2
+
+        def outer():
+            return [f.result() for f in scheduler.submit_all([functools.partial(task, i) for i in range(3)])]
+
+        self.assertEqual(scheduler.submit(outer).result(timeout=5), [0, 2, 4])
+        self.assertGreater(running["max"], 1)
+        scheduler.shutdown()
+
+        # tasks not started by a worker are run by the thread waiting for them
+        scheduler = IOScheduler(max_workers=1)
+        self.assertEqual(scheduler.submit(outer).result(timeout=5), [0, 2, 4])
+        stats = scheduler.stats()
+        self.assertEqual(stats["submitted"], 4)
+        self.assertEqual(stats["completed"], 4)
+        self.assertEqual(stats["queued"], 0)
+        scheduler.shutdown()
+
+    def test_io_scheduler_errors(self):
+        """IOScheduler must propagate task errors and check limits"""
+        scheduler = IOScheduler()
+
+        def fail():
+            raise DatasetCreationError("foo")
+
+        with self.assertRaises(DatasetCreationError):
+            scheduler.submit(fail).result()
+        with self.assertRaises(ValueError):
+            scheduler.configure(max_workers=-1)
+        scheduler.shutdown()
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        content = b"II*\x00" + b"0" * 2048
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(405)
+                self.end_headers()
+
+            def do_GET(self):
+                start, end = (int(x) for x in self.headers["Range"].split("=")[1].split("-"))
+                self.send_response(206)
+                self.send_header("Content-Type", "image/tiff")
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                self.wfile.write(content[start : end + 1])
+
+        self.content = content
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/foo"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_async_http_probes(self):
+        """async probes must get headers and first bytes of http files using ranged requests"""
+        fs = fsspec.filesystem("https", skip_instance_cache=True)
+        file = OpenFile(fs, self.url)
+
+        headers = await async_fsspec_file_headers(file)
+        self.assertEqual(headers["Content-Type"], "image/tiff")
+        self.assertEqual(headers["Content-Length"], str(len(self.content)))
+        self.assertEqual(await async_fsspec_file_extension(file), ".tiff")
+
+        self.assertEqual(await async_read_header(file), self.content[:SNIFF_SIZE])
+        self.assertListEqual(await async_sniff_engines(file), ["rasterio"])
+
+    async def test_async_guess_engines(self):
+        """async_guess_engines must identify engines from file content, or else from its extension"""
+        fs = fsspec.filesystem("https", skip_instance_cache=True)
+        with mock.patch("eodag_cube.utils.xarray.guess_engines") as mock_guess_engines:
+            self.assertListEqual(await async_guess_engines(OpenFile(fs, self.url)), ["rasterio"])
+
+            fs = fsspec.filesystem("memory", skip_instance_cache=True)
+            fs.pipe("/foo.grib2", b"unknown")
+            self.addCleanup(fs.rm, "/foo.grib2")
+            self.assertIn("cfgrib", await async_guess_engines(fs.open("memory://foo.grib2")))
+        # blocking probes are not used
+        mock_guess_engines.assert_not_called()
+
+    async def test_async_read_header_sync_fs(self):
+        """async_read_header must read files of sync filesystems in the I/O scheduler"""
+        fs = fsspec.filesystem("memory", skip_instance_cache=True)
+        fs.pipe("/foo.nc", b"CDF\x01\x00\x00")
+        self.addCleanup(fs.rm, "/foo.nc")
+        with mock.patch("eodag_cube.utils.aio.get_io_scheduler", wraps=get_io_scheduler) as mock_scheduler:
+            header = await async_read_header(fs.open("memory://foo.nc"))
+        self.assertEqual(header, b"CDF\x01\x00\x00")
+        mock_scheduler.assert_called_once()
+
+    async def test_run_in_scheduler(self):
+        """run_in_scheduler must run callables in the I/O scheduler without blocking the event loop"""
+        event = threading.Event()
+        task = asyncio.ensure_future(run_in_scheduler(event.wait, 5))
+        # the event loop is not blocked
+        await asyncio.sleep(0)
+        self.assertFalse(task.done())
+        event.set()
+        self.assertTrue(await task)